@@ -21,6 +21,8 @@ from app.models import (
     GoalProgress,
     Habit,
     HabitEntry,
+    HabitPeriodStat,
+    HabitYearBitmap,
     Media,
     ProgressSnapshot,
     Tag,
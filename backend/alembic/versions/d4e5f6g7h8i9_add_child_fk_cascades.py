@@ -0,0 +1,46 @@
+"""add on delete cascades to child foreign keys
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d4e5f6g7h8i9"
+down_revision = "c3d4e5f6g7h8"
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referenced table, ondelete)
+FOREIGN_KEYS = [
+    ("habit_entries", "habit_id", "habits", "CASCADE"),
+    ("workout_exercises", "workout_id", "workouts", "CASCADE"),
+    ("goal_progress", "goal_id", "goals", "CASCADE"),
+    ("notifications", "goal_id", "goals", "CASCADE"),
+    ("goals", "parent_goal_id", "goals", "SET NULL"),
+]
+
+
+def _recreate_foreign_key(table, column, referred_table, ondelete=None) -> None:
+    name = f"{table}_{column}_fkey"
+    op.drop_constraint(name, table, type_="foreignkey")
+    op.create_foreign_key(
+        name, table, referred_table, [column], ["id"], ondelete=ondelete
+    )
+
+
+def upgrade() -> None:
+    """Let the database remove child rows so parents can be deleted in one statement."""
+    for table, column, referred_table, ondelete in FOREIGN_KEYS:
+        _recreate_foreign_key(table, column, referred_table, ondelete)
+
+
+def downgrade() -> None:
+    """Restore the plain foreign keys."""
+    for table, column, referred_table, _ in FOREIGN_KEYS:
+        _recreate_foreign_key(table, column, referred_table)
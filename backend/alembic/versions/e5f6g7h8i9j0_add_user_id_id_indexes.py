@@ -0,0 +1,42 @@
+"""add composite user_id, id indexes for user-scoped lookups
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e5f6g7h8i9j0"
+down_revision = "d4e5f6g7h8i9"
+branch_labels = None
+depends_on = None
+
+
+USER_OWNED_TABLES = [
+    "habits",
+    "foods",
+    "workouts",
+    "daily_reviews",
+    "blog_entries",
+    "progress_snapshots",
+    "goals",
+    "notifications",
+]
+
+
+def upgrade() -> None:
+    """Replace the single-column user_id indexes with (user_id, id) indexes."""
+    for table in USER_OWNED_TABLES:
+        op.create_index(f"ix_{table}_user_id_id", table, ["user_id", "id"])
+        op.drop_index(f"ix_{table}_user_id", table_name=table)
+
+
+def downgrade() -> None:
+    """Restore the single-column user_id indexes."""
+    for table in USER_OWNED_TABLES:
+        op.create_index(f"ix_{table}_user_id", table, ["user_id"], unique=False)
+        op.drop_index(f"ix_{table}_user_id_id", table_name=table)
@@ -0,0 +1,34 @@
+"""add streak start and last completed dates to habits
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f6g7h8i9j0k1"
+down_revision = "e5f6g7h8i9j0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add the stored streak bounds.
+
+    Existing habits start without them; their streak is recomputed from the
+    entries the next time a completion is recorded.
+    """
+    op.add_column("habits", sa.Column("streak_start_date", sa.Date(), nullable=True))
+    op.add_column("habits", sa.Column("last_completed_date", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the stored streak bounds."""
+    op.drop_column("habits", "last_completed_date")
+    op.drop_column("habits", "streak_start_date")
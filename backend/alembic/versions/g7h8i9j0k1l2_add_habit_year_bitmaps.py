@@ -0,0 +1,97 @@
+"""add habit year bitmaps kept in sync with habit entries
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "g7h8i9j0k1l2"
+down_revision = "f6g7h8i9j0k1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create the bitmap table and the trigger that maintains it, then fill it
+    from the existing completed entries.
+
+    Creating the trigger locks ``habit_entries`` against writes until the
+    migration commits, so no entry is missed between the two.
+    """
+    op.create_table(
+        "habit_year_bitmaps",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("habit_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("days", postgresql.BIT(366), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("habit_id", "year", name="uq_habit_year_bitmap"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_habit_year_bitmap() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' AND OLD.completed THEN
+                UPDATE habit_year_bitmaps
+                SET days = set_bit(days, extract(doy FROM OLD.entry_date)::int - 1, 0)
+                WHERE habit_id = OLD.habit_id
+                  AND year = extract(year FROM OLD.entry_date)::int;
+            END IF;
+            IF TG_OP <> 'DELETE' AND NEW.completed THEN
+                INSERT INTO habit_year_bitmaps (id, created_at, habit_id, year, days)
+                VALUES (
+                    gen_random_uuid(),
+                    timezone('utc', now()),
+                    NEW.habit_id,
+                    extract(year FROM NEW.entry_date)::int,
+                    set_bit(B'0'::bit(366), extract(doy FROM NEW.entry_date)::int - 1, 1)
+                )
+                ON CONFLICT (habit_id, year) DO UPDATE
+                SET days = set_bit(
+                    habit_year_bitmaps.days, extract(doy FROM NEW.entry_date)::int - 1, 1
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER habit_entries_sync_year_bitmap
+        AFTER INSERT OR DELETE OR UPDATE OF habit_id, entry_date, completed
+        ON habit_entries
+        FOR EACH ROW EXECUTE FUNCTION sync_habit_year_bitmap()
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO habit_year_bitmaps (id, created_at, habit_id, year, days)
+        SELECT
+            gen_random_uuid(),
+            timezone('utc', now()),
+            habit_id,
+            extract(year FROM entry_date)::int,
+            bit_or(B'1'::bit(366) >> (extract(doy FROM entry_date)::int - 1))
+        FROM habit_entries
+        WHERE completed
+        GROUP BY habit_id, extract(year FROM entry_date)::int
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the trigger, its function and the bitmap table."""
+    op.execute("DROP TRIGGER IF EXISTS habit_entries_sync_year_bitmap ON habit_entries")
+    op.execute("DROP FUNCTION IF EXISTS sync_habit_year_bitmap()")
+    op.drop_table("habit_year_bitmaps")
@@ -0,0 +1,110 @@
+"""add weekly and monthly habit completion rollups
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "h8i9j0k1l2m3"
+down_revision = "g7h8i9j0k1l2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create the rollup table and the trigger that maintains it, then roll up
+    the existing completed entries.
+
+    Creating the trigger locks ``habit_entries`` against writes until the
+    migration commits, so no entry is missed between the two.
+    """
+    op.create_table(
+        "habit_period_stats",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("habit_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("period_type", sa.String(length=10), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("completions", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.CheckConstraint(
+            "period_type IN ('week', 'month')", name="ck_habit_period_stat_type"
+        ),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "habit_id", "period_type", "period_start", name="uq_habit_period_stat"
+        ),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_habit_period_stats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' AND OLD.completed THEN
+                UPDATE habit_period_stats
+                SET completions = completions - 1
+                WHERE habit_id = OLD.habit_id
+                  AND (
+                      (period_type = 'week'
+                       AND period_start = date_trunc('week', OLD.entry_date)::date)
+                      OR (period_type = 'month'
+                          AND period_start = date_trunc('month', OLD.entry_date)::date)
+                  );
+            END IF;
+            IF TG_OP <> 'DELETE' AND NEW.completed THEN
+                INSERT INTO habit_period_stats
+                    (id, created_at, habit_id, period_type, period_start, completions)
+                VALUES
+                    (gen_random_uuid(), timezone('utc', now()), NEW.habit_id, 'week',
+                     date_trunc('week', NEW.entry_date)::date, 1),
+                    (gen_random_uuid(), timezone('utc', now()), NEW.habit_id, 'month',
+                     date_trunc('month', NEW.entry_date)::date, 1)
+                ON CONFLICT (habit_id, period_type, period_start) DO UPDATE
+                SET completions = habit_period_stats.completions + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER habit_entries_sync_period_stats
+        AFTER INSERT OR DELETE OR UPDATE OF habit_id, entry_date, completed
+        ON habit_entries
+        FOR EACH ROW EXECUTE FUNCTION sync_habit_period_stats()
+        """
+    )
+    for period_type in ("week", "month"):
+        op.execute(
+            f"""
+            INSERT INTO habit_period_stats
+                (id, created_at, habit_id, period_type, period_start, completions)
+            SELECT
+                gen_random_uuid(),
+                timezone('utc', now()),
+                habit_id,
+                '{period_type}',
+                date_trunc('{period_type}', entry_date)::date,
+                count(*)
+            FROM habit_entries
+            WHERE completed
+            GROUP BY habit_id, date_trunc('{period_type}', entry_date)::date
+            """
+        )
+
+
+def downgrade() -> None:
+    """Drop the trigger, its function and the rollup table."""
+    op.execute(
+        "DROP TRIGGER IF EXISTS habit_entries_sync_period_stats ON habit_entries"
+    )
+    op.execute("DROP FUNCTION IF EXISTS sync_habit_period_stats()")
+    op.drop_table("habit_period_stats")
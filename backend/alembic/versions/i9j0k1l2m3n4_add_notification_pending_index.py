@@ -0,0 +1,32 @@
+"""add partial index on due pending notifications
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "i9j0k1l2m3n4"
+down_revision = "h8i9j0k1l2m3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index pending notifications by scheduled time for the dispatch workers."""
+    op.create_index(
+        "ix_notifications_pending_scheduled_time",
+        "notifications",
+        ["scheduled_time"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the pending notifications index."""
+    op.drop_index("ix_notifications_pending_scheduled_time", table_name="notifications")
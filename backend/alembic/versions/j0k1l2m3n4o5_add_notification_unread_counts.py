@@ -0,0 +1,91 @@
+"""add per-user unread notification counters
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "j0k1l2m3n4o5"
+down_revision = "i9j0k1l2m3n4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create the counter table and the trigger that maintains it, then count the
+    existing unread notifications.
+
+    Creating the trigger locks ``notifications`` against writes until the
+    migration commits, so no change is missed between the two.
+    """
+    op.create_table(
+        "notification_unread_counts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", name="uq_notification_unread_count_user"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_notification_unread_count()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND OLD.user_id = NEW.user_id
+               AND OLD.is_read = NEW.is_read THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP <> 'INSERT' AND NOT OLD.is_read THEN
+                UPDATE notification_unread_counts
+                SET unread_count = GREATEST(unread_count - 1, 0)
+                WHERE user_id = OLD.user_id;
+            END IF;
+            IF TG_OP <> 'DELETE' AND NOT NEW.is_read THEN
+                INSERT INTO notification_unread_counts
+                    (id, created_at, user_id, unread_count)
+                VALUES (gen_random_uuid(), timezone('utc', now()), NEW.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE
+                SET unread_count = notification_unread_counts.unread_count + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER notifications_sync_unread_count
+        AFTER INSERT OR DELETE OR UPDATE OF user_id, is_read
+        ON notifications
+        FOR EACH ROW EXECUTE FUNCTION sync_notification_unread_count()
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO notification_unread_counts
+            (id, created_at, user_id, unread_count)
+        SELECT gen_random_uuid(), timezone('utc', now()), user_id, count(*)
+        FROM notifications
+        WHERE NOT is_read
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the trigger, its function and the counter table."""
+    op.execute(
+        "DROP TRIGGER IF EXISTS notifications_sync_unread_count ON notifications"
+    )
+    op.execute("DROP FUNCTION IF EXISTS sync_notification_unread_count()")
+    op.drop_table("notification_unread_counts")
@@ -9,7 +9,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import decode_token
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
@@ -22,8 +22,24 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """Get current authenticated user from JWT token."""
-    token = credentials.credentials
+    return await get_user_from_token(credentials.credentials, db)
 
+
+async def get_current_user_read(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db),
+) -> User:
+    """
+    Get current authenticated user for a read-only endpoint.
+
+    The user is loaded through the request's read session, which the endpoint
+    shares, so a read never touches the primary or commits.
+    """
+    return await get_user_from_token(credentials.credentials, db)
+
+
+async def get_user_from_token(token: str, db: AsyncSession) -> User:
+    """Get the active user a JWT access token was issued to."""
     payload = decode_token(token)
     if not payload:
         raise HTTPException(
@@ -29,10 +29,12 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 
 # Core module endpoints
 api_router.include_router(goals.router, prefix="/goals", tags=["Goals"])
-api_router.include_router(habits.router, prefix="/habits", tags=["Habits"])
+# Habit analytics is registered first so that /habits/insights is not taken
+# for a habit ID by /habits/{habit_id}
 api_router.include_router(
     habit_analytics.router, prefix="/habits", tags=["Habit Analytics"]
 )
+api_router.include_router(habits.router, prefix="/habits", tags=["Habits"])
 api_router.include_router(foods.router, prefix="/foods", tags=["Food Tracking"])
 api_router.include_router(workouts.router, prefix="/workouts", tags=["Workouts"])
 api_router.include_router(
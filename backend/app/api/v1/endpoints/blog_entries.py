@@ -2,18 +2,23 @@
 Blog entry endpoints.
 """
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 import math
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
-from app.schemas.blog_entry import BlogEntryCreate, BlogEntryUpdate, BlogEntryResponse
+from app.schemas.blog_entry import (
+    BlogEntryCreate,
+    BlogEntryUpdate,
+    BlogEntryResponse,
+    BlogEntrySummaryResponse,
+)
 from app.services.module_services import BlogEntryService
 
 router = APIRouter()
@@ -38,28 +43,41 @@ async def create_blog_entry(
     )
 
 
-@router.get("", response_model=APIResponse[PaginatedResponse[BlogEntryResponse]])
+@router.get(
+    "",
+    response_model=APIResponse[
+        PaginatedResponse[Union[BlogEntrySummaryResponse, BlogEntryResponse]]
+    ],
+)
 async def list_blog_entries(
     status_filter: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all blog entries for the current user."""
     service = BlogEntryService(db)
     skip = (page - 1) * limit
+    summary = view == "summary"
     entries, total = await service.get_user_blog_entries(
-        current_user.id, status_filter, skip, limit
+        current_user.id, status_filter, skip, limit, cursor, summary
     )
 
+    next_cursor = service.repository.next_cursor(entries, limit)
+    schema = BlogEntrySummaryResponse if summary else BlogEntryResponse
+
     return APIResponse(
         data=PaginatedResponse(
-            items=[BlogEntryResponse.model_validate(e) for e in entries],
+            items=[schema.model_validate(e) for e in entries],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Blog entries retrieved successfully",
     )
@@ -68,8 +86,8 @@ async def list_blog_entries(
 @router.get("/{entry_id}", response_model=APIResponse[BlogEntryResponse])
 async def get_blog_entry(
     entry_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific blog entry by ID."""
     service = BlogEntryService(db)
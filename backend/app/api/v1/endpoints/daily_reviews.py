@@ -3,21 +3,22 @@ Daily review endpoints.
 """
 
 from datetime import date
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 import math
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
 from app.schemas.daily_review import (
     DailyReviewCreate,
     DailyReviewUpdate,
     DailyReviewResponse,
+    DailyReviewSummaryResponse,
 )
 from app.services.module_services import DailyReviewService
 
@@ -43,29 +44,42 @@ async def create_daily_review(
     )
 
 
-@router.get("", response_model=APIResponse[PaginatedResponse[DailyReviewResponse]])
+@router.get(
+    "",
+    response_model=APIResponse[
+        PaginatedResponse[Union[DailyReviewSummaryResponse, DailyReviewResponse]]
+    ],
+)
 async def list_daily_reviews(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all daily reviews for the current user."""
     service = DailyReviewService(db)
     skip = (page - 1) * limit
+    summary = view == "summary"
     reviews, total = await service.get_user_reviews(
-        current_user.id, start_date, end_date, skip, limit
+        current_user.id, start_date, end_date, skip, limit, cursor, summary
     )
 
+    next_cursor = service.repository.next_cursor(reviews, limit)
+    schema = DailyReviewSummaryResponse if summary else DailyReviewResponse
+
     return APIResponse(
         data=PaginatedResponse(
-            items=[DailyReviewResponse.model_validate(r) for r in reviews],
+            items=[schema.model_validate(r) for r in reviews],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Daily reviews retrieved successfully",
     )
@@ -74,8 +88,8 @@ async def list_daily_reviews(
 @router.get("/{review_id}", response_model=APIResponse[DailyReviewResponse])
 async def get_daily_review(
     review_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific daily review by ID."""
     service = DailyReviewService(db)
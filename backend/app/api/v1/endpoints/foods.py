@@ -3,18 +3,18 @@ Food tracking endpoints.
 """
 
 from datetime import date
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 import math
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
-from app.schemas.food import FoodCreate, FoodUpdate, FoodResponse
+from app.schemas.food import FoodCreate, FoodUpdate, FoodResponse, FoodSummaryResponse
 from app.services.module_services import FoodService
 
 router = APIRouter()
@@ -37,30 +37,43 @@ async def create_food(
     )
 
 
-@router.get("", response_model=APIResponse[PaginatedResponse[FoodResponse]])
+@router.get(
+    "",
+    response_model=APIResponse[
+        PaginatedResponse[Union[FoodSummaryResponse, FoodResponse]]
+    ],
+)
 async def list_foods(
     meal_type: Optional[str] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all food entries for the current user."""
     service = FoodService(db)
     skip = (page - 1) * limit
+    summary = view == "summary"
     foods, total = await service.get_user_foods(
-        current_user.id, meal_type, start_date, end_date, skip, limit
+        current_user.id, meal_type, start_date, end_date, skip, limit, cursor, summary
     )
 
+    next_cursor = service.repository.next_cursor(foods, limit)
+    schema = FoodSummaryResponse if summary else FoodResponse
+
     return APIResponse(
         data=PaginatedResponse(
-            items=[FoodResponse.model_validate(f) for f in foods],
+            items=[schema.model_validate(f) for f in foods],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Food entries retrieved successfully",
     )
@@ -69,8 +82,8 @@ async def list_foods(
 @router.get("/{food_id}", response_model=APIResponse[FoodResponse])
 async def get_food(
     food_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific food entry by ID."""
     service = FoodService(db)
@@ -8,8 +8,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
 from app.schemas.goal import (
@@ -61,8 +61,11 @@ async def list_goals(
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's next_cursor"
+    ),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all goals for the current user with pagination and filtering.
@@ -72,22 +75,27 @@ async def list_goals(
     - **status_filter**: Filter by status (active/completed/cancelled/paused)
     - **page**: Page number (default: 1)
     - **limit**: Items per page (default: 20, max: 100)
+    - **cursor**: Continue after a previous page (skips the total count)
     """
     service = GoalService(db)
     skip = (page - 1) * limit
     goals, total = await service.get_user_goals(
-        current_user.id, goal_type, status_filter, skip, limit
+        current_user.id, goal_type, status_filter, skip, limit, cursor
     )
 
     goal_responses = [GoalResponse.model_validate(goal) for goal in goals]
 
+    next_cursor = service.repository.next_cursor(goals, limit)
+
     return APIResponse(
         data=PaginatedResponse(
             items=goal_responses,
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Goals retrieved successfully",
     )
@@ -96,8 +104,8 @@ async def list_goals(
 @router.get("/{goal_id}", response_model=APIResponse[GoalResponse])
 async def get_goal(
     goal_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific goal by ID."""
     service = GoalService(db)
@@ -177,8 +185,8 @@ async def get_goal_progress(
     goal_id: UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get progress entries for a goal."""
     service = GoalService(db)
@@ -228,8 +236,8 @@ async def get_goal_milestones(
     goal_id: UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get milestones for a goal."""
     service = GoalService(db)
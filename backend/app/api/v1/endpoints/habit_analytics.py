@@ -2,13 +2,16 @@
 Habit analytics endpoints.
 """
 
+from datetime import date, timedelta
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user_read
+from app.core.cache import analytics_cache
+from app.core.database import get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse
 from app.schemas.habit_analytics import (
@@ -16,6 +19,8 @@ from app.schemas.habit_analytics import (
     ProgressTrends,
     StreakRecoveryInfo,
     HabitInsights,
+    HabitHeatmap,
+    HabitCompletionWindows,
 )
 from app.services.habit_analytics_service import HabitAnalyticsService
 
@@ -25,8 +30,8 @@ router = APIRouter()
 @router.get("/{habit_id}/analytics", response_model=APIResponse[HabitAnalytics])
 async def get_habit_analytics(
     habit_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get comprehensive analytics for a habit including:
@@ -35,7 +40,7 @@ async def get_habit_analytics(
     - Confidence level
     - Motivational messages
     """
-    service = HabitAnalyticsService(db)
+    service = HabitAnalyticsService(db, cache=analytics_cache)
     analytics = await service.get_habit_analytics(habit_id, current_user.id)
     return APIResponse(
         data=analytics,
@@ -46,9 +51,16 @@ async def get_habit_analytics(
 @router.get("/{habit_id}/progress", response_model=APIResponse[ProgressTrends])
 async def get_habit_progress_trends(
     habit_id: UUID,
-    days: int = Query(90, ge=7, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    days: int = Query(
+        90, ge=7, le=3660, description="Number of days to analyze (up to ten years)"
+    ),
+    engine: str = Query(
+        "python",
+        pattern="^(python|numpy)$",
+        description="Compute with Python loops or vectorized NumPy",
+    ),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get progress trends over time including:
@@ -57,14 +69,46 @@ async def get_habit_progress_trends(
     - Monthly summaries
     - Overall trend direction
     """
-    service = HabitAnalyticsService(db)
-    trends = await service.get_progress_trends(habit_id, current_user.id, days)
+    service = HabitAnalyticsService(db, cache=analytics_cache)
+    trends = await service.get_progress_trends(
+        habit_id, current_user.id, days, engine
+    )
     return APIResponse(
         data=trends,
         message="Progress trends retrieved successfully",
     )
 
 
+@router.get("/{habit_id}/windows", response_model=APIResponse[HabitCompletionWindows])
+async def get_habit_completion_windows(
+    habit_id: UUID,
+    days: List[int] = Query(
+        [7, 30, 90], description="Lengths of windows ending today, in days"
+    ),
+    start_date: Optional[date] = Query(
+        None, alias="from", description="First day of a custom window"
+    ),
+    end_date: Optional[date] = Query(
+        None, alias="to", description="Last day of a custom window (default: today)"
+    ),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get a habit's completions and completion rate over several windows:
+    the last ``days`` days for each value given, plus ``from``..``to`` when
+    either is set.
+    """
+    service = HabitAnalyticsService(db, cache=analytics_cache)
+    windows = await service.get_completion_windows(
+        habit_id, current_user.id, days, start_date, end_date
+    )
+    return APIResponse(
+        data=windows,
+        message="Completion windows retrieved successfully",
+    )
+
+
 @router.get(
     "/{habit_id}/streak-recovery", response_model=APIResponse[StreakRecoveryInfo]
 )
@@ -73,8 +117,8 @@ async def check_streak_recovery(
     grace_days: int = Query(
         1, ge=0, le=7, description="Grace period days for streak recovery"
     ),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Check if a broken streak can be recovered.
@@ -92,8 +136,8 @@ async def check_streak_recovery(
 
 @router.get("/insights", response_model=APIResponse[HabitInsights])
 async def get_user_habit_insights(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get aggregated insights across all user's habits including:
@@ -102,9 +146,36 @@ async def get_user_habit_insights(
     - Overall statistics
     - Motivational insights
     """
-    service = HabitAnalyticsService(db)
+    service = HabitAnalyticsService(db, cache=analytics_cache)
     insights = await service.get_user_insights(current_user.id)
     return APIResponse(
         data=insights,
         message="Habit insights retrieved successfully",
     )
+
+
+@router.get("/heatmap", response_model=APIResponse[HabitHeatmap])
+async def get_habit_heatmap(
+    start_date: Optional[date] = Query(
+        None, alias="from", description="First day (default: a year before 'to')"
+    ),
+    end_date: Optional[date] = Query(
+        None, alias="to", description="Last day (default: today)"
+    ),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get a completion heatmap for all of the user's habits in one response.
+
+    Each habit's completions are encoded as a base64 bitset with one bit per
+    day from ``start_date`` to ``end_date``, most significant bit first.
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=364)
+    service = HabitAnalyticsService(db)
+    heatmap = await service.get_heatmap(current_user.id, start_date, end_date)
+    return APIResponse(
+        data=heatmap,
+        message="Habit heatmap retrieved successfully",
+    )
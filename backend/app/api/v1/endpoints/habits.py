@@ -7,11 +7,11 @@ from typing import Optional
 from uuid import UUID
 import math
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
 from app.schemas.habit import (
@@ -47,23 +47,28 @@ async def list_habits(
     is_active: Optional[bool] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all habits for the current user."""
     service = HabitService(db)
     skip = (page - 1) * limit
     habits, total = await service.get_user_habits(
-        current_user.id, is_active, skip, limit
+        current_user.id, is_active, skip, limit, cursor
     )
 
+    next_cursor = service.repository.next_cursor(habits, limit)
+
     return APIResponse(
         data=PaginatedResponse(
             items=[HabitResponse.model_validate(h) for h in habits],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Habits retrieved successfully",
     )
@@ -72,8 +77,8 @@ async def list_habits(
 @router.get("/{habit_id}", response_model=APIResponse[HabitResponse])
 async def get_habit(
     habit_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific habit by ID."""
     service = HabitService(db)
@@ -133,15 +138,26 @@ async def create_habit_entry(
 @router.get("/{habit_id}/entries", response_model=APIResponse[list[HabitEntryResponse]])
 async def get_habit_entries(
     habit_id: UUID,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get entries for a habit."""
+    """
+    Get entries for a habit.
+
+    The cursor for the next page, if any, is returned in the X-Next-Cursor header.
+    """
     service = HabitService(db)
     skip = (page - 1) * limit
-    entries = await service.get_habit_entries(habit_id, current_user.id, skip, limit)
+    entries = await service.get_habit_entries(
+        habit_id, current_user.id, skip, limit, cursor
+    )
+    next_cursor = service.entry_repository.next_cursor(entries, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return APIResponse(
         data=[HabitEntryResponse.model_validate(e) for e in entries],
         message="Habit entries retrieved successfully",
@@ -8,8 +8,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user_read
+from app.core.database import get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse
 from app.services.life_goal_analytics_service import LifeGoalAnalyticsService
@@ -19,8 +19,8 @@ router = APIRouter()
 
 @router.get("/life-goals/summary", response_model=APIResponse[dict])
 async def get_life_goals_summary(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get summary statistics for user's life goals.
@@ -43,8 +43,8 @@ async def get_life_goals_summary(
 @router.get("/life-goals/milestones/statistics", response_model=APIResponse[dict])
 async def get_milestone_statistics(
     goal_id: Optional[UUID] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get milestone statistics.
@@ -67,8 +67,8 @@ async def get_milestone_statistics(
 
 @router.get("/life-goals/by-life-area", response_model=APIResponse[list])
 async def get_goals_by_life_area(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get life goals grouped by life area/category.
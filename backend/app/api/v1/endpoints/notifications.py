@@ -6,10 +6,16 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import (
+    get_current_user,
+    get_current_user_read,
+    get_user_from_token,
+)
+from app.core.database import AsyncSessionLocal, engine, get_db, get_read_db
+from app.core.notification_stream import notification_broker, notification_relay
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
 from app.schemas.notification import (
@@ -18,6 +24,7 @@ from app.schemas.notification import (
     NotificationSettingsCreate,
     NotificationSettingsResponse,
     NotificationSettingsUpdate,
+    NotificationUnreadCountResponse,
     NotificationUpdate,
 )
 from app.services.notification_service import NotificationService
@@ -59,8 +66,11 @@ async def list_notifications(
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's next_cursor"
+    ),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all notifications for the current user with pagination and filtering.
@@ -69,11 +79,12 @@ async def list_notifications(
     - **is_read**: Filter by read status (true/false)
     - **page**: Page number (default: 1)
     - **limit**: Items per page (default: 20, max: 100)
+    - **cursor**: Continue after a previous page (skips the total count)
     """
     service = NotificationService(db)
     skip = (page - 1) * limit
     notifications, total = await service.get_user_notifications(
-        current_user.id, is_read, skip, limit
+        current_user.id, is_read, skip, limit, cursor
     )
 
     notification_responses = [
@@ -81,23 +92,81 @@ async def list_notifications(
         for notification in notifications
     ]
 
+    next_cursor = service.repository.next_cursor(notifications, limit)
+
     return APIResponse(
         data=PaginatedResponse(
             items=notification_responses,
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Notifications retrieved successfully",
     )
 
 
+@router.get(
+    "/unread-count", response_model=APIResponse[NotificationUnreadCountResponse]
+)
+async def get_unread_count(
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get the number of unread notifications, for the notification badge."""
+    service = NotificationService(db)
+    unread_count = await service.get_unread_count(current_user.id)
+
+    return APIResponse(
+        data=NotificationUnreadCountResponse(unread_count=unread_count),
+        message="Unread count retrieved successfully",
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications(
+    token: str = Query(
+        ..., description="Access token (EventSource cannot send headers)"
+    ),
+):
+    """
+    Stream the current user's notification changes as server-sent events.
+
+    Events:
+    - **unread_count**: `{"count": n}`, sent when the stream opens and whenever
+      the count changes
+    - **notification**: `{"action": "created" | "sent" | "failed",
+      "notification": {...}}`, sent or failed once delivery is attempted
+    - **resync**: the stream fell behind and skipped events; refetch
+
+    The database is only queried while the stream opens, so no connection is
+    held while it is idle. Notifications sent by workers arrive over the
+    process's one LISTEN connection, opened with its first stream.
+    """
+    async with AsyncSessionLocal() as db:
+        user = await get_user_from_token(token, db)
+    user_id = user.id
+    await notification_relay.start(engine)
+
+    async def initial_events():
+        async with AsyncSessionLocal() as db:
+            unread_count = await NotificationService(db).get_unread_count(user_id)
+        return [("unread_count", {"count": unread_count})]
+
+    return StreamingResponse(
+        notification_broker.stream(user_id, initial_events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{notification_id}", response_model=APIResponse[NotificationResponse])
 async def get_notification(
     notification_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific notification by ID."""
     service = NotificationService(db)
@@ -9,8 +9,8 @@ import math
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
 from app.schemas.progress_snapshot import (
@@ -47,23 +47,28 @@ async def list_progress_snapshots(
     snapshot_type: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all progress snapshots for the current user."""
     service = ProgressSnapshotService(db)
     skip = (page - 1) * limit
     snapshots, total = await service.get_user_snapshots(
-        current_user.id, snapshot_type, skip, limit
+        current_user.id, snapshot_type, skip, limit, cursor
     )
 
+    next_cursor = service.repository.next_cursor(snapshots, limit)
+
     return APIResponse(
         data=PaginatedResponse(
             items=[ProgressSnapshotResponse.model_validate(s) for s in snapshots],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Progress snapshots retrieved successfully",
     )
@@ -72,8 +77,8 @@ async def list_progress_snapshots(
 @router.get("/{snapshot_id}", response_model=APIResponse[ProgressSnapshotResponse])
 async def get_progress_snapshot(
     snapshot_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific progress snapshot by ID."""
     service = ProgressSnapshotService(db)
@@ -5,7 +5,7 @@ User endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_read
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.common import APIResponse
@@ -17,7 +17,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=APIResponse[UserResponse])
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_read),
 ):
     """
     Get current user profile.
@@ -3,18 +3,23 @@ Workout endpoints.
 """
 
 from datetime import date
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 import math
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.common import APIResponse, PaginatedResponse
-from app.schemas.workout import WorkoutCreate, WorkoutUpdate, WorkoutResponse
+from app.schemas.workout import (
+    WorkoutCreate,
+    WorkoutUpdate,
+    WorkoutResponse,
+    WorkoutSummaryResponse,
+)
 from app.services.module_services import WorkoutService
 
 router = APIRouter()
@@ -37,30 +42,50 @@ async def create_workout(
     )
 
 
-@router.get("", response_model=APIResponse[PaginatedResponse[WorkoutResponse]])
+@router.get(
+    "",
+    response_model=APIResponse[
+        PaginatedResponse[Union[WorkoutSummaryResponse, WorkoutResponse]]
+    ],
+)
 async def list_workouts(
     workout_type: Optional[str] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all workouts for the current user."""
     service = WorkoutService(db)
     skip = (page - 1) * limit
+    summary = view == "summary"
     workouts, total = await service.get_user_workouts(
-        current_user.id, workout_type, start_date, end_date, skip, limit
+        current_user.id,
+        workout_type,
+        start_date,
+        end_date,
+        skip,
+        limit,
+        cursor,
+        summary,
     )
 
+    next_cursor = service.repository.next_cursor(workouts, limit)
+    schema = WorkoutSummaryResponse if summary else WorkoutResponse
+
     return APIResponse(
         data=PaginatedResponse(
-            items=[WorkoutResponse.model_validate(w) for w in workouts],
+            items=[schema.model_validate(w) for w in workouts],
             total=total,
             page=page,
             limit=limit,
-            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
         ),
         message="Workouts retrieved successfully",
     )
@@ -69,8 +94,8 @@ async def list_workouts(
 @router.get("/{workout_id}", response_model=APIResponse[WorkoutResponse])
 async def get_workout(
     workout_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a specific workout by ID."""
     service = WorkoutService(db)
@@ -0,0 +1,3 @@
+"""
+Maintenance commands, run with ``python -m app.commands.<name>``.
+"""
@@ -0,0 +1,41 @@
+"""
+Backfill habit_year_bitmaps from the existing habit entries.
+
+The migration that creates the table fills it, and a trigger on habit_entries
+keeps the bitmaps up to date, so this only needs to run to repair drift.
+Habits are processed in batches, each in its own transaction.
+
+Usage: python -m app.commands.backfill_habit_bitmaps [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+
+from app.commands.common import rebuild_habits_in_batches
+from app.core.database import engine
+from app.repositories.module_repositories import HabitYearBitmapRepository
+
+
+async def run(batch_size: int) -> None:
+    try:
+        written = await rebuild_habits_in_batches(
+            lambda session, habit_ids: HabitYearBitmapRepository(session).rebuild(
+                habit_ids
+            ),
+            batch_size,
+            "habit-years",
+        )
+        print(f"Done: {written} habit-years written")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Shared helpers for the maintenance commands.
+"""
+
+from typing import Awaitable, Callable, List
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.database import AsyncSessionLocal
+from app.models.habit import Habit
+
+
+async def rebuild_habits_in_batches(
+    rebuild: Callable[[AsyncSession, List[UUID]], Awaitable[int]],
+    batch_size: int,
+    unit: str,
+) -> int:
+    """Call ``rebuild`` for every habit, ``batch_size`` habits at a time."""
+    return await rebuild_in_batches(Habit.id, rebuild, batch_size, unit)
+
+
+async def rebuild_in_batches(
+    id_column: InstrumentedAttribute,
+    rebuild: Callable[[AsyncSession, List[UUID]], Awaitable[int]],
+    batch_size: int,
+    unit: str,
+) -> int:
+    """
+    Call ``rebuild`` for every ID in ``id_column``, ``batch_size`` at a time.
+
+    IDs are visited in order and each batch is committed on its own, so an
+    interrupted run keeps the batches it finished. Returns the total of the
+    counts ``rebuild`` reports, which are printed as ``unit``.
+    """
+    written = 0
+    last_id = None
+    async with AsyncSessionLocal() as session:
+        while True:
+            query = select(id_column).order_by(id_column).limit(batch_size)
+            if last_id is not None:
+                query = query.where(id_column > last_id)
+            ids = list((await session.scalars(query)).all())
+            if not ids:
+                break
+
+            written += await rebuild(session, ids)
+            await session.commit()
+            last_id = ids[-1]
+            print(f"{written} {unit} written, up to {last_id}")
+
+    return written
@@ -0,0 +1,42 @@
+"""
+Rebuild habit_period_stats from the existing habit entries.
+
+The migration that creates the table fills it, and a trigger on habit_entries
+keeps the weekly and monthly rollups up to date, so this only needs to run to
+repair drift. Habits are processed in batches, each in its own
+transaction.
+
+Usage: python -m app.commands.rebuild_habit_period_stats [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+
+from app.commands.common import rebuild_habits_in_batches
+from app.core.database import engine
+from app.repositories.module_repositories import HabitPeriodStatRepository
+
+
+async def run(batch_size: int) -> None:
+    try:
+        written = await rebuild_habits_in_batches(
+            lambda session, habit_ids: HabitPeriodStatRepository(session).rebuild(
+                habit_ids
+            ),
+            batch_size,
+            "period rows",
+        )
+        print(f"Done: {written} period rows written")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Repair drift in notification_unread_counts.
+
+The migration that creates the table counts the existing notifications, and
+a trigger on notifications keeps the counters up to date, so this only needs
+to run periodically to repair drift. Users are processed in batches, each in its own
+transaction.
+
+Usage: python -m app.commands.reconcile_notification_unread_counts [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+from typing import List
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.commands.common import rebuild_in_batches
+from app.core.database import engine
+from app.models.user import User
+from app.repositories.notification_repository import (
+    NotificationUnreadCountRepository,
+)
+
+
+async def _reconcile(session: AsyncSession, user_ids: List[UUID]) -> int:
+    repaired = await NotificationUnreadCountRepository(session).reconcile(user_ids)
+    return len(repaired)
+
+
+async def run(batch_size: int) -> None:
+    try:
+        repaired = await rebuild_in_batches(User.id, _reconcile, batch_size, "counters")
+        print(f"Done: {repaired} counters repaired")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
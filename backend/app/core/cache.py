@@ -0,0 +1,262 @@
+"""
+In-process caches for habit analytics results and unread notification counts.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Session.info key holding the invalidations to apply on commit
+_PENDING_INVALIDATIONS = "analytics_cache_invalidations"
+# Session.info key holding the users whose unread counts to evict on commit
+_PENDING_UNREAD_COUNTS = "unread_count_cache_users"
+
+
+class AnalyticsCache:
+    """
+    LRU cache of analytics results keyed by (user, habit, day).
+
+    Each key holds the named results computed for a habit on one day, such as
+    its analytics or its progress over a number of days; user-wide results
+    use ``None`` as the habit. Results only change when the habit's entries
+    are written or the day rolls over, so keys for a new day start empty and
+    writes drop the affected keys. Entries also expire after ``ttl_seconds``,
+    which bounds how stale another process's copy can get.
+
+    Results may be computed on a read replica that has not caught up with a
+    write yet, so nothing is stored for a key whose read started less than
+    ``replica_lag_seconds`` after the key was last invalidated.
+
+    The counters are logged at most every ``stats_interval`` seconds, for
+    tuning the size and TTL; 0 turns this off.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        replica_lag_seconds: float = 0.0,
+        stats_interval: float = 0.0,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.replica_lag_seconds = replica_lag_seconds
+        self.stats_interval = stats_interval
+        self._last_report = time.monotonic()
+        self._entries: "OrderedDict[Tuple, Dict[str, Tuple[float, Any]]]" = (
+            OrderedDict()
+        )
+        # Bumped on every invalidation so results computed before it are
+        # not stored
+        self._generation = 0
+        # When each (user, habit) was last invalidated, oldest first
+        self._invalidated: "OrderedDict[Tuple, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    async def get_or_compute(
+        self,
+        user_id: UUID,
+        habit_id: Optional[UUID],
+        name: str,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return the cached result called ``name``, computing it on a miss."""
+        self._report_stats()
+        key = (user_id, habit_id, date.today())
+        results = self._entries.get(key)
+        if results is not None and name in results:
+            expires_at, value = results[name]
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        generation = self._generation
+        started = time.monotonic()
+        value = await compute()
+        if (
+            generation == self._generation
+            and self.max_entries > 0
+            and not self._may_be_stale((user_id, habit_id), started)
+        ):
+            self._store(key, name, value)
+        return value
+
+    def _may_be_stale(self, key: Tuple, started: float) -> bool:
+        """Return whether a read started then may predate the key's last write."""
+        invalidated_at = self._invalidated.get(key)
+        return (
+            invalidated_at is not None
+            and started - self.replica_lag_seconds < invalidated_at
+        )
+
+    def _store(self, key: Tuple, name: str, value: Any) -> None:
+        results = self._entries.setdefault(key, {})
+        results[name] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: UUID, habit_id: Optional[UUID]) -> None:
+        """Drop a habit's cached results and the user-wide ones."""
+        self._generation += 1
+        self.invalidations += 1
+        today = date.today()
+        self._entries.pop((user_id, habit_id, today), None)
+        self._entries.pop((user_id, None, today), None)
+
+        now = time.monotonic()
+        for key in ((user_id, habit_id), (user_id, None)):
+            self._invalidated[key] = now
+            self._invalidated.move_to_end(key)
+        # Reads started after the lag bound see the write
+        while next(iter(self._invalidated.values())) < now - self.replica_lag_seconds:
+            self._invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        self._entries.clear()
+        self._invalidated.clear()
+        self._generation += 1
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+
+    def _report_stats(self) -> None:
+        now = time.monotonic()
+        if self.stats_interval and now - self._last_report >= self.stats_interval:
+            logger.info("Analytics cache stats: %s", self.stats())
+            self._last_report = now
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+class UnreadCountCache:
+    """
+    LRU cache of users' unread notification counts.
+
+    Writes through this process evict the user's count once they commit, and
+    the next read loads it again; counts also expire after ``ttl_seconds``,
+    which bounds how stale a count changed by another process can get.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[UUID, Tuple[float, int]]" = OrderedDict()
+        # Bumped on every eviction so counts loaded before it are not kept
+        self._generation = 0
+
+    async def get_or_load(
+        self, user_id: UUID, load: Callable[[], Awaitable[int]]
+    ) -> int:
+        """Return the user's cached count, loading it on a miss."""
+        cached = self._counts.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._counts.move_to_end(user_id)
+            return cached[1]
+
+        generation = self._generation
+        count = await load()
+        if generation == self._generation:
+            self._store(user_id, count)
+        return count
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's count after a committed write."""
+        self._generation += 1
+        self._counts.pop(user_id, None)
+
+    def _store(self, user_id: UUID, count: int) -> None:
+        if self.max_entries <= 0:
+            return
+        self._counts[user_id] = (time.monotonic() + self.ttl_seconds, count)
+        self._counts.move_to_end(user_id)
+        while len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        self._counts.clear()
+        self._generation += 1
+
+
+analytics_cache = AnalyticsCache(
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+    replica_lag_seconds=(
+        settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        if settings.DATABASE_REPLICA_URLS
+        else 0.0
+    ),
+    stats_interval=settings.ANALYTICS_CACHE_STATS_INTERVAL_SECONDS,
+)
+
+
+unread_count_cache = UnreadCountCache(
+    ttl_seconds=settings.UNREAD_COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.UNREAD_COUNT_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_on_commit(
+    db: AsyncSession, user_id: UUID, habit_id: Optional[UUID]
+) -> None:
+    """
+    Invalidate a habit's cached analytics once the session commits.
+
+    Invalidating only after the commit keeps other requests from caching the
+    old data again in the meantime; nothing is invalidated on rollback.
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).add((user_id, habit_id))
+
+
+def invalidate_unread_count_on_commit(db: AsyncSession, user_id: UUID) -> None:
+    """
+    Evict a user's cached unread count once the session commits.
+
+    Sessions for the same user can commit in either order, so rather than
+    storing the count seen inside the transaction, which could overwrite a
+    newer one, the next read loads the committed count.
+    """
+    db.info.setdefault(_PENDING_UNREAD_COUNTS, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for user_id, habit_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        analytics_cache.invalidate(user_id, habit_id)
+    for user_id in session.info.pop(_PENDING_UNREAD_COUNTS, ()):
+        unread_count_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+    session.info.pop(_PENDING_UNREAD_COUNTS, None)
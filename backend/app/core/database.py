@@ -2,20 +2,44 @@
 Database connection and session management.
 """
 
-from typing import AsyncGenerator
+import itertools
+import logging
+from typing import AsyncGenerator, List, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import Session, SessionTransaction
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured pool settings."""
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    )
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-)
+engine = _create_engine(settings.DATABASE_URL)
+
+# Engines for the optional read replicas
+replica_engines: List[AsyncEngine] = [
+    _create_engine(url) for url in settings.DATABASE_REPLICA_URLS
+]
+_replica_counter = itertools.count()
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -27,6 +51,67 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ReadOnlySession(Session):
+    """
+    Session whose transactions are opened READ ONLY.
+
+    ``read_binds`` lists the engines to read from in order of preference. The
+    first one that can be reached is picked when the session first needs a
+    connection, so a session that never queries never checks one out.
+    """
+
+    def __init__(self, *args, read_binds: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._read_binds = list(read_binds)
+
+    def get_bind(self, *args, **kwargs):
+        if self._read_binds:
+            self.bind = _first_reachable(self._read_binds)
+            self._read_binds = []
+        return super().get_bind(*args, **kwargs)
+
+
+def _first_reachable(binds: Sequence[Engine]) -> Engine:
+    """Return the first engine that accepts a connection; the last is not tried."""
+    for bind in binds[:-1]:
+        try:
+            bind.connect().close()
+            return bind
+        except (OSError, DBAPIError) as exc:
+            logger.warning("Read replica %s unavailable: %s", bind.url, exc)
+    return binds[-1]
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _set_read_only(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+# Session factory for read-only requests; the engine is chosen per session
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def read_engines() -> List[AsyncEngine]:
+    """
+    Return the engines to try for a read, in order.
+
+    Replicas are rotated round-robin between calls and the primary always comes
+    last as the fallback.
+    """
+    if not replica_engines:
+        return [engine]
+    start = next(_replica_counter) % len(replica_engines)
+    return [*replica_engines[start:], *replica_engines[:start], engine]
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database session."""
     async with AsyncSessionLocal() as session:
@@ -38,3 +123,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for a session used by read-only (GET) endpoints.
+
+    The transaction is opened READ ONLY and is never committed. No connection
+    is checked out until the first query, and it goes back to the pool when
+    the session closes. When read replicas are configured the session runs on
+    one of them; at the first query a replica that cannot be reached is
+    skipped in favour of the next one, and finally the primary.
+    """
+    session = ReadSessionLocal(read_binds=[bind.sync_engine for bind in read_engines()])
+    try:
+        yield session
+    finally:
+        await session.close()
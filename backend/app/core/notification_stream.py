@@ -0,0 +1,239 @@
+"""
+In-process fan-out of notification events to streaming clients.
+"""
+
+import asyncio
+import json
+import logging
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from uuid import UUID
+
+from sqlalchemy import Text, cast, event, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# An event is its name and its JSON data
+Event = Tuple[str, dict]
+
+# Session.info key holding the events to publish on commit
+_PENDING_EVENTS = "notification_stream_events"
+
+# Postgres channel on which events are announced to the streams of every
+# process, for changes made outside the API such as by notification workers
+NOTIFICATION_EVENTS_CHANNEL = "notification_events"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD_BYTES = 7999
+
+
+def format_event(name: str, data: dict) -> str:
+    """Format an event as a server-sent event message."""
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+class NotificationBroker:
+    """
+    Queues of events for the notification streams open in this process.
+
+    Publishing puts an event on the queue of each stream the user has open,
+    so idle streams cost no database queries. A stream that falls
+    ``queue_size`` events behind has its backlog replaced by a single
+    ``resync`` event, telling the client to fetch its notifications again.
+    Streams send a comment every ``heartbeat_seconds`` while idle, which
+    keeps proxies from closing the connection.
+    """
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._queues: Dict[UUID, Set[asyncio.Queue]] = {}
+
+    @property
+    def stream_count(self) -> int:
+        """Number of open streams."""
+        return sum(len(queues) for queues in self._queues.values())
+
+    def has_streams(self, user_id: UUID) -> bool:
+        """Return whether the user has a stream open in this process."""
+        return user_id in self._queues
+
+    def subscribe(self, user_id: UUID) -> asyncio.Queue:
+        """Open a queue receiving the user's events."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._queues.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: UUID, queue: asyncio.Queue) -> None:
+        """Close a queue opened by ``subscribe``."""
+        queues = self._queues.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[user_id]
+
+    def publish(self, user_id: UUID, name: str, data: dict) -> None:
+        """Send an event to every stream the user has open."""
+        for queue in self._queues.get(user_id, ()):
+            if queue.full():
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {}))
+            else:
+                queue.put_nowait((name, data))
+
+    async def stream(
+        self, user_id: UUID, initial: Callable[[], Awaitable[List[Event]]]
+    ) -> AsyncIterator[str]:
+        """
+        Yield the user's events as server-sent event messages.
+
+        The events returned by ``initial`` are sent first; they are gathered
+        after subscribing, so nothing published in between is missed.
+        """
+        queue = self.subscribe(user_id)
+        try:
+            for name, data in await initial():
+                yield format_event(name, data)
+            while True:
+                try:
+                    name, data = await asyncio.wait_for(
+                        queue.get(), self.heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(name, data)
+        finally:
+            self.unsubscribe(user_id, queue)
+
+
+notification_broker = NotificationBroker(
+    queue_size=settings.NOTIFICATION_STREAM_QUEUE_SIZE,
+    heartbeat_seconds=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS,
+)
+
+
+def publish_on_commit(db: AsyncSession, user_id: UUID, name: str, data: dict) -> None:
+    """
+    Publish an event to the user's streams once the session commits.
+
+    Nothing is published on rollback, so clients never see a change that
+    did not happen.
+    """
+    db.info.setdefault(_PENDING_EVENTS, []).append((user_id, name, data))
+
+
+async def announce_events(
+    db: AsyncSession, events: Sequence[Tuple[UUID, str, dict]]
+) -> None:
+    """
+    Announce events to the user's streams in every process.
+
+    Postgres delivers the messages when the transaction commits, and drops
+    them on rollback. All the events go out in one statement; an event too
+    large for a NOTIFY payload is announced as a ``resync`` instead.
+    """
+    payloads = []
+    for user_id, name, data in events:
+        payload = json.dumps({"user_id": str(user_id), "name": name, "data": data})
+        if len(payload.encode()) > _MAX_PAYLOAD_BYTES:
+            payload = json.dumps(
+                {"user_id": str(user_id), "name": "resync", "data": {}}
+            )
+        payloads.append(payload)
+    if not payloads:
+        return
+    announced = (
+        func.unnest(cast(payloads, ARRAY(Text)))
+        .table_valued("payload")
+        .render_derived()
+    )
+    await db.execute(
+        select(func.pg_notify(NOTIFICATION_EVENTS_CHANNEL, announced.c.payload))
+    )
+
+
+class NotificationRelay:
+    """
+    Publishes the events announced on NOTIFICATION_EVENTS_CHANNEL to the
+    streams open in this process.
+
+    The LISTEN connection is opened by the first stream and reopened by the
+    next stream to open after it drops; events announced while it is closed
+    only reach clients on their next fetch.
+    """
+
+    def __init__(self, broker: NotificationBroker):
+        self.broker = broker
+        self._connection: Optional[AsyncConnection] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, listen_engine: AsyncEngine) -> None:
+        """Open the LISTEN connection unless it is already open."""
+        async with self._lock:
+            if self._connection is not None:
+                raw = await self._connection.get_raw_connection()
+                if not raw.driver_connection.is_closed():
+                    return
+                await self._close()
+            connection = await listen_engine.connect()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.add_listener(
+                NOTIFICATION_EVENTS_CHANNEL, self._on_event
+            )
+            self._connection = connection
+
+    async def stop(self) -> None:
+        """Close the LISTEN connection."""
+        async with self._lock:
+            await self._close()
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            raw = await connection.get_raw_connection()
+            if not raw.driver_connection.is_closed():
+                await raw.driver_connection.remove_listener(
+                    NOTIFICATION_EVENTS_CHANNEL, self._on_event
+                )
+            await connection.close()
+        except Exception:
+            logger.exception("Closing the notification event listener failed")
+
+    def _on_event(self, connection, pid, channel, payload: str) -> None:
+        announced = json.loads(payload)
+        self.broker.publish(
+            UUID(announced["user_id"]), announced["name"], announced["data"]
+        )
+
+
+notification_relay = NotificationRelay(notification_broker)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session: Session) -> None:
+    for user_id, name, data in session.info.pop(_PENDING_EVENTS, ()):
+        notification_broker.publish(user_id, name, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS, None)
@@ -8,6 +8,7 @@ from fastapi.responses import JSONResponse
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.notification_stream import notification_relay
 from app.schemas.common import APIResponse, HealthCheck
 
 # Create FastAPI application
@@ -47,6 +48,12 @@ async def health_check():
     )
 
 
+@app.on_event("shutdown")
+async def close_notification_relay():
+    """Close the LISTEN connection of the notification streams."""
+    await notification_relay.stop()
+
+
 # Include API v1 router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
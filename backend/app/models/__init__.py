@@ -7,9 +7,9 @@ from .blog_entry import BlogEntry
 from .daily_review import DailyReview
 from .food import Food
 from .goal import Goal, GoalProgress
-from .habit import Habit, HabitEntry
+from .habit import Habit, HabitEntry, HabitPeriodStat, HabitYearBitmap
 from .media import Media
-from .notification import Notification, NotificationSettings
+from .notification import Notification, NotificationSettings, NotificationUnreadCount
 from .progress_snapshot import ProgressSnapshot
 from .tag import Tag, Taggable
 from .user import User
@@ -22,6 +22,8 @@ __all__ = [
     "GoalProgress",
     "Habit",
     "HabitEntry",
+    "HabitYearBitmap",
+    "HabitPeriodStat",
     "Food",
     "Workout",
     "WorkoutExercise",
@@ -33,4 +35,5 @@ __all__ = [
     "ProgressSnapshot",
     "Notification",
     "NotificationSettings",
+    "NotificationUnreadCount",
 ]
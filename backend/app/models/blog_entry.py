@@ -10,6 +10,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
@@ -25,9 +26,7 @@ class BlogEntry(Base):
     __tablename__ = "blog_entries"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Content
     title = Column(String(500), nullable=False)
@@ -52,6 +51,7 @@ class BlogEntry(Base):
         CheckConstraint(
             "status IN ('draft', 'published', 'archived')", name="ck_blog_status"
         ),
+        Index("ix_blog_entries_user_id_id", "user_id", "id"),
     )
 
     # Relationships
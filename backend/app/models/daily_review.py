@@ -10,6 +10,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -27,9 +28,7 @@ class DailyReview(Base):
     __tablename__ = "daily_reviews"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Review date
     review_date = Column(Date, nullable=False)
@@ -75,6 +74,7 @@ class DailyReview(Base):
             "sleep_quality >= 1 AND sleep_quality <= 10", name="ck_review_sleep_quality"
         ),
         UniqueConstraint("user_id", "review_date", name="uq_user_review_date"),
+        Index("ix_daily_reviews_user_id_id", "user_id", "id"),
     )
 
     # Relationships
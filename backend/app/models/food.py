@@ -11,6 +11,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     String,
     Time,
@@ -27,9 +28,7 @@ class Food(Base):
     __tablename__ = "foods"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Meal info
     meal_date = Column(Date, nullable=False)
@@ -60,6 +59,7 @@ class Food(Base):
             "meal_type IN ('breakfast', 'lunch', 'dinner', 'snack')",
             name="ck_food_meal_type",
         ),
+        Index("ix_foods_user_id_id", "user_id", "id"),
     )
 
     # Relationships
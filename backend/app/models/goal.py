@@ -12,6 +12,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -28,10 +29,10 @@ class Goal(Base):
     __tablename__ = "goals"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    parent_goal_id = Column(
+        UUID(as_uuid=True), ForeignKey("goals.id", ondelete="SET NULL"), index=True
     )
-    parent_goal_id = Column(UUID(as_uuid=True), ForeignKey("goals.id"), index=True)
 
     # Basic info
     title = Column(String(255), nullable=False)
@@ -76,19 +77,29 @@ class Goal(Base):
             name="ck_goal_status",
         ),
         CheckConstraint("priority >= 0 AND priority <= 5", name="ck_goal_priority"),
+        Index("ix_goals_user_id_id", "user_id", "id"),
     )
 
     # Relationships
     user = relationship("User", back_populates="goals")
     progress_entries = relationship(
-        "GoalProgress", back_populates="goal", cascade="all, delete-orphan"
+        "GoalProgress",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     milestones = relationship(
-        "GoalMilestone", back_populates="goal", cascade="all, delete-orphan"
+        "GoalMilestone",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     parent_goal = relationship("Goal", remote_side="Goal.id", backref="sub_goals")
     notifications = relationship(
-        "Notification", back_populates="goal", cascade="all, delete-orphan"
+        "Notification",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -102,7 +113,10 @@ class GoalProgress(Base):
 
     # Foreign keys
     goal_id = Column(
-        UUID(as_uuid=True), ForeignKey("goals.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
 
     # Progress data
@@ -125,7 +139,10 @@ class GoalMilestone(Base):
 
     # Foreign keys
     goal_id = Column(
-        UUID(as_uuid=True), ForeignKey("goals.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
 
     # Milestone data
@@ -5,18 +5,21 @@ Habit and habit entry models for habit tracking.
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     CheckConstraint,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Time,
     UniqueConstraint,
+    event,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import BIT, UUID
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -28,9 +31,7 @@ class Habit(Base):
     __tablename__ = "habits"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Basic info
     name = Column(String(255), nullable=False)
@@ -51,6 +52,9 @@ class Habit(Base):
     current_streak = Column(Integer, default=0)
     longest_streak = Column(Integer, default=0)
     total_completions = Column(Integer, default=0)
+    # Bounds of the current streak, kept up to date as completions are recorded
+    streak_start_date = Column(Date)
+    last_completed_date = Column(Date)
 
     # Timestamps
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -60,12 +64,16 @@ class Habit(Base):
         CheckConstraint(
             "frequency IN ('daily', 'weekly', 'custom')", name="ck_habit_frequency"
         ),
+        Index("ix_habits_user_id_id", "user_id", "id"),
     )
 
     # Relationships
     user = relationship("User", back_populates="habits")
     entries = relationship(
-        "HabitEntry", back_populates="habit", cascade="all, delete-orphan"
+        "HabitEntry",
+        back_populates="habit",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -79,7 +87,10 @@ class HabitEntry(Base):
 
     # Foreign keys
     habit_id = Column(
-        UUID(as_uuid=True), ForeignKey("habits.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("habits.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
 
     # Entry data
@@ -102,3 +113,151 @@ class HabitEntry(Base):
 
     def __repr__(self) -> str:
         return f"<HabitEntry(id={self.id}, habit_id={self.habit_id}, date={self.entry_date}, completed={self.completed})>"
+
+
+class HabitYearBitmap(Base):
+    """
+    Completed days of a habit in one calendar year, one bit per day.
+
+    Bit ``n`` (counted from the left) is set when the habit has a completed
+    entry on day ``n + 1`` of the year. Rows are maintained by a trigger on
+    ``habit_entries``.
+    """
+
+    __tablename__ = "habit_year_bitmaps"
+
+    # Foreign keys
+    habit_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("habits.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Bitmap data
+    year = Column(Integer, nullable=False)
+    days = Column(BIT(366), nullable=False)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("habit_id", "year", name="uq_habit_year_bitmap"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<HabitYearBitmap(habit_id={self.habit_id}, year={self.year})>"
+
+
+class HabitPeriodStat(Base):
+    """Completions of a habit in one week (Monday based) or calendar month."""
+
+    __tablename__ = "habit_period_stats"
+
+    # Foreign keys
+    habit_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("habits.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Rollup data
+    period_type = Column(String(10), nullable=False)
+    period_start = Column(Date, nullable=False)
+    completions = Column(Integer, nullable=False, default=0)
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "period_type IN ('week', 'month')", name="ck_habit_period_stat_type"
+        ),
+        UniqueConstraint(
+            "habit_id", "period_type", "period_start", name="uq_habit_period_stat"
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<HabitPeriodStat(habit_id={self.habit_id}, {self.period_type}="
+            f"{self.period_start}, completions={self.completions})>"
+        )
+
+
+# Keep habit_year_bitmaps in step with every write to habit_entries
+SYNC_HABIT_YEAR_BITMAP_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_habit_year_bitmap() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.completed THEN
+        UPDATE habit_year_bitmaps
+        SET days = set_bit(days, extract(doy FROM OLD.entry_date)::int - 1, 0)
+        WHERE habit_id = OLD.habit_id
+          AND year = extract(year FROM OLD.entry_date)::int;
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.completed THEN
+        INSERT INTO habit_year_bitmaps (id, created_at, habit_id, year, days)
+        VALUES (
+            gen_random_uuid(),
+            timezone('utc', now()),
+            NEW.habit_id,
+            extract(year FROM NEW.entry_date)::int,
+            set_bit(B'0'::bit(366), extract(doy FROM NEW.entry_date)::int - 1, 1)
+        )
+        ON CONFLICT (habit_id, year) DO UPDATE
+        SET days = set_bit(
+            habit_year_bitmaps.days, extract(doy FROM NEW.entry_date)::int - 1, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_HABIT_YEAR_BITMAP_TRIGGER = """
+CREATE TRIGGER habit_entries_sync_year_bitmap
+AFTER INSERT OR DELETE OR UPDATE OF habit_id, entry_date, completed
+ON habit_entries
+FOR EACH ROW EXECUTE FUNCTION sync_habit_year_bitmap()
+"""
+
+# Keep habit_period_stats in step with every write to habit_entries
+SYNC_HABIT_PERIOD_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_habit_period_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.completed THEN
+        UPDATE habit_period_stats
+        SET completions = completions - 1
+        WHERE habit_id = OLD.habit_id
+          AND (
+              (period_type = 'week'
+               AND period_start = date_trunc('week', OLD.entry_date)::date)
+              OR (period_type = 'month'
+                  AND period_start = date_trunc('month', OLD.entry_date)::date)
+          );
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.completed THEN
+        INSERT INTO habit_period_stats
+            (id, created_at, habit_id, period_type, period_start, completions)
+        VALUES
+            (gen_random_uuid(), timezone('utc', now()), NEW.habit_id, 'week',
+             date_trunc('week', NEW.entry_date)::date, 1),
+            (gen_random_uuid(), timezone('utc', now()), NEW.habit_id, 'month',
+             date_trunc('month', NEW.entry_date)::date, 1)
+        ON CONFLICT (habit_id, period_type, period_start) DO UPDATE
+        SET completions = habit_period_stats.completions + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_HABIT_PERIOD_STATS_TRIGGER = """
+CREATE TRIGGER habit_entries_sync_period_stats
+AFTER INSERT OR DELETE OR UPDATE OF habit_id, entry_date, completed
+ON habit_entries
+FOR EACH ROW EXECUTE FUNCTION sync_habit_period_stats()
+"""
+
+for _statement in (
+    SYNC_HABIT_YEAR_BITMAP_FUNCTION,
+    SYNC_HABIT_YEAR_BITMAP_TRIGGER,
+    SYNC_HABIT_PERIOD_STATS_FUNCTION,
+    SYNC_HABIT_PERIOD_STATS_TRIGGER,
+):
+    event.listen(HabitEntry.__table__, "after_create", DDL(_statement))
@@ -5,13 +5,19 @@ Notification models for reminder and notification system.
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     CheckConstraint,
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Text,
+    UniqueConstraint,
+    event,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -25,10 +31,10 @@ class Notification(Base):
     __tablename__ = "notifications"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    goal_id = Column(
+        UUID(as_uuid=True), ForeignKey("goals.id", ondelete="CASCADE"), index=True
     )
-    goal_id = Column(UUID(as_uuid=True), ForeignKey("goals.id"), index=True)
 
     # Notification content
     title = Column(String(255), nullable=False)
@@ -53,6 +59,13 @@ class Notification(Base):
             "status IN ('pending', 'sent', 'failed', 'cancelled')",
             name="ck_notification_status",
         ),
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+        # Keeps the queue of due notifications cheap to claim as sent rows pile up
+        Index(
+            "ix_notifications_pending_scheduled_time",
+            "scheduled_time",
+            postgresql_where=text("status = 'pending'"),
+        ),
     )
 
     # Relationships
@@ -100,3 +113,73 @@ class NotificationSettings(Base):
 
     def __repr__(self) -> str:
         return f"<NotificationSettings(user_id={self.user_id})>"
+
+
+class NotificationUnreadCount(Base):
+    """
+    Number of unread notifications of a user.
+
+    Rows are maintained by a trigger on ``notifications``; a user without a
+    row has no unread notifications.
+    """
+
+    __tablename__ = "notification_unread_counts"
+
+    # Foreign key
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Counter
+    unread_count = Column(Integer, nullable=False, default=0)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_notification_unread_count_user"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<NotificationUnreadCount(user_id={self.user_id}, "
+            f"unread_count={self.unread_count})>"
+        )
+
+
+# Keep notification_unread_counts in step with every write to notifications
+SYNC_NOTIFICATION_UNREAD_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_notification_unread_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.user_id = NEW.user_id
+       AND OLD.is_read = NEW.is_read THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' AND NOT OLD.is_read THEN
+        UPDATE notification_unread_counts
+        SET unread_count = GREATEST(unread_count - 1, 0)
+        WHERE user_id = OLD.user_id;
+    END IF;
+    IF TG_OP <> 'DELETE' AND NOT NEW.is_read THEN
+        INSERT INTO notification_unread_counts (id, created_at, user_id, unread_count)
+        VALUES (gen_random_uuid(), timezone('utc', now()), NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE
+        SET unread_count = notification_unread_counts.unread_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_NOTIFICATION_UNREAD_COUNT_TRIGGER = """
+CREATE TRIGGER notifications_sync_unread_count
+AFTER INSERT OR DELETE OR UPDATE OF user_id, is_read
+ON notifications
+FOR EACH ROW EXECUTE FUNCTION sync_notification_unread_count()
+"""
+
+for _statement in (
+    SYNC_NOTIFICATION_UNREAD_COUNT_FUNCTION,
+    SYNC_NOTIFICATION_UNREAD_COUNT_TRIGGER,
+):
+    event.listen(Notification.__table__, "after_create", DDL(_statement))
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     Date,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -24,9 +25,7 @@ class ProgressSnapshot(Base):
     __tablename__ = "progress_snapshots"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Snapshot info
     snapshot_date = Column(Date, nullable=False)
@@ -68,6 +67,7 @@ class ProgressSnapshot(Base):
         UniqueConstraint(
             "user_id", "snapshot_date", "snapshot_type", name="uq_user_snapshot"
         ),
+        Index("ix_progress_snapshots_user_id_id", "user_id", "id"),
     )
 
     # Relationships
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -27,9 +28,7 @@ class Workout(Base):
     __tablename__ = "workouts"
 
     # Foreign keys
-    user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Workout info
     workout_date = Column(Date, nullable=False)
@@ -56,12 +55,16 @@ class Workout(Base):
         CheckConstraint(
             "intensity IN ('low', 'medium', 'high')", name="ck_workout_intensity"
         ),
+        Index("ix_workouts_user_id_id", "user_id", "id"),
     )
 
     # Relationships
     user = relationship("User", back_populates="workouts")
     exercises = relationship(
-        "WorkoutExercise", back_populates="workout", cascade="all, delete-orphan"
+        "WorkoutExercise",
+        back_populates="workout",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -75,7 +78,10 @@ class WorkoutExercise(Base):
 
     # Foreign keys
     workout_id = Column(
-        UUID(as_uuid=True), ForeignKey("workouts.id"), nullable=False, index=True
+        UUID(as_uuid=True),
+        ForeignKey("workouts.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
 
     # Exercise info
@@ -2,28 +2,99 @@
 Base repository with common CRUD operations.
 """
 
-from typing import Generic, List, Optional, Type, TypeVar
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Row,
+    Select,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Values substituted for NULL sort keys so that keyset comparisons stay total.
+# With DESC ordering Postgres puts NULLs first, which matches the maximum value.
+_NULL_SORT_VALUES = {date: date.max, datetime: datetime.max, time: time.max}
+
+
+def _encode_cursor_value(value: Any) -> str:
+    """Serialize a single sort-key value for a cursor."""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode_cursor_value(python_type: type, raw: str) -> Any:
+    """Parse a single sort-key value from a cursor."""
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is time:
+        return time.fromisoformat(raw)
+    return python_type(raw)
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations."""
 
+    # Columns (newest first) that list queries are ordered by. The primary key is
+    # always appended as a tie-breaker so that every row has a unique position.
+    cursor_keys: Sequence[Any] = ()
+
+    # Name of the unique constraint that bulk_upsert resolves conflicts on.
+    upsert_constraint: Optional[str] = None
+
+    # Columns selected for the summary list view, which leaves out unbounded
+    # text. The primary key and sort keys are always added.
+    summary_columns: Sequence[Any] = ()
+
     def __init__(self, db: AsyncSession, model: Type[ModelType]):
         self.db = db
         self.model = model
 
     async def get_by_id(self, id: UUID) -> Optional[ModelType]:
-        """Get a single record by ID."""
-        result = await self.db.execute(select(self.model).where(self.model.id == id))
-        return result.scalar_one_or_none()
+        """
+        Get a single record by ID.
+
+        A row already loaded by this session is returned from its identity map
+        without another query.
+        """
+        return await self.db.get(self.model, id)
+
+    def _loaded(self, id: UUID) -> Optional[ModelType]:
+        """
+        Return this session's loaded copy of a row, if it is still current.
+
+        Rows are shared through the session's identity map, so UPDATE ...
+        RETURNING refreshes them and deletes evict them. Expired or deleted
+        copies are ignored so that callers fall back to a query.
+        """
+        obj = self.db.identity_map.get(identity_key(self.model, id))
+        if obj is None:
+            return None
+        state = inspect(obj)
+        if state.expired_attributes or state.deleted or obj in self.db.deleted:
+            return None
+        return obj
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
@@ -37,6 +108,58 @@ class BaseRepository(Generic[ModelType]):
         await self.db.refresh(obj_in)
         return obj_in
 
+    async def bulk_create(self, rows: Sequence[dict]) -> List[ModelType]:
+        """
+        Create many records with one multi-row INSERT ... RETURNING.
+
+        Column defaults are applied per row, and the inserted objects are
+        returned in input order without a refresh per row.
+        """
+        if not rows:
+            return []
+        result = await self.db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            list(rows),
+        )
+        return list(result.all())
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[dict],
+        constraint: Optional[str] = None,
+        update_fields: Optional[Sequence[str]] = None,
+    ) -> List[ModelType]:
+        """
+        Insert or update many records with INSERT ... ON CONFLICT DO UPDATE.
+
+        Conflicts are resolved on ``constraint`` (the repository's
+        ``upsert_constraint`` by default). ``update_fields`` defaults to every
+        column supplied in the rows except the primary key and ``created_at``.
+        """
+        if not rows:
+            return []
+        constraint = constraint or self.upsert_constraint
+        if constraint is None:
+            raise ValueError(f"No upsert constraint defined for {self.model.__name__}")
+
+        if update_fields is None:
+            update_fields = [
+                field for field in rows[0] if field not in ("id", "created_at")
+            ]
+
+        stmt = pg_insert(self.model)
+        set_ = {field: stmt.excluded[field] for field in update_fields}
+        if "updated_at" in self.model.__table__.columns:
+            set_["updated_at"] = datetime.utcnow()
+
+        stmt = stmt.on_conflict_do_update(constraint=constraint, set_=set_)
+        result = await self.db.scalars(
+            stmt.returning(self.model, sort_by_parameter_order=True),
+            list(rows),
+            execution_options={"populate_existing": True},
+        )
+        return list(result.all())
+
     async def update(self, db_obj: ModelType, obj_in: dict) -> ModelType:
         """Update a record."""
         for field, value in obj_in.items():
@@ -55,7 +178,237 @@ class BaseRepository(Generic[ModelType]):
             return True
         return False
 
+    async def update_where(
+        self, criteria: Sequence[Any], obj_in: dict, options: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        """
+        Update the record matching ``criteria`` with one UPDATE ... RETURNING.
+
+        Returns None when no row matches. Any copy of the row already in the
+        session is refreshed from the returned values, and loader ``options``
+        apply to the returned object.
+        """
+        if not obj_in:
+            result = await self.db.execute(
+                select(self.model).where(*criteria).options(*options)
+            )
+            return result.scalar_one_or_none()
+        keys = [attr.key for attr in inspect(self.model).column_attrs]
+        stmt = (
+            update(self.model)
+            .where(*criteria)
+            .values(**obj_in)
+            .returning(self.model, *(getattr(self.model, key) for key in keys))
+            .options(*options)
+        )
+        result = await self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        # A copy already in the session keeps its loaded values, which may be
+        # stale or computed in SQL; copy the returned ones over
+        obj = row[0]
+        for key, value in zip(keys, row[1:]):
+            set_committed_value(obj, key, value)
+        return obj
+
+    async def delete_where(self, *criteria) -> bool:
+        """Delete the records matching ``criteria`` with one DELETE ... RETURNING."""
+        result = await self.db.execute(
+            delete(self.model).where(*criteria).returning(self.model.id)
+        )
+        return result.first() is not None
+
+    async def select_rows(
+        self, columns: Sequence[Any], *criteria, order_by: Sequence[Any] = ()
+    ) -> List[Row]:
+        """
+        Select plain rows of the given columns.
+
+        Rows are not added to the identity map or instrumented, which makes them
+        much cheaper than ORM objects for read-only code that needs a few fields.
+        """
+        query = select(*columns).where(*criteria).order_by(*order_by)
+        result = await self.db.execute(query)
+        return list(result.all())
+
     async def count(self) -> int:
         """Count total records."""
-        result = await self.db.execute(select(self.model))
-        return len(list(result.scalars().all()))
+        return await self.count_where()
+
+    async def count_where(self, *criteria) -> int:
+        """Count records matching the given criteria with a SQL COUNT(*)."""
+        query = select(func.count()).select_from(self.model)
+        if criteria:
+            query = query.where(*criteria)
+        result = await self.db.execute(query)
+        return result.scalar_one()
+
+    def _sort_columns(self) -> list:
+        """Return the sort-key columns followed by the primary key."""
+        return [*self.cursor_keys, self.model.id]
+
+    def _sort_expressions(self) -> list:
+        """Return the sort-key SQL expressions with NULLs mapped to a max value."""
+        expressions = []
+        for column in self._sort_columns():
+            python_type = column.type.python_type
+            if column.nullable and python_type in _NULL_SORT_VALUES:
+                column = func.coalesce(column, _NULL_SORT_VALUES[python_type])
+            expressions.append(column)
+        return expressions
+
+    def paginate(
+        self,
+        query: Select,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """
+        Order a list query by the repository's sort keys and select one page.
+
+        Without a cursor the page is selected with OFFSET. With a cursor the
+        query seeks directly past the last row of the previous page, so deep
+        pages cost the same as the first one.
+        """
+        expressions = self._sort_expressions()
+        query = query.order_by(*(expression.desc() for expression in expressions))
+
+        if cursor:
+            values = self.decode_cursor(cursor)
+            query = query.where(tuple_(*expressions) < tuple_(*values))
+        else:
+            query = query.offset(skip)
+
+        return query.limit(limit)
+
+    def summary_select(self) -> Select:
+        """Select the summary columns as plain rows rather than ORM objects."""
+        columns = {}
+        for column in (*self.summary_columns, *self._sort_columns()):
+            columns.setdefault(column.key, column)
+        return select(*columns.values())
+
+    def encode_cursor(self, obj: ModelType) -> str:
+        """Build an opaque cursor pointing just after the given row."""
+        values = []
+        for column in self._sort_columns():
+            value = getattr(obj, column.key)
+            if value is None:
+                value = _NULL_SORT_VALUES[column.type.python_type]
+            values.append(_encode_cursor_value(value))
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> list:
+        """Parse an opaque cursor back into sort-key values."""
+        columns = self._sort_columns()
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw_values = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(raw_values, list) or len(raw_values) != len(columns):
+                raise ValueError("cursor does not match sort keys")
+            return [
+                _decode_cursor_value(column.type.python_type, raw)
+                for column, raw in zip(columns, raw_values)
+            ]
+        except (ValueError, TypeError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    def next_cursor(self, items: List[ModelType], limit: int) -> Optional[str]:
+        """
+        Return the cursor for the page after ``items``.
+
+        A full page is assumed to have a successor; the following page may turn
+        out to be empty, which ends the iteration.
+        """
+        if not items or len(items) < limit:
+            return None
+        return self.encode_cursor(items[-1])
+
+
+class UserScopedRepository(BaseRepository[ModelType]):
+    """
+    Repository for records owned by a user.
+
+    Every lookup, listing, update and delete filters on ``user_id`` in SQL, so
+    records belonging to other users are never loaded. The owned tables carry
+    a composite ``(user_id, id)`` index to serve these queries.
+    """
+
+    def _owned(self, id: UUID, user_id: UUID) -> list:
+        """Build the WHERE criteria matching one record of the user."""
+        return [self.model.user_id == user_id, self.model.id == id]
+
+    async def get_owned(
+        self, id: UUID, user_id: UUID, options: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        """
+        Get a record by ID only if it belongs to the user.
+
+        Repeat lookups in the same session are answered from the identity map.
+        Lookups with loader ``options`` always query so the options apply.
+        """
+        if not options:
+            obj = self._loaded(id)
+            if obj is not None:
+                return obj if obj.user_id == user_id else None
+        result = await self.db.execute(
+            select(self.model).where(*self._owned(id, user_id)).options(*options)
+        )
+        return result.scalar_one_or_none()
+
+    async def exists_owned(self, id: UUID, user_id: UUID) -> bool:
+        """Check that a record exists and belongs to the user without loading it."""
+        obj = self._loaded(id)
+        if obj is not None:
+            return obj.user_id == user_id
+        result = await self.db.execute(
+            select(self.model.id).where(*self._owned(id, user_id))
+        )
+        return result.first() is not None
+
+    async def list_for_user(
+        self,
+        user_id: UUID,
+        *criteria,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        options: Sequence[Any] = (),
+        summary: bool = False,
+    ) -> List[Any]:
+        """
+        List one page of the user's records matching the extra criteria.
+
+        With ``summary`` only the repository's summary columns are selected and
+        the page is returned as plain rows.
+        """
+        if summary:
+            query = self.summary_select()
+        else:
+            query = select(self.model).options(*options)
+        query = self.paginate(
+            query.where(self.model.user_id == user_id, *criteria), skip, limit, cursor
+        )
+        result = await self.db.execute(query)
+        return list(result.all() if summary else result.scalars().all())
+
+    async def count_for_user(self, user_id: UUID, *criteria) -> int:
+        """Count the user's records matching the extra criteria."""
+        return await self.count_where(self.model.user_id == user_id, *criteria)
+
+    async def update_owned(
+        self, id: UUID, user_id: UUID, obj_in: dict, options: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        """Update a record by ID only if it belongs to the user."""
+        return await self.update_where(self._owned(id, user_id), obj_in, options)
+
+    async def delete_owned(self, id: UUID, user_id: UUID) -> bool:
+        """Delete a record by ID only if it belongs to the user."""
+        return await self.delete_where(*self._owned(id, user_id))
@@ -10,12 +10,14 @@ from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.goal import Goal, GoalProgress, GoalMilestone
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, UserScopedRepository
 
 
-class GoalRepository(BaseRepository[Goal]):
+class GoalRepository(UserScopedRepository[Goal]):
     """Repository for goal operations."""
 
+    cursor_keys = (Goal.created_at,)
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Goal)
 
@@ -26,19 +28,16 @@ class GoalRepository(BaseRepository[Goal]):
         status: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Goal]:
         """Get all goals for a user with optional filters."""
-        query = select(Goal).where(Goal.user_id == user_id)
-
-        if goal_type:
-            query = query.where(Goal.goal_type == goal_type)
-        if status:
-            query = query.where(Goal.status == status)
-
-        query = query.offset(skip).limit(limit).order_by(Goal.created_at.desc())
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return await self.list_for_user(
+            user_id,
+            *self._goal_filters(goal_type, status),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     async def get_goals_by_date_range(
         self, user_id: UUID, start_date: date, end_date: date
@@ -58,14 +57,25 @@ class GoalRepository(BaseRepository[Goal]):
         return list(result.scalars().all())
 
     async def count_user_goals(
-        self, user_id: UUID, status: Optional[str] = None
+        self,
+        user_id: UUID,
+        status: Optional[str] = None,
+        goal_type: Optional[str] = None,
     ) -> int:
         """Count goals for a user."""
-        query = select(Goal).where(Goal.user_id == user_id)
+        return await self.count_for_user(
+            user_id, *self._goal_filters(goal_type, status)
+        )
+
+    @staticmethod
+    def _goal_filters(goal_type: Optional[str], status: Optional[str]) -> list:
+        """Build the WHERE criteria shared by goal listing and counting."""
+        filters = []
+        if goal_type:
+            filters.append(Goal.goal_type == goal_type)
         if status:
-            query = query.where(Goal.status == status)
-        result = await self.db.execute(query)
-        return len(list(result.scalars().all()))
+            filters.append(Goal.status == status)
+        return filters
 
 
 class GoalProgressRepository(BaseRepository[GoalProgress]):
@@ -119,12 +129,7 @@ class GoalMilestoneRepository(BaseRepository[GoalMilestone]):
 
     async def count_completed_milestones(self, goal_id: UUID) -> int:
         """Count completed milestones for a goal."""
-        result = await self.db.execute(
-            select(GoalMilestone).where(
-                and_(
-                    GoalMilestone.goal_id == goal_id,
-                    GoalMilestone.status == "completed",
-                )
-            )
+        return await self.count_where(
+            GoalMilestone.goal_id == goal_id,
+            GoalMilestone.status == "completed",
         )
-        return len(list(result.scalars().all()))
@@ -2,26 +2,43 @@
 Generic repository for simple CRUD operations on all models.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
-from datetime import date
-
-from sqlalchemy import select, and_
+from datetime import date, timedelta
+
+from sqlalchemy import (
+    Date,
+    Integer,
+    Row,
+    and_,
+    case,
+    delete,
+    exists,
+    extract,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.habit import Habit, HabitEntry
+from app.models.habit import Habit, HabitEntry, HabitPeriodStat, HabitYearBitmap
 from app.models.food import Food
-from app.models.workout import Workout
+from app.models.workout import Workout, WorkoutExercise
 from app.models.daily_review import DailyReview
 from app.models.blog_entry import BlogEntry
 from app.models.progress_snapshot import ProgressSnapshot
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, UserScopedRepository
 
 
-class HabitRepository(BaseRepository[Habit]):
+class HabitRepository(UserScopedRepository[Habit]):
     """Repository for habit operations."""
 
+    cursor_keys = (Habit.created_at,)
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Habit)
 
@@ -31,45 +48,103 @@ class HabitRepository(BaseRepository[Habit]):
         is_active: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Habit]:
         """Get all habits for a user with optional filters."""
-        query = select(Habit).where(Habit.user_id == user_id)
-
-        if is_active is not None:
-            query = query.where(Habit.is_active == is_active)
-
-        query = query.offset(skip).limit(limit).order_by(Habit.created_at.desc())
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return await self.list_for_user(
+            user_id,
+            *self._habit_filters(is_active),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     async def count_user_habits(
         self, user_id: UUID, is_active: Optional[bool] = None
     ) -> int:
         """Count habits for a user."""
-        query = select(Habit).where(Habit.user_id == user_id)
+        return await self.count_for_user(user_id, *self._habit_filters(is_active))
+
+    async def record_completion(
+        self,
+        habit_id: UUID,
+        user_id: UUID,
+        entry_date: date,
+        period_bounds: Tuple[date, date, date],
+    ) -> Optional[Habit]:
+        """
+        Advance the stored streak for a completion on ``entry_date``.
+
+        ``period_bounds`` holds the starts of the previous, current and next
+        streak period around ``entry_date``. The streak and completion count
+        are updated in a single UPDATE relative to the stored values. Returns
+        None, changing nothing, when the completion is older than the last
+        completed period or the habit has earlier completions but no stored
+        streak; the streak must then be recomputed from the entries.
+        """
+        previous_start, period_start, next_start = period_bounds
+        last = Habit.last_completed_date
+        restart = or_(last.is_(None), last < previous_start)
+        extend = and_(last >= previous_start, last < period_start)
+        streak = case(
+            (restart, 1),
+            (extend, Habit.current_streak + 1),
+            else_=Habit.current_streak,
+        )
+        earlier_completions = exists().where(
+            HabitEntry.habit_id == Habit.id,
+            HabitEntry.completed == True,
+            HabitEntry.entry_date != entry_date,
+        )
+        in_order = or_(last < next_start, and_(last.is_(None), ~earlier_completions))
+
+        return await self.update_where(
+            [*self._owned(habit_id, user_id), in_order],
+            {
+                "current_streak": streak,
+                "longest_streak": func.greatest(Habit.longest_streak, streak),
+                "streak_start_date": case(
+                    (restart, entry_date),
+                    else_=func.least(Habit.streak_start_date, entry_date),
+                ),
+                "last_completed_date": func.greatest(last, entry_date),
+                "total_completions": Habit.total_completions + 1,
+            },
+        )
+
+    @staticmethod
+    def _habit_filters(is_active: Optional[bool]) -> list:
+        """Build the WHERE criteria shared by habit listing and counting."""
+        filters = []
         if is_active is not None:
-            query = query.where(Habit.is_active == is_active)
-        result = await self.db.execute(query)
-        return len(list(result.scalars().all()))
+            filters.append(Habit.is_active == is_active)
+        return filters
 
 
 class HabitEntryRepository(BaseRepository[HabitEntry]):
     """Repository for habit entry operations."""
 
+    cursor_keys = (HabitEntry.entry_date,)
+    upsert_constraint = "uq_habit_entry_date"
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, HabitEntry)
 
     async def get_habit_entries(
-        self, habit_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        habit_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[HabitEntry]:
         """Get all entries for a habit."""
         result = await self.db.execute(
-            select(HabitEntry)
-            .where(HabitEntry.habit_id == habit_id)
-            .order_by(HabitEntry.entry_date.desc())
-            .offset(skip)
-            .limit(limit)
+            self.paginate(
+                select(HabitEntry).where(HabitEntry.habit_id == habit_id),
+                skip,
+                limit,
+                cursor,
+            )
         )
         return list(result.scalars().all())
 
@@ -87,9 +162,201 @@ class HabitEntryRepository(BaseRepository[HabitEntry]):
         return result.scalar_one_or_none()
 
 
-class FoodRepository(BaseRepository[Food]):
+class HabitYearBitmapRepository(BaseRepository[HabitYearBitmap]):
+    """Repository for the per-year completion bitmaps of habits."""
+
+    upsert_constraint = "uq_habit_year_bitmap"
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, HabitYearBitmap)
+
+    async def get_completed_dates(self, habit_id: UUID) -> List[date]:
+        """Get the dates a habit was completed on, newest first."""
+        rows = await self.select_rows(
+            (HabitYearBitmap.year, HabitYearBitmap.days),
+            HabitYearBitmap.habit_id == habit_id,
+            order_by=(HabitYearBitmap.year.desc(),),
+        )
+        return [day for row in rows for day in self._decode(row.year, row.days)]
+
+    async def get_user_bitmaps(
+        self, user_id: UUID, start_year: int, end_year: int
+    ) -> List[Row]:
+        """
+        Get the bitmaps of all of a user's habits for a range of years.
+
+        Rows are ordered by habit and then year. Habits without completions in
+        the range appear once, with a NULL year and bitmap.
+        """
+        result = await self.db.execute(
+            select(
+                Habit.id,
+                Habit.name,
+                Habit.color,
+                HabitYearBitmap.year,
+                HabitYearBitmap.days,
+            )
+            .outerjoin(
+                HabitYearBitmap,
+                and_(
+                    HabitYearBitmap.habit_id == Habit.id,
+                    HabitYearBitmap.year.between(start_year, end_year),
+                ),
+            )
+            .where(Habit.user_id == user_id)
+            .order_by(Habit.created_at, Habit.id, HabitYearBitmap.year)
+        )
+        return list(result.all())
+
+    async def rebuild(self, habit_ids: Sequence[UUID]) -> int:
+        """
+        Rebuild the bitmaps of the given habits from their completed entries.
+
+        Returns the number of habit-years written.
+        """
+        await self.db.execute(
+            delete(HabitYearBitmap).where(HabitYearBitmap.habit_id.in_(habit_ids))
+        )
+
+        year = extract("year", HabitEntry.entry_date).cast(Integer)
+        day_of_year = extract("doy", HabitEntry.entry_date).cast(Integer)
+        day_bit = literal_column("B'1'::bit(366)").op(">>")(day_of_year - 1)
+        stmt = pg_insert(HabitYearBitmap).from_select(
+            ["id", "created_at", "habit_id", "year", "days"],
+            select(
+                func.gen_random_uuid(),
+                func.timezone("utc", func.now()),
+                HabitEntry.habit_id,
+                year,
+                func.bit_or(day_bit),
+            )
+            .where(HabitEntry.habit_id.in_(habit_ids), HabitEntry.completed == True)
+            .group_by(HabitEntry.habit_id, year),
+        )
+        # Entries written while rebuilding may already have recreated a row
+        stmt = stmt.on_conflict_do_update(
+            constraint=self.upsert_constraint, set_={"days": stmt.excluded.days}
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    @staticmethod
+    def _decode(year: int, days) -> List[date]:
+        """Turn a year's bitmap into its completed dates, newest first."""
+        # The leftmost bit is January 1st, so bit 0 of the value is day 366
+        value = days.to_int()
+        day_366 = date(year, 1, 1) + timedelta(days=365)
+        return [
+            day_366 - timedelta(days=bit)
+            for bit in range(value.bit_length())
+            if value >> bit & 1
+        ]
+
+
+class HabitPeriodStatRepository(BaseRepository[HabitPeriodStat]):
+    """Repository for the weekly and monthly completion rollups of habits."""
+
+    upsert_constraint = "uq_habit_period_stat"
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, HabitPeriodStat)
+
+    async def get_completions(
+        self, habit_id: UUID, week_start: date, month_start: date
+    ) -> Tuple[Dict[date, int], Dict[date, int]]:
+        """
+        Get a habit's completions per week and per month, by period start.
+
+        Weeks from ``week_start`` and months from ``month_start`` onwards are
+        returned; periods without completions are left out.
+        """
+        rows = await self.select_rows(
+            (
+                HabitPeriodStat.period_type,
+                HabitPeriodStat.period_start,
+                HabitPeriodStat.completions,
+            ),
+            HabitPeriodStat.habit_id == habit_id,
+            HabitPeriodStat.completions > 0,
+            or_(
+                and_(
+                    HabitPeriodStat.period_type == "week",
+                    HabitPeriodStat.period_start >= week_start,
+                ),
+                and_(
+                    HabitPeriodStat.period_type == "month",
+                    HabitPeriodStat.period_start >= month_start,
+                ),
+            ),
+        )
+        weeks, months = {}, {}
+        for row in rows:
+            periods = weeks if row.period_type == "week" else months
+            periods[row.period_start] = row.completions
+        return weeks, months
+
+    async def rebuild(self, habit_ids: Sequence[UUID]) -> int:
+        """
+        Rebuild the rollups of the given habits from their completed entries.
+
+        Returns the number of period rows written.
+        """
+        await self.db.execute(
+            delete(HabitPeriodStat).where(HabitPeriodStat.habit_id.in_(habit_ids))
+        )
+
+        written = 0
+        for period_type in ("week", "month"):
+            period_start = func.date_trunc(period_type, HabitEntry.entry_date).cast(
+                Date
+            )
+            stmt = pg_insert(HabitPeriodStat).from_select(
+                [
+                    "id",
+                    "created_at",
+                    "habit_id",
+                    "period_type",
+                    "period_start",
+                    "completions",
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    func.timezone("utc", func.now()),
+                    HabitEntry.habit_id,
+                    literal(period_type),
+                    period_start,
+                    func.count(),
+                )
+                .where(HabitEntry.habit_id.in_(habit_ids), HabitEntry.completed == True)
+                .group_by(HabitEntry.habit_id, period_start),
+            )
+            # Entries written while rebuilding may already have recreated a row
+            stmt = stmt.on_conflict_do_update(
+                constraint=self.upsert_constraint,
+                set_={"completions": stmt.excluded.completions},
+            )
+            result = await self.db.execute(stmt)
+            written += result.rowcount
+        return written
+
+
+class FoodRepository(UserScopedRepository[Food]):
     """Repository for food operations."""
 
+    cursor_keys = (Food.meal_date, Food.meal_time)
+    summary_columns = (
+        Food.user_id,
+        Food.meal_type,
+        Food.food_name,
+        Food.portion_size,
+        Food.calories,
+        Food.protein_grams,
+        Food.carbs_grams,
+        Food.fats_grams,
+        Food.is_favorite,
+        Food.created_at,
+    )
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Food)
 
@@ -101,35 +368,61 @@ class FoodRepository(BaseRepository[Food]):
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False,
     ) -> List[Food]:
         """Get all food entries for a user with optional filters."""
-        query = select(Food).where(Food.user_id == user_id)
+        return await self.list_for_user(
+            user_id,
+            *self._food_filters(meal_type, start_date, end_date),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+        )
+
+    async def count_user_foods(
+        self,
+        user_id: UUID,
+        meal_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """Count food entries for a user."""
+        return await self.count_for_user(
+            user_id, *self._food_filters(meal_type, start_date, end_date)
+        )
 
+    @staticmethod
+    def _food_filters(
+        meal_type: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> list:
+        """Build the WHERE criteria shared by food listing and counting."""
+        filters = []
         if meal_type:
-            query = query.where(Food.meal_type == meal_type)
+            filters.append(Food.meal_type == meal_type)
         if start_date:
-            query = query.where(Food.meal_date >= start_date)
+            filters.append(Food.meal_date >= start_date)
         if end_date:
-            query = query.where(Food.meal_date <= end_date)
-
-        query = (
-            query.offset(skip)
-            .limit(limit)
-            .order_by(Food.meal_date.desc(), Food.meal_time.desc())
-        )
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
-
-    async def count_user_foods(self, user_id: UUID) -> int:
-        """Count food entries for a user."""
-        result = await self.db.execute(select(Food).where(Food.user_id == user_id))
-        return len(list(result.scalars().all()))
+            filters.append(Food.meal_date <= end_date)
+        return filters
 
 
-class WorkoutRepository(BaseRepository[Workout]):
+class WorkoutRepository(UserScopedRepository[Workout]):
     """Repository for workout operations."""
 
+    cursor_keys = (Workout.workout_date,)
+    summary_columns = (
+        Workout.user_id,
+        Workout.workout_time,
+        Workout.workout_type,
+        Workout.workout_name,
+        Workout.duration_minutes,
+        Workout.calories_burned,
+        Workout.intensity,
+        Workout.created_at,
+    )
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Workout)
 
@@ -141,37 +434,74 @@ class WorkoutRepository(BaseRepository[Workout]):
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False,
     ) -> List[Workout]:
         """Get all workouts for a user with optional filters."""
-        query = (
-            select(Workout)
-            .where(Workout.user_id == user_id)
-            .options(selectinload(Workout.exercises))
+        return await self.list_for_user(
+            user_id,
+            *self._workout_filters(workout_type, start_date, end_date),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+            options=[selectinload(Workout.exercises)],
         )
 
+    async def count_user_workouts(
+        self,
+        user_id: UUID,
+        workout_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """Count workouts for a user."""
+        return await self.count_for_user(
+            user_id, *self._workout_filters(workout_type, start_date, end_date)
+        )
+
+    @staticmethod
+    def _workout_filters(
+        workout_type: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> list:
+        """Build the WHERE criteria shared by workout listing and counting."""
+        filters = []
         if workout_type:
-            query = query.where(Workout.workout_type == workout_type)
+            filters.append(Workout.workout_type == workout_type)
         if start_date:
-            query = query.where(Workout.workout_date >= start_date)
+            filters.append(Workout.workout_date >= start_date)
         if end_date:
-            query = query.where(Workout.workout_date <= end_date)
+            filters.append(Workout.workout_date <= end_date)
+        return filters
 
-        query = query.offset(skip).limit(limit).order_by(Workout.workout_date.desc())
 
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+class WorkoutExerciseRepository(BaseRepository[WorkoutExercise]):
+    """Repository for workout exercise operations."""
 
-    async def count_user_workouts(self, user_id: UUID) -> int:
-        """Count workouts for a user."""
-        result = await self.db.execute(
-            select(Workout).where(Workout.user_id == user_id)
-        )
-        return len(list(result.scalars().all()))
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, WorkoutExercise)
 
 
-class DailyReviewRepository(BaseRepository[DailyReview]):
+class DailyReviewRepository(UserScopedRepository[DailyReview]):
     """Repository for daily review operations."""
 
+    cursor_keys = (DailyReview.review_date,)
+    summary_columns = (
+        DailyReview.user_id,
+        DailyReview.mood_rating,
+        DailyReview.energy_level,
+        DailyReview.productivity_rating,
+        DailyReview.sleep_hours,
+        DailyReview.sleep_quality,
+        DailyReview.water_intake_ml,
+        DailyReview.screen_time_minutes,
+        DailyReview.steps,
+        DailyReview.created_at,
+    )
+    upsert_constraint = "uq_user_review_date"
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, DailyReview)
 
@@ -182,19 +512,18 @@ class DailyReviewRepository(BaseRepository[DailyReview]):
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False,
     ) -> List[DailyReview]:
         """Get all daily reviews for a user with optional filters."""
-        query = select(DailyReview).where(DailyReview.user_id == user_id)
-
-        if start_date:
-            query = query.where(DailyReview.review_date >= start_date)
-        if end_date:
-            query = query.where(DailyReview.review_date <= end_date)
-
-        query = query.offset(skip).limit(limit).order_by(DailyReview.review_date.desc())
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return await self.list_for_user(
+            user_id,
+            *self._review_filters(start_date, end_date),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+        )
 
     async def get_review_by_date(
         self, user_id: UUID, review_date: date
@@ -210,17 +539,44 @@ class DailyReviewRepository(BaseRepository[DailyReview]):
         )
         return result.scalar_one_or_none()
 
-    async def count_user_reviews(self, user_id: UUID) -> int:
+    async def count_user_reviews(
+        self,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
         """Count reviews for a user."""
-        result = await self.db.execute(
-            select(DailyReview).where(DailyReview.user_id == user_id)
+        return await self.count_for_user(
+            user_id, *self._review_filters(start_date, end_date)
         )
-        return len(list(result.scalars().all()))
+
+    @staticmethod
+    def _review_filters(start_date: Optional[date], end_date: Optional[date]) -> list:
+        """Build the WHERE criteria shared by review listing and counting."""
+        filters = []
+        if start_date:
+            filters.append(DailyReview.review_date >= start_date)
+        if end_date:
+            filters.append(DailyReview.review_date <= end_date)
+        return filters
 
 
-class BlogEntryRepository(BaseRepository[BlogEntry]):
+class BlogEntryRepository(UserScopedRepository[BlogEntry]):
     """Repository for blog entry operations."""
 
+    cursor_keys = (BlogEntry.created_at,)
+    summary_columns = (
+        BlogEntry.user_id,
+        BlogEntry.title,
+        BlogEntry.slug,
+        BlogEntry.excerpt,
+        BlogEntry.status,
+        BlogEntry.is_public,
+        BlogEntry.is_featured,
+        BlogEntry.view_count,
+        BlogEntry.published_at,
+    )
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, BlogEntry)
 
@@ -230,32 +586,40 @@ class BlogEntryRepository(BaseRepository[BlogEntry]):
         status: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False,
     ) -> List[BlogEntry]:
         """Get all blog entries for a user with optional filters."""
-        query = select(BlogEntry).where(BlogEntry.user_id == user_id)
-
-        if status:
-            query = query.where(BlogEntry.status == status)
-
-        query = query.offset(skip).limit(limit).order_by(BlogEntry.created_at.desc())
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return await self.list_for_user(
+            user_id,
+            *self._blog_filters(status),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+        )
 
     async def count_user_blog_entries(
         self, user_id: UUID, status: Optional[str] = None
     ) -> int:
         """Count blog entries for a user."""
-        query = select(BlogEntry).where(BlogEntry.user_id == user_id)
+        return await self.count_for_user(user_id, *self._blog_filters(status))
+
+    @staticmethod
+    def _blog_filters(status: Optional[str]) -> list:
+        """Build the WHERE criteria shared by blog listing and counting."""
+        filters = []
         if status:
-            query = query.where(BlogEntry.status == status)
-        result = await self.db.execute(query)
-        return len(list(result.scalars().all()))
+            filters.append(BlogEntry.status == status)
+        return filters
 
 
-class ProgressSnapshotRepository(BaseRepository[ProgressSnapshot]):
+class ProgressSnapshotRepository(UserScopedRepository[ProgressSnapshot]):
     """Repository for progress snapshot operations."""
 
+    cursor_keys = (ProgressSnapshot.snapshot_date,)
+    upsert_constraint = "uq_user_snapshot"
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, ProgressSnapshot)
 
@@ -265,25 +629,29 @@ class ProgressSnapshotRepository(BaseRepository[ProgressSnapshot]):
         snapshot_type: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[ProgressSnapshot]:
         """Get all progress snapshots for a user with optional filters."""
-        query = select(ProgressSnapshot).where(ProgressSnapshot.user_id == user_id)
-
-        if snapshot_type:
-            query = query.where(ProgressSnapshot.snapshot_type == snapshot_type)
-
-        query = (
-            query.offset(skip)
-            .limit(limit)
-            .order_by(ProgressSnapshot.snapshot_date.desc())
+        return await self.list_for_user(
+            user_id,
+            *self._snapshot_filters(snapshot_type),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
         )
 
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
-
-    async def count_user_snapshots(self, user_id: UUID) -> int:
+    async def count_user_snapshots(
+        self, user_id: UUID, snapshot_type: Optional[str] = None
+    ) -> int:
         """Count snapshots for a user."""
-        result = await self.db.execute(
-            select(ProgressSnapshot).where(ProgressSnapshot.user_id == user_id)
+        return await self.count_for_user(
+            user_id, *self._snapshot_filters(snapshot_type)
         )
-        return len(list(result.scalars().all()))
+
+    @staticmethod
+    def _snapshot_filters(snapshot_type: Optional[str]) -> list:
+        """Build the WHERE criteria shared by snapshot listing and counting."""
+        filters = []
+        if snapshot_type:
+            filters.append(ProgressSnapshot.snapshot_type == snapshot_type)
+        return filters
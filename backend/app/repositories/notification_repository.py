@@ -3,19 +3,27 @@ Repository for notification-related database operations.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.notification import Notification, NotificationSettings
-from app.repositories.base_repository import BaseRepository
+from app.models.notification import (
+    Notification,
+    NotificationSettings,
+    NotificationUnreadCount,
+)
+from app.repositories.base_repository import BaseRepository, UserScopedRepository
 
 
-class NotificationRepository(BaseRepository[Notification]):
+class NotificationRepository(UserScopedRepository[Notification]):
     """Repository for notification operations."""
 
+    cursor_keys = (Notification.scheduled_time,)
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Notification)
 
@@ -25,16 +33,16 @@ class NotificationRepository(BaseRepository[Notification]):
         is_read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Notification]:
         """Get notifications for a user with optional filter."""
-        query = select(Notification).where(Notification.user_id == user_id)
-
-        if is_read is not None:
-            query = query.where(Notification.is_read == is_read)
-
-        query = query.order_by(Notification.scheduled_time.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return await self.list_for_user(
+            user_id,
+            *self._notification_filters(is_read),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
 
     async def get_pending_notifications(
         self, before_time: datetime, limit: int = 100
@@ -50,14 +58,88 @@ class NotificationRepository(BaseRepository[Notification]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
-    async def mark_as_read(self, notification_id: UUID) -> Optional[Notification]:
-        """Mark a notification as read."""
-        notification = await self.get_by_id(notification_id)
-        if notification:
-            notification.is_read = True
-            await self.db.flush()
-            await self.db.refresh(notification)
-        return notification
+    async def get_pending_schedule(
+        self, after_time: datetime, until_time: datetime, limit: int = 10000
+    ) -> List[Row]:
+        """Get the IDs and times of pending notifications due in a time range."""
+        result = await self.db.execute(
+            select(Notification.id, Notification.scheduled_time)
+            .where(Notification.status == "pending")
+            .where(Notification.scheduled_time > after_time)
+            .where(Notification.scheduled_time <= until_time)
+            .order_by(Notification.scheduled_time)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def claim_pending_notifications(
+        self,
+        before_time: datetime,
+        limit: int = 100,
+        notification_ids: Optional[Sequence[UUID]] = None,
+    ) -> List[Notification]:
+        """
+        Mark up to ``limit`` due pending notifications as sent and return them.
+
+        The rows are claimed with one UPDATE ... WHERE id IN (SELECT ... FOR
+        UPDATE SKIP LOCKED LIMIT n) RETURNING, so concurrent workers each get
+        a disjoint batch instead of blocking on or re-sending the same rows.
+        ``notification_ids`` restricts the claim to the given notifications.
+        """
+        claimable = (
+            select(Notification.id)
+            .where(Notification.status == "pending")
+            .where(Notification.scheduled_time <= before_time)
+            .order_by(Notification.scheduled_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if notification_ids is not None:
+            claimable = claimable.where(Notification.id.in_(notification_ids))
+        stmt = (
+            update(Notification)
+            .where(Notification.id.in_(claimable.scalar_subquery()))
+            .values(status="sent", sent_at=datetime.utcnow())
+            .returning(Notification, Notification.status, Notification.sent_at)
+        )
+        result = await self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        notifications = []
+        for notification, status, sent_at in result.all():
+            # Copies already in the session keep their loaded values otherwise
+            set_committed_value(notification, "status", status)
+            set_committed_value(notification, "sent_at", sent_at)
+            notifications.append(notification)
+        # RETURNING does not keep the subquery's order
+        return sorted(notifications, key=lambda n: n.scheduled_time)
+
+    async def cancel_pending_goal_reminders(
+        self, goal_id: UUID, user_id: UUID
+    ) -> List[UUID]:
+        """Cancel a goal's pending reminders; returns the cancelled IDs."""
+        result = await self.db.execute(
+            update(Notification)
+            .where(
+                Notification.goal_id == goal_id,
+                Notification.user_id == user_id,
+                Notification.notification_type == "reminder",
+                Notification.status == "pending",
+            )
+            .values(status="cancelled")
+            .returning(Notification.id)
+        )
+        return list(result.scalars().all())
+
+    async def mark_as_failed(self, notification_ids: Sequence[UUID]) -> int:
+        """Mark notifications whose delivery failed; returns the rows updated."""
+        result = await self.db.execute(
+            update(Notification)
+            .where(Notification.id.in_(notification_ids))
+            .values(status="failed"),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
 
     async def mark_as_sent(self, notification_id: UUID) -> Optional[Notification]:
         """Mark a notification as sent."""
@@ -73,13 +155,15 @@ class NotificationRepository(BaseRepository[Notification]):
         self, user_id: UUID, is_read: Optional[bool] = None
     ) -> int:
         """Count notifications for a user."""
-        query = select(Notification).where(Notification.user_id == user_id)
+        return await self.count_for_user(user_id, *self._notification_filters(is_read))
 
+    @staticmethod
+    def _notification_filters(is_read: Optional[bool]) -> list:
+        """Build the WHERE criteria shared by notification listing and counting."""
+        filters = []
         if is_read is not None:
-            query = query.where(Notification.is_read == is_read)
-
-        result = await self.db.execute(query)
-        return len(list(result.scalars().all()))
+            filters.append(Notification.is_read == is_read)
+        return filters
 
 
 class NotificationSettingsRepository(BaseRepository[NotificationSettings]):
@@ -102,3 +186,66 @@ class NotificationSettingsRepository(BaseRepository[NotificationSettings]):
         """Create default notification settings for a new user."""
         settings = NotificationSettings(user_id=user_id)
         return await self.create(settings)
+
+
+class NotificationUnreadCountRepository(BaseRepository[NotificationUnreadCount]):
+    """Repository for the unread notification counters of users."""
+
+    upsert_constraint = "uq_notification_unread_count_user"
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, NotificationUnreadCount)
+
+    async def get_count(self, user_id: UUID) -> int:
+        """Get the number of unread notifications of a user."""
+        count = await self.db.scalar(
+            select(NotificationUnreadCount.unread_count).where(
+                NotificationUnreadCount.user_id == user_id
+            )
+        )
+        return count or 0
+
+    async def reconcile(self, user_ids: Sequence[UUID]) -> List[UUID]:
+        """
+        Reset the given users' counters to their actual unread notifications.
+
+        The counters are locked before counting, so writes racing with the
+        repair wait for it and then apply their change on top. Returns the
+        users whose counter had drifted.
+        """
+        await self.db.execute(
+            pg_insert(NotificationUnreadCount)
+            .values([{"user_id": user_id, "unread_count": 0} for user_id in user_ids])
+            .on_conflict_do_nothing(constraint=self.upsert_constraint)
+        )
+        counters = dict(
+            (
+                await self.db.execute(
+                    select(
+                        NotificationUnreadCount.user_id,
+                        NotificationUnreadCount.unread_count,
+                    )
+                    .where(NotificationUnreadCount.user_id.in_(user_ids))
+                    .with_for_update()
+                )
+            ).all()
+        )
+        actual = dict(
+            (
+                await self.db.execute(
+                    select(Notification.user_id, func.count())
+                    .where(
+                        Notification.user_id.in_(user_ids),
+                        Notification.is_read.is_(False),
+                    )
+                    .group_by(Notification.user_id)
+                )
+            ).all()
+        )
+        drifted = [
+            {"user_id": user_id, "unread_count": actual.get(user_id, 0)}
+            for user_id, count in counters.items()
+            if count != actual.get(user_id, 0)
+        ]
+        await self.bulk_upsert(drifted)
+        return [row["user_id"] for row in drifted]
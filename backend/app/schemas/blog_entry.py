@@ -50,3 +50,24 @@ class BlogEntryResponse(BlogEntryBase):
 
     class Config:
         from_attributes = True
+
+
+class BlogEntrySummaryResponse(BaseModel):
+    """Schema for blog entries in the summary list view, without content."""
+
+    id: UUID
+    user_id: UUID
+    title: str
+    slug: Optional[str] = None
+    excerpt: Optional[str] = None
+    status: str
+    is_public: bool = False
+    is_featured: bool = False
+    view_count: int
+    published_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+        # Keeps full rows from matching the summary schema in list responses
+        extra = "forbid"
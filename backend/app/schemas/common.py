@@ -41,13 +41,20 @@ class PaginationParams(BaseModel):
 
 
 class PaginatedResponse(BaseModel, Generic[DataT]):
-    """Paginated response with items."""
+    """
+    Paginated response with items.
+
+    ``total`` and ``total_pages`` are omitted (None) when the page was fetched
+    by cursor; follow ``next_cursor`` while ``has_more`` is true instead.
+    """
 
     items: List[DataT]
-    total: int
+    total: Optional[int] = None
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 
 class HealthCheck(BaseModel):
@@ -65,3 +65,25 @@ class DailyReviewResponse(DailyReviewBase):
 
     class Config:
         from_attributes = True
+
+
+class DailyReviewSummaryResponse(BaseModel):
+    """Schema for daily reviews in the summary list view, without reflections."""
+
+    id: UUID
+    user_id: UUID
+    review_date: date
+    mood_rating: Optional[int] = None
+    energy_level: Optional[int] = None
+    productivity_rating: Optional[int] = None
+    sleep_hours: Optional[Decimal] = None
+    sleep_quality: Optional[int] = None
+    water_intake_ml: Optional[int] = None
+    screen_time_minutes: Optional[int] = None
+    steps: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+        # Keeps full rows from matching the summary schema in list responses
+        extra = "forbid"
@@ -62,3 +62,26 @@ class FoodResponse(FoodBase):
 
     class Config:
         from_attributes = True
+
+
+class FoodSummaryResponse(BaseModel):
+    """Schema for food entries in the summary list view, without notes."""
+
+    id: UUID
+    user_id: UUID
+    meal_date: date
+    meal_time: Optional[time] = None
+    meal_type: str
+    food_name: str
+    portion_size: Optional[str] = None
+    calories: Optional[Decimal] = None
+    protein_grams: Optional[Decimal] = None
+    carbs_grams: Optional[Decimal] = None
+    fats_grams: Optional[Decimal] = None
+    is_favorite: bool = False
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+        # Keeps full rows from matching the summary schema in list responses
+        extra = "forbid"
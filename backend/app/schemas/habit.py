@@ -51,6 +51,8 @@ class HabitResponse(HabitBase):
     current_streak: int
     longest_streak: int
     total_completions: int
+    streak_start_date: Optional[date] = None
+    last_completed_date: Optional[date] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -86,6 +86,15 @@ class MonthlyProgress(BaseModel):
     completion_rate: float
 
 
+class RollingCompletionRate(BaseModel):
+    """Completion rate over a trailing window, for each day of a period."""
+
+    window_days: int = Field(description="Length of the trailing window in days")
+    rates: List[float] = Field(
+        description="Completion rate (0-100) of the window ending on each day"
+    )
+
+
 class ProgressTrends(BaseModel):
     """Progress trends over time."""
 
@@ -101,6 +110,51 @@ class ProgressTrends(BaseModel):
     overall_trend: str = Field(
         description="Overall trend direction: improving, stable, declining"
     )
+    rolling_rates: Optional[List[RollingCompletionRate]] = Field(
+        None, description="Trailing completion rates, aligned with daily_data"
+    )
+
+
+class HabitHeatmapSeries(BaseModel):
+    """Completion series of one habit, encoded as a bitset."""
+
+    habit_id: UUID
+    habit_name: str
+    color: Optional[str] = None
+    completions: int = Field(ge=0, description="Completed days in the range")
+    bitmap: str = Field(
+        description=(
+            "Base64 bitset of completed days; bit i, most significant bit "
+            "first, is start_date + i days"
+        )
+    )
+
+
+class HabitHeatmap(BaseModel):
+    """Completion heatmap for all of a user's habits."""
+
+    start_date: date
+    end_date: date
+    habits: List[HabitHeatmapSeries]
+
+
+class CompletionWindow(BaseModel):
+    """Completions of a habit within one window of days."""
+
+    start_date: date
+    end_date: date
+    days: int = Field(ge=1, description="Days in the window, both ends included")
+    completions: int = Field(ge=0, description="Completed days in the window")
+    completion_rate: float = Field(
+        ge=0, le=100, description="Percentage of days in the window completed"
+    )
+
+
+class HabitCompletionWindows(BaseModel):
+    """Completion counts of a habit over several windows."""
+
+    habit_id: UUID
+    windows: List[CompletionWindow]
 
 
 class StreakRecoveryInfo(BaseModel):
@@ -50,6 +50,12 @@ class NotificationResponse(NotificationBase):
         from_attributes = True
 
 
+class NotificationUnreadCountResponse(BaseModel):
+    """Schema for a user's unread notification count."""
+
+    unread_count: int
+
+
 class NotificationSettingsBase(BaseModel):
     """Base schema for notification settings."""
 
@@ -92,3 +92,23 @@ class WorkoutResponse(WorkoutBase):
 
     class Config:
         from_attributes = True
+
+
+class WorkoutSummaryResponse(BaseModel):
+    """Schema for workouts in the summary list view, without notes or exercises."""
+
+    id: UUID
+    user_id: UUID
+    workout_date: date
+    workout_time: Optional[time] = None
+    workout_type: str
+    workout_name: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    calories_burned: Optional[Decimal] = None
+    intensity: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+        # Keeps full rows from matching the summary schema in list responses
+        extra = "forbid"
@@ -7,6 +7,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.goal import Goal, GoalProgress, GoalMilestone
@@ -49,17 +50,19 @@ class GoalService:
 
     async def get_goal(self, goal_id: UUID, user_id: UUID) -> Goal:
         """Get a goal by ID, ensuring it belongs to the user."""
-        goal = await self.repository.get_by_id(goal_id)
+        goal = await self.repository.get_owned(goal_id, user_id)
         if not goal:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found"
             )
-        if goal.user_id != user_id:
+        return goal
+
+    async def _ensure_goal_owned(self, goal_id: UUID, user_id: UUID) -> None:
+        """Raise 404 unless the goal belongs to the user, without loading it."""
+        if not await self.repository.exists_owned(goal_id, user_id):
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this goal",
+                status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found"
             )
-        return goal
 
     async def get_user_goals(
         self,
@@ -68,27 +71,40 @@ class GoalService:
         status_filter: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Goal], int]:
-        """Get all goals for a user with pagination."""
+        cursor: Optional[str] = None,
+    ) -> tuple[List[Goal], Optional[int]]:
+        """
+        Get all goals for a user with pagination.
+
+        When paging by cursor the total count is skipped and returned as None.
+        """
         goals = await self.repository.get_user_goals(
-            user_id, goal_type, status_filter, skip, limit
+            user_id, goal_type, status_filter, skip, limit, cursor
         )
-        total = await self.repository.count_user_goals(user_id, status_filter)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_goals(
+                user_id, status_filter, goal_type
+            )
         return goals, total
 
     async def update_goal(
         self, goal_id: UUID, user_id: UUID, goal_data: GoalUpdate
     ) -> Goal:
         """Update a goal."""
-        goal = await self.get_goal(goal_id, user_id)
-
         update_data = goal_data.model_dump(exclude_unset=True)
 
-        # Auto-complete goal if status is completed
-        if update_data.get("status") == "completed" and not goal.completed_at:
-            update_data["completed_at"] = datetime.utcnow()
+        # Auto-complete goal if status is completed, keeping the first date
+        if update_data.get("status") == "completed":
+            update_data["completed_at"] = func.coalesce(
+                Goal.completed_at, datetime.utcnow()
+            )
 
-        updated_goal = await self.repository.update(goal, update_data)
+        updated_goal = await self.repository.update_owned(goal_id, user_id, update_data)
+        if not updated_goal:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found"
+            )
 
         # Update or create reminder if reminder settings changed
         if (
@@ -99,18 +115,18 @@ class GoalService:
             from app.services.notification_service import NotificationService
 
             notification_service = NotificationService(self.db)
-            # Cancel existing reminders for this goal
-            # (In a real implementation, you'd query and cancel/delete old reminders)
-            # Then create new reminder if enabled
-            if updated_goal.reminder_enabled:
-                await notification_service.create_goal_reminder(updated_goal, user_id)
+            # Replaces the pending reminder, or just cancels it when disabled
+            await notification_service.create_goal_reminder(updated_goal, user_id)
 
         return updated_goal
 
     async def delete_goal(self, goal_id: UUID, user_id: UUID) -> bool:
         """Delete a goal."""
-        goal = await self.get_goal(goal_id, user_id)
-        return await self.repository.delete(goal.id)
+        if not await self.repository.delete_owned(goal_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found"
+            )
+        return True
 
     async def add_progress(
         self, goal_id: UUID, user_id: UUID, progress_data: GoalProgressCreate
@@ -141,7 +157,7 @@ class GoalService:
     ) -> List[GoalProgress]:
         """Get progress entries for a goal."""
         # Verify user owns the goal
-        await self.get_goal(goal_id, user_id)
+        await self._ensure_goal_owned(goal_id, user_id)
         return await self.progress_repository.get_goal_progress(goal_id, skip, limit)
 
     async def create_milestone(
@@ -164,7 +180,7 @@ class GoalService:
         self, goal_id: UUID, user_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[GoalMilestone]:
         """Get milestones for a goal."""
-        await self.get_goal(goal_id, user_id)
+        await self._ensure_goal_owned(goal_id, user_id)
         return await self.milestone_repository.get_goal_milestones(goal_id, skip, limit)
 
     async def update_milestone(
@@ -175,32 +191,42 @@ class GoalService:
         milestone_data: GoalMilestoneUpdate,
     ) -> GoalMilestone:
         """Update a milestone."""
-        await self.get_goal(goal_id, user_id)
-
-        milestone = await self.milestone_repository.get_by_id(milestone_id)
-        if not milestone or milestone.goal_id != goal_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found"
-            )
-
         update_data = milestone_data.model_dump(exclude_unset=True)
 
         # Auto-set completed_at if status is completed
-        if update_data.get("status") == "completed" and not milestone.completed_at:
-            update_data["completed_at"] = datetime.utcnow()
+        if update_data.get("status") == "completed":
+            update_data["completed_at"] = func.coalesce(
+                GoalMilestone.completed_at, datetime.utcnow()
+            )
 
-        return await self.milestone_repository.update(milestone, update_data)
+        milestone = await self.milestone_repository.update_where(
+            self._milestone_criteria(milestone_id, goal_id, user_id), update_data
+        )
+        if not milestone:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found"
+            )
+        return milestone
 
     async def delete_milestone(
         self, milestone_id: UUID, goal_id: UUID, user_id: UUID
     ) -> bool:
         """Delete a milestone."""
-        await self.get_goal(goal_id, user_id)
-
-        milestone = await self.milestone_repository.get_by_id(milestone_id)
-        if not milestone or milestone.goal_id != goal_id:
+        deleted = await self.milestone_repository.delete_where(
+            *self._milestone_criteria(milestone_id, goal_id, user_id)
+        )
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Milestone not found"
             )
-
-        return await self.milestone_repository.delete(milestone_id)
+        return True
+
+    @staticmethod
+    def _milestone_criteria(milestone_id: UUID, goal_id: UUID, user_id: UUID) -> list:
+        """Match a milestone of a goal owned by the user in a single statement."""
+        owned_goal = select(Goal.id).where(Goal.user_id == user_id, Goal.id == goal_id)
+        return [
+            GoalMilestone.id == milestone_id,
+            GoalMilestone.goal_id == goal_id,
+            GoalMilestone.goal_id.in_(owned_goal),
+        ]
@@ -3,15 +3,34 @@ Service for habit analytics, streak tracking, and insights.
 """
 
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple
+from itertools import accumulate
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
+import base64
 import calendar
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, and_, func
+from sqlalchemy import Date, Integer, Row, select, and_, extract, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import AnalyticsCache
 from app.models.habit import Habit, HabitEntry
+from app.repositories.module_repositories import (
+    HabitEntryRepository,
+    HabitPeriodStatRepository,
+    HabitRepository,
+    HabitYearBitmapRepository,
+)
 from app.schemas.habit_analytics import (
     StreakInfo,
     CompletionStats,
@@ -20,16 +39,111 @@ from app.schemas.habit_analytics import (
     WeeklyProgress,
     MonthlyProgress,
     ProgressTrends,
+    RollingCompletionRate,
     StreakRecoveryInfo,
     HabitInsights,
+    HabitHeatmap,
+    HabitHeatmapSeries,
+    CompletionWindow,
+    HabitCompletionWindows,
 )
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the "numpy" trends engine
+    np = None
+
+# Monday from which SQL streak periods are numbered
+_PERIOD_EPOCH = date(2000, 1, 3)
+
+T = TypeVar("T")
+
+# Longest range a heatmap may cover, about ten years
+MAX_HEATMAP_DAYS = 3660
+
+# Most windows a single /windows request may ask for
+MAX_COMPLETION_WINDOWS = 20
+
+# Trailing windows of the rolling completion rates in progress trends
+ROLLING_RATE_WINDOWS = (7, 30)
+
+
+def period_bounds(frequency: str, day: date) -> Tuple[date, date, date]:
+    """
+    Return the start of the streak period before ``day``'s, of ``day``'s own
+    period and of the period after it.
+
+    Daily habits count days, weekly habits count weeks starting on Monday and
+    other habits count calendar months.
+    """
+    if frequency == "daily":
+        return day - timedelta(days=1), day, day + timedelta(days=1)
+    if frequency == "weekly":
+        start = day - timedelta(days=day.weekday())
+        return start - timedelta(weeks=1), start, start + timedelta(weeks=1)
+    start = day.replace(day=1)
+    previous = (start - timedelta(days=1)).replace(day=1)
+    return previous, start, (start + timedelta(days=31)).replace(day=1)
+
+
+class CompletionWindowIndex:
+    """
+    Prefix sums of a habit's completions, one per day.
+
+    Built once from the completed dates, after which the completions in any
+    window are the difference of two prefix sums.
+    """
+
+    def __init__(self, completed_dates: Iterable[date], today: date):
+        dates = sorted(completed_dates)
+        self.start_date = dates[0] if dates else today
+        # Entries dated after today are counted too
+        self.end_date = max(today, dates[-1]) if dates else today
+        completed = [0] * ((self.end_date - self.start_date).days + 1)
+        for day in dates:
+            completed[(day - self.start_date).days] = 1
+        self._cumulative = [0, *accumulate(completed)]
+
+    def count(self, start_date: date, end_date: date) -> int:
+        """Count the completions from ``start_date`` to ``end_date``, inclusive."""
+        first = max((start_date - self.start_date).days, 0)
+        last = min((end_date - self.start_date).days + 1, len(self._cumulative) - 1)
+        if last <= first:
+            return 0
+        return self._cumulative[last] - self._cumulative[first]
+
 
 class HabitAnalyticsService:
     """Service for habit analytics and streak calculations."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: Optional[AnalyticsCache] = None):
         self.db = db
+        self.cache = cache
+        self.habit_repository = HabitRepository(db)
+        self.entry_repository = HabitEntryRepository(db)
+        self.bitmap_repository = HabitYearBitmapRepository(db)
+        self.period_stat_repository = HabitPeriodStatRepository(db)
+
+    async def _cached(
+        self,
+        user_id: UUID,
+        habit_id: Optional[UUID],
+        name: str,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Serve a result from the analytics cache, when the service has one."""
+        if self.cache is None:
+            return await compute()
+        return await self.cache.get_or_compute(user_id, habit_id, name, compute)
+
+    async def _get_owned_habit(self, habit_id: UUID, user_id: UUID) -> Habit:
+        """Get a habit of the user, reusing a copy already loaded this request."""
+        habit = await self.habit_repository.get_owned(habit_id, user_id)
+        if not habit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+            )
+        return habit
 
     async def calculate_streak(self, habit_id: UUID, user_id: UUID) -> StreakInfo:
         """
@@ -37,26 +151,112 @@ class HabitAnalyticsService:
         Handles daily, weekly, and monthly frequencies.
         """
         # Get habit
-        habit_result = await self.db.execute(
-            select(Habit).where(and_(Habit.id == habit_id, Habit.user_id == user_id))
-        )
-        habit = habit_result.scalar_one_or_none()
-        if not habit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+        habit = await self._get_owned_habit(habit_id, user_id)
+
+        # Get all completed dates, newest first, from the year bitmaps
+        completed_dates = await self.bitmap_repository.get_completed_dates(habit_id)
+
+        return self._calculate_streak_from_dates(habit.frequency, completed_dates)
+
+    async def get_window_index(
+        self, habit_id: UUID, user_id: UUID
+    ) -> CompletionWindowIndex:
+        """
+        Get the prefix sums of a habit's completions.
+
+        They are built from the year bitmaps and cached like the other
+        analytics until the habit's entries change or the day rolls over.
+        """
+
+        async def build() -> CompletionWindowIndex:
+            await self._get_owned_habit(habit_id, user_id)
+            completed_dates = await self.bitmap_repository.get_completed_dates(habit_id)
+            return CompletionWindowIndex(completed_dates, date.today())
+
+        return await self._cached(user_id, habit_id, "windows:index", build)
+
+    def _calculate_streak_from_dates(
+        self, frequency: str, completed_dates: Sequence[date]
+    ) -> StreakInfo:
+        """Calculate streak information from completed dates, newest first."""
+        if not completed_dates:
+            return StreakInfo(
+                current_streak=0,
+                longest_streak=0,
+                last_completed_date=None,
+                is_active=False,
+                streak_start_date=None,
             )
 
-        # Get all completed entries, sorted by date descending
-        entries_result = await self.db.execute(
-            select(HabitEntry)
-            .where(
-                and_(HabitEntry.habit_id == habit_id, HabitEntry.completed == True)
+        # Calculate streaks based on frequency
+        if frequency == "daily":
+            return self._calculate_daily_streak(completed_dates)
+        elif frequency == "weekly":
+            return self._calculate_weekly_streak(completed_dates)
+        else:  # monthly or custom
+            return self._calculate_monthly_streak(completed_dates)
+
+    async def calculate_streak_in_db(self, habit_id: UUID, user_id: UUID) -> StreakInfo:
+        """
+        Calculate streak information with a single SQL query.
+
+        Gives the same result as ``calculate_streak`` but only transfers the
+        figures for the latest run of consecutive periods, whatever the length
+        of the history.
+        """
+        habit = await self._get_owned_habit(habit_id, user_id)
+
+        # Number each streak period so that consecutive periods differ by one
+        if habit.frequency == "daily":
+            period = HabitEntry.entry_date - _PERIOD_EPOCH
+        elif habit.frequency == "weekly":
+            week_start = func.date_trunc("week", HabitEntry.entry_date).cast(Date)
+            period = (week_start - _PERIOD_EPOCH) // 7
+        else:
+            period = (
+                extract("year", HabitEntry.entry_date) * 12
+                + extract("month", HabitEntry.entry_date)
+            ).cast(Integer)
+
+        periods = (
+            select(
+                period.label("period"),
+                func.min(HabitEntry.entry_date).label("first_date"),
+                func.max(HabitEntry.entry_date).label("last_date"),
+            )
+            .where(HabitEntry.habit_id == habit_id, HabitEntry.completed == True)
+            .group_by(period)
+            .subquery()
+        )
+        # Consecutive periods share the same period - row_number() island
+        islands = select(
+            periods,
+            (
+                periods.c.period - func.row_number().over(order_by=periods.c.period)
+            ).label("island"),
+        ).subquery()
+        runs = (
+            select(
+                func.count().label("length"),
+                func.min(islands.c.first_date).label("start_date"),
+                func.max(islands.c.last_date).label("end_date"),
+            )
+            .group_by(islands.c.island)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                runs.c.length,
+                runs.c.start_date,
+                runs.c.end_date,
+                func.max(runs.c.length).over().label("longest"),
             )
-            .order_by(HabitEntry.entry_date.desc())
+            .order_by(runs.c.end_date.desc())
+            .limit(1)
         )
-        completed_entries = list(entries_result.scalars().all())
+        latest_run = result.first()
 
-        if not completed_entries:
+        if latest_run is None:
             return StreakInfo(
                 current_streak=0,
                 longest_streak=0,
@@ -65,19 +265,27 @@ class HabitAnalyticsService:
                 streak_start_date=None,
             )
 
-        # Calculate streaks based on frequency
+        today = date.today()
+        last_completed = latest_run.end_date
         if habit.frequency == "daily":
-            return self._calculate_daily_streak(completed_entries)
-        elif habit.frequency == "weekly":
-            return self._calculate_weekly_streak(completed_entries)
-        else:  # monthly or custom
-            return self._calculate_monthly_streak(completed_entries)
+            is_active = (today - last_completed).days <= 1
+        else:
+            is_active = (
+                period_bounds(habit.frequency, last_completed)[1]
+                == period_bounds(habit.frequency, today)[1]
+            )
 
-    def _calculate_daily_streak(
-        self, completed_entries: List[HabitEntry]
-    ) -> StreakInfo:
+        return StreakInfo(
+            current_streak=latest_run.length,
+            longest_streak=latest_run.longest,
+            last_completed_date=last_completed,
+            is_active=is_active,
+            streak_start_date=latest_run.start_date,
+        )
+
+    def _calculate_daily_streak(self, completed_dates: Sequence[date]) -> StreakInfo:
         """Calculate streak for daily habits."""
-        if not completed_entries:
+        if not completed_dates:
             return StreakInfo(
                 current_streak=0,
                 longest_streak=0,
@@ -87,7 +295,7 @@ class HabitAnalyticsService:
             )
 
         today = date.today()
-        last_completed = completed_entries[0].entry_date
+        last_completed = completed_dates[0]
         
         # Check if streak is active (completed today or yesterday)
         days_since_last = (today - last_completed).days
@@ -98,24 +306,24 @@ class HabitAnalyticsService:
         streak_start_date = None
         expected_date = last_completed
 
-        for entry in completed_entries:
-            if entry.entry_date == expected_date or (
-                expected_date - entry.entry_date
-            ).days == 0:
-                if current_streak == 0:
-                    streak_start_date = entry.entry_date
+        for completed_date in completed_dates:
+            if (
+                completed_date == expected_date
+                or (expected_date - completed_date).days == 0
+            ):
+                streak_start_date = completed_date
                 current_streak += 1
-                expected_date = entry.entry_date - timedelta(days=1)
+                expected_date = completed_date - timedelta(days=1)
             else:
                 break
 
         # Calculate longest streak
         longest_streak = 1
         temp_streak = 1
-        prev_date = completed_entries[0].entry_date
+        prev_date = completed_dates[0]
 
-        for i in range(1, len(completed_entries)):
-            current_date = completed_entries[i].entry_date
+        for i in range(1, len(completed_dates)):
+            current_date = completed_dates[i]
             if (prev_date - current_date).days == 1:
                 temp_streak += 1
                 longest_streak = max(longest_streak, temp_streak)
@@ -131,11 +339,9 @@ class HabitAnalyticsService:
             streak_start_date=streak_start_date,
         )
 
-    def _calculate_weekly_streak(
-        self, completed_entries: List[HabitEntry]
-    ) -> StreakInfo:
+    def _calculate_weekly_streak(self, completed_dates: Sequence[date]) -> StreakInfo:
         """Calculate streak for weekly habits."""
-        if not completed_entries:
+        if not completed_dates:
             return StreakInfo(
                 current_streak=0,
                 longest_streak=0,
@@ -145,15 +351,15 @@ class HabitAnalyticsService:
             )
 
         today = date.today()
-        last_completed = completed_entries[0].entry_date
+        last_completed = completed_dates[0]
 
-        # Group entries by week
+        # Group dates by week
         weeks = {}
-        for entry in completed_entries:
-            week_start = entry.entry_date - timedelta(days=entry.entry_date.weekday())
+        for completed_date in completed_dates:
+            week_start = completed_date - timedelta(days=completed_date.weekday())
             if week_start not in weeks:
                 weeks[week_start] = []
-            weeks[week_start].append(entry)
+            weeks[week_start].append(completed_date)
 
         sorted_weeks = sorted(weeks.keys(), reverse=True)
         
@@ -168,8 +374,7 @@ class HabitAnalyticsService:
 
         for week_start in sorted_weeks:
             if expected_week and week_start == expected_week:
-                if current_streak == 0:
-                    streak_start_date = weeks[week_start][0].entry_date
+                streak_start_date = weeks[week_start][-1]
                 current_streak += 1
                 expected_week = week_start - timedelta(weeks=1)
             else:
@@ -194,11 +399,9 @@ class HabitAnalyticsService:
             streak_start_date=streak_start_date,
         )
 
-    def _calculate_monthly_streak(
-        self, completed_entries: List[HabitEntry]
-    ) -> StreakInfo:
+    def _calculate_monthly_streak(self, completed_dates: Sequence[date]) -> StreakInfo:
         """Calculate streak for monthly habits."""
-        if not completed_entries:
+        if not completed_dates:
             return StreakInfo(
                 current_streak=0,
                 longest_streak=0,
@@ -208,15 +411,15 @@ class HabitAnalyticsService:
             )
 
         today = date.today()
-        last_completed = completed_entries[0].entry_date
+        last_completed = completed_dates[0]
 
-        # Group entries by month
+        # Group dates by month
         months = {}
-        for entry in completed_entries:
-            month_key = (entry.entry_date.year, entry.entry_date.month)
+        for completed_date in completed_dates:
+            month_key = (completed_date.year, completed_date.month)
             if month_key not in months:
                 months[month_key] = []
-            months[month_key].append(entry)
+            months[month_key].append(completed_date)
 
         sorted_months = sorted(months.keys(), reverse=True)
         
@@ -231,8 +434,7 @@ class HabitAnalyticsService:
 
         for month_key in sorted_months:
             if expected_month and month_key == expected_month:
-                if current_streak == 0:
-                    streak_start_date = months[month_key][0].entry_date
+                streak_start_date = months[month_key][-1]
                 current_streak += 1
                 # Calculate previous month
                 year, month = month_key
@@ -276,54 +478,64 @@ class HabitAnalyticsService:
     ) -> CompletionStats:
         """Get completion statistics for a habit."""
         # Verify habit ownership
-        habit_result = await self.db.execute(
-            select(Habit).where(and_(Habit.id == habit_id, Habit.user_id == user_id))
-        )
-        habit = habit_result.scalar_one_or_none()
-        if not habit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
-            )
+        await self._get_owned_habit(habit_id, user_id)
 
-        # Get all entries
-        all_entries_result = await self.db.execute(
-            select(HabitEntry).where(HabitEntry.habit_id == habit_id)
-        )
-        all_entries = list(all_entries_result.scalars().all())
+        stats = await self.get_completion_stats_batch([habit_id], user_id)
+        return stats[habit_id]
+
+    async def get_completion_stats_batch(
+        self, habit_ids: Sequence[UUID], user_id: UUID
+    ) -> Dict[UUID, CompletionStats]:
+        """
+        Get completion statistics for many habits with one GROUP BY query.
 
-        # Get completed entries
-        completed_entries_result = await self.db.execute(
-            select(HabitEntry).where(
-                and_(HabitEntry.habit_id == habit_id, HabitEntry.completed == True)
+        Habits that do not belong to the user are left out of the result.
+        """
+        today = date.today()
+        current_month_start = date(today.year, today.month, 1)
+        current_week_start = today - timedelta(days=today.weekday())
+        completed = HabitEntry.completed == True
+
+        result = await self.db.execute(
+            select(
+                Habit.id,
+                func.count(HabitEntry.id).label("total_days_tracked"),
+                func.count(HabitEntry.id).filter(completed).label("total_completions"),
+                func.count(HabitEntry.id)
+                .filter(completed, HabitEntry.entry_date >= current_month_start)
+                .label("current_month_completions"),
+                func.count(HabitEntry.id)
+                .filter(completed, HabitEntry.entry_date >= current_week_start)
+                .label("current_week_completions"),
             )
+            .outerjoin(HabitEntry, HabitEntry.habit_id == Habit.id)
+            .where(Habit.user_id == user_id, Habit.id.in_(habit_ids))
+            .group_by(Habit.id)
         )
-        completed_entries = list(completed_entries_result.scalars().all())
 
-        total_completions = len(completed_entries)
-        total_days_tracked = len(all_entries)
+        return {
+            row.id: self._build_completion_stats(
+                row.total_completions,
+                row.total_days_tracked,
+                row.current_month_completions,
+                row.current_week_completions,
+            )
+            for row in result
+        }
+
+    def _build_completion_stats(
+        self,
+        total_completions: int,
+        total_days_tracked: int,
+        current_month_completions: int,
+        current_week_completions: int,
+    ) -> CompletionStats:
+        """Build completion statistics from the counted entries."""
         completion_rate = (
             (total_completions / total_days_tracked * 100)
             if total_days_tracked > 0
             else 0.0
         )
-
-        # Current month completions
-        today = date.today()
-        current_month_start = date(today.year, today.month, 1)
-        current_month_completions = sum(
-            1
-            for entry in completed_entries
-            if entry.entry_date >= current_month_start
-        )
-
-        # Current week completions
-        current_week_start = today - timedelta(days=today.weekday())
-        current_week_completions = sum(
-            1
-            for entry in completed_entries
-            if entry.entry_date >= current_week_start
-        )
-
         return CompletionStats(
             total_completions=total_completions,
             total_days_tracked=total_days_tracked,
@@ -399,20 +611,30 @@ class HabitAnalyticsService:
         self, habit_id: UUID, user_id: UUID
     ) -> HabitAnalytics:
         """Get comprehensive analytics for a habit."""
-        # Get habit
-        habit_result = await self.db.execute(
-            select(Habit).where(and_(Habit.id == habit_id, Habit.user_id == user_id))
+        return await self._cached(
+            user_id,
+            habit_id,
+            "analytics",
+            lambda: self._get_habit_analytics(habit_id, user_id),
         )
-        habit = habit_result.scalar_one_or_none()
-        if not habit:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
-            )
+
+    async def _get_habit_analytics(
+        self, habit_id: UUID, user_id: UUID
+    ) -> HabitAnalytics:
+        """Compute the analytics of one habit."""
+        # Get habit
+        habit = await self._get_owned_habit(habit_id, user_id)
 
         # Get streak info and completion stats
         streak_info = await self.calculate_streak(habit_id, user_id)
         completion_stats = await self.get_completion_stats(habit_id, user_id)
 
+        return self._build_habit_analytics(habit, streak_info, completion_stats)
+
+    def _build_habit_analytics(
+        self, habit: Habit, streak_info: StreakInfo, completion_stats: CompletionStats
+    ) -> HabitAnalytics:
+        """Combine streak info and completion stats into habit analytics."""
         # Calculate confidence level
         confidence_level = self._calculate_confidence_level(
             streak_info, completion_stats
@@ -424,7 +646,7 @@ class HabitAnalyticsService:
         )
 
         return HabitAnalytics(
-            habit_id=habit_id,
+            habit_id=habit.id,
             habit_name=habit.name,
             frequency=habit.frequency,
             streak_info=streak_info,
@@ -438,32 +660,90 @@ class HabitAnalyticsService:
         habit_id: UUID,
         user_id: UUID,
         days: int = 90,
+        engine: str = "python",
     ) -> ProgressTrends:
-        """Get progress trends over specified period."""
-        # Verify habit ownership
-        habit_result = await self.db.execute(
-            select(Habit).where(and_(Habit.id == habit_id, Habit.user_id == user_id))
+        """
+        Get progress trends over specified period.
+
+        ``engine`` selects how the trends are derived from the entries: with
+        Python loops ("python") or with vectorized NumPy operations ("numpy"),
+        which requires NumPy to be installed. Both give the same result.
+        """
+        return await self._cached(
+            user_id,
+            habit_id,
+            f"progress:{days}:{engine}",
+            lambda: self._get_progress_trends(habit_id, user_id, days, engine),
         )
-        habit = habit_result.scalar_one_or_none()
-        if not habit:
+
+    async def _get_progress_trends(
+        self, habit_id: UUID, user_id: UUID, days: int, engine: str
+    ) -> ProgressTrends:
+        """Compute progress trends with the chosen engine."""
+        if engine == "numpy" and np is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The numpy trends engine is not available",
             )
 
-        # Get entries for the period
+        # Verify habit ownership
+        habit = await self._get_owned_habit(habit_id, user_id)
+
+        # Get entries for the period, and for the days before it that the
+        # first rolling windows reach back to
         start_date = date.today() - timedelta(days=days)
-        entries_result = await self.db.execute(
-            select(HabitEntry)
-            .where(
-                and_(
-                    HabitEntry.habit_id == habit_id,
-                    HabitEntry.entry_date >= start_date,
+        lead_start = start_date - timedelta(days=max(ROLLING_RATE_WINDOWS) - 1)
+        entries = await self.entry_repository.select_rows(
+            (
+                HabitEntry.entry_date,
+                HabitEntry.completed,
+                HabitEntry.mood,
+                HabitEntry.notes,
+            ),
+            HabitEntry.habit_id == habit_id,
+            HabitEntry.entry_date >= lead_start,
+            order_by=(HabitEntry.entry_date.asc(),),
+        )
+        has_entries = bool(entries) and entries[-1].entry_date >= start_date
+
+        # Weekly and monthly completions come from the rollups, so they cost
+        # the same whatever the length of the range
+        weeks, months = await self.period_stat_repository.get_completions(
+            habit_id,
+            start_date - timedelta(days=start_date.weekday()),
+            start_date.replace(day=1),
+        )
+
+        if engine == "numpy":
+            daily_data, overall_trend, rolling_rates = self._build_daily_trends_numpy(
+                entries, days, start_date, lead_start
+            )
+        else:
+            daily_data = self._build_daily_trends(entries, start_date)
+            overall_trend = (
+                self._determine_trend(
+                    await self.get_window_index(habit_id, user_id), start_date, days
                 )
+                if has_entries
+                else "no_data"
             )
-            .order_by(HabitEntry.entry_date.asc())
+            rolling_rates = self._build_rolling_rates(entries, start_date)
+
+        return ProgressTrends(
+            daily_data=daily_data,
+            weekly_summaries=self._build_weekly_summaries(weeks, habit),
+            monthly_summaries=self._build_monthly_summaries(
+                {(month.year, month.month): count for month, count in months.items()},
+                habit,
+            ),
+            overall_trend=overall_trend,
+            rolling_rates=rolling_rates,
         )
-        entries = list(entries_result.scalars().all())
 
+    def _build_daily_trends(
+        self, entries: Sequence[Row], start_date: date
+    ) -> List[DailyCompletionData]:
+        """Build the daily series by walking the entries."""
         # Build daily data
         daily_data = []
         entries_by_date = {entry.entry_date: entry for entry in entries}
@@ -481,36 +761,34 @@ class HabitAnalyticsService:
             )
             current_date += timedelta(days=1)
 
-        # Calculate weekly summaries
-        weekly_summaries = self._calculate_weekly_summaries(entries, habit, days)
+        return daily_data
 
-        # Calculate monthly summaries
-        monthly_summaries = self._calculate_monthly_summaries(entries, habit, days)
-
-        # Determine overall trend
-        overall_trend = self._determine_trend(entries, days)
-
-        return ProgressTrends(
-            daily_data=daily_data,
-            weekly_summaries=weekly_summaries,
-            monthly_summaries=monthly_summaries,
-            overall_trend=overall_trend,
-        )
-
-    def _calculate_weekly_summaries(
-        self, entries: List[HabitEntry], habit: Habit, days: int
+    def _build_rolling_rates(
+        self, entries: Sequence[Row], start_date: date
+    ) -> List[RollingCompletionRate]:
+        """Build the rolling completion rates by sliding each window a day on."""
+        completed_dates = {entry.entry_date for entry in entries if entry.completed}
+        today = date.today()
+        rolling_rates = []
+        for window in ROLLING_RATE_WINDOWS:
+            rates = []
+            in_window = 0
+            first_day = day = start_date - timedelta(days=window - 1)
+            while day <= today:
+                in_window += day in completed_dates
+                dropped = day - timedelta(days=window)
+                if dropped >= first_day:
+                    in_window -= dropped in completed_dates
+                if day >= start_date:
+                    rates.append(round(in_window / window * 100, 2))
+                day += timedelta(days=1)
+            rolling_rates.append(RollingCompletionRate(window_days=window, rates=rates))
+        return rolling_rates
+
+    def _build_weekly_summaries(
+        self, weeks: Dict[date, int], habit: Habit
     ) -> List[WeeklyProgress]:
-        """Calculate weekly progress summaries."""
-        weeks = {}
-        for entry in entries:
-            if entry.completed:
-                week_start = entry.entry_date - timedelta(
-                    days=entry.entry_date.weekday()
-                )
-                if week_start not in weeks:
-                    weeks[week_start] = 0
-                weeks[week_start] += 1
-
+        """Build weekly summaries from completions per week start."""
         summaries = []
         target_per_week = 7 if habit.frequency == "daily" else (habit.target_days or 3)
 
@@ -531,18 +809,10 @@ class HabitAnalyticsService:
 
         return summaries
 
-    def _calculate_monthly_summaries(
-        self, entries: List[HabitEntry], habit: Habit, days: int
+    def _build_monthly_summaries(
+        self, months: Dict[Tuple[int, int], int], habit: Habit
     ) -> List[MonthlyProgress]:
-        """Calculate monthly progress summaries."""
-        months = {}
-        for entry in entries:
-            if entry.completed:
-                month_key = (entry.entry_date.year, entry.entry_date.month)
-                if month_key not in months:
-                    months[month_key] = 0
-                months[month_key] += 1
-
+        """Build monthly summaries from completions per (year, month)."""
         summaries = []
         for month_key in sorted(months.keys()):
             year, month = month_key
@@ -562,22 +832,25 @@ class HabitAnalyticsService:
 
         return summaries
 
-    def _determine_trend(self, entries: List[HabitEntry], days: int) -> str:
+    def _determine_trend(
+        self, index: CompletionWindowIndex, start_date: date, days: int
+    ) -> str:
         """Determine overall trend direction."""
-        if not entries:
-            return "no_data"
-
         # Compare first half vs second half completion rates
         mid_point = days // 2
         cutoff_date = date.today() - timedelta(days=mid_point)
 
-        first_half = [e for e in entries if e.entry_date < cutoff_date and e.completed]
-        second_half = [
-            e for e in entries if e.entry_date >= cutoff_date and e.completed
-        ]
+        first_half = index.count(start_date, cutoff_date - timedelta(days=1))
+        second_half = index.count(cutoff_date, index.end_date)
 
-        first_rate = len(first_half) / mid_point if mid_point > 0 else 0
-        second_rate = len(second_half) / mid_point if mid_point > 0 else 0
+        return self._classify_trend(first_half, second_half, mid_point)
+
+    def _classify_trend(
+        self, first_half_completions: int, second_half_completions: int, mid_point: int
+    ) -> str:
+        """Classify the trend from completions in each half of the period."""
+        first_rate = first_half_completions / mid_point if mid_point > 0 else 0
+        second_rate = second_half_completions / mid_point if mid_point > 0 else 0
 
         if second_rate > first_rate * 1.1:
             return "improving"
@@ -586,13 +859,98 @@ class HabitAnalyticsService:
         else:
             return "stable"
 
+    def _build_daily_trends_numpy(
+        self, entries: Sequence[Row], days: int, start_date: date, lead_start: date
+    ) -> Tuple[List[DailyCompletionData], str, List[RollingCompletionRate]]:
+        """
+        Build the daily series, the overall trend and the rolling rates with
+        NumPy.
+
+        The entries are turned into one dense boolean array with a slot per
+        day from ``lead_start``, from which the daily series and the
+        completions in each half of the period are read without further passes
+        over the entries. Every rolling window is a difference of two of the
+        array's prefix sums.
+        """
+        today = date.today()
+        # Entries dated after today still count towards the trend
+        end_date = max(today, entries[-1].entry_date) if entries else today
+        day_numbers = np.arange(
+            np.datetime64(lead_start), np.datetime64(end_date + timedelta(days=1))
+        )
+        lead = (start_date - lead_start).days
+
+        offsets = np.fromiter(
+            ((entry.entry_date - lead_start).days for entry in entries),
+            dtype=np.int64,
+            count=len(entries),
+        )
+        done = np.fromiter(
+            (bool(entry.completed) for entry in entries),
+            dtype=bool,
+            count=len(entries),
+        )
+        completed = np.zeros(len(day_numbers), dtype=bool)
+        completed[offsets[done]] = True
+
+        # Daily series up to today
+        entries_by_date = {entry.entry_date: entry for entry in entries}
+        daily_data = []
+        for day, is_completed in zip(
+            day_numbers[lead : lead + days + 1].tolist(),
+            completed[lead : lead + days + 1].tolist(),
+        ):
+            entry = entries_by_date.get(day)
+            daily_data.append(
+                DailyCompletionData(
+                    date=day,
+                    completed=is_completed,
+                    mood=entry.mood if entry else None,
+                    notes=entry.notes if entry else None,
+                )
+            )
+
+        if entries and entries[-1].entry_date >= start_date:
+            mid_point = days // 2
+            cutoff = lead + days - mid_point
+            overall_trend = self._classify_trend(
+                int(completed[lead:cutoff].sum()),
+                int(completed[cutoff:].sum()),
+                mid_point,
+            )
+        else:
+            overall_trend = "no_data"
+
+        # prefix[i] is the number of completions before slot i
+        prefix = np.concatenate(([0], np.cumsum(completed)))
+        window_ends = np.arange(lead + 1, lead + days + 2)
+        rolling_rates = [
+            RollingCompletionRate(
+                window_days=window,
+                rates=np.round(
+                    (prefix[window_ends] - prefix[window_ends - window]) / window * 100,
+                    2,
+                ).tolist(),
+            )
+            for window in ROLLING_RATE_WINDOWS
+        ]
+
+        return daily_data, overall_trend, rolling_rates
+
     async def check_streak_recovery(
         self, habit_id: UUID, user_id: UUID, grace_days: int = 1
     ) -> StreakRecoveryInfo:
-        """Check if a streak can be recovered."""
+        """
+        Check if a streak can be recovered.
+
+        A streak that is still active but was last completed a day or more ago
+        is reported like a broken one, so the gap can be filled in time.
+        """
         streak_info = await self.calculate_streak(habit_id, user_id)
+        last_completed = streak_info.last_completed_date
+        days_since = (date.today() - last_completed).days if last_completed else 0
 
-        if streak_info.is_active or not streak_info.last_completed_date:
+        if days_since == 0:
             return StreakRecoveryInfo(
                 can_recover=False,
                 days_since_last_completion=0,
@@ -600,12 +958,9 @@ class HabitAnalyticsService:
                 grace_period_days=grace_days,
             )
 
-        days_since = (date.today() - streak_info.last_completed_date).days
         can_recover = days_since <= grace_days + 1
         recovery_deadline = (
-            streak_info.last_completed_date + timedelta(days=grace_days + 1)
-            if can_recover
-            else None
+            last_completed + timedelta(days=grace_days + 1) if can_recover else None
         )
 
         return StreakRecoveryInfo(
@@ -615,8 +970,186 @@ class HabitAnalyticsService:
             grace_period_days=grace_days,
         )
 
+    async def get_completion_windows(
+        self,
+        habit_id: UUID,
+        user_id: UUID,
+        window_days: Sequence[int],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> HabitCompletionWindows:
+        """
+        Get a habit's completions over the last ``window_days`` days, and from
+        ``start_date`` to ``end_date`` when a custom range is given.
+
+        Each window is answered from the habit's prefix sums in constant time.
+        """
+        if len(window_days) > MAX_COMPLETION_WINDOWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_COMPLETION_WINDOWS} windows can be requested",
+            )
+        if any(not 1 <= days <= MAX_HEATMAP_DAYS for days in window_days):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Windows must cover between 1 and {MAX_HEATMAP_DAYS} days",
+            )
+
+        today = date.today()
+        ranges = [(today - timedelta(days=days - 1), today) for days in window_days]
+        if start_date is not None or end_date is not None:
+            start_date = start_date or end_date
+            end_date = end_date or today
+            if start_date > end_date:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The start date must not be after the end date",
+                )
+            ranges.append((start_date, end_date))
+
+        index = await self.get_window_index(habit_id, user_id)
+        windows = []
+        for window_start, window_end in ranges:
+            days = (window_end - window_start).days + 1
+            completions = index.count(window_start, window_end)
+            windows.append(
+                CompletionWindow(
+                    start_date=window_start,
+                    end_date=window_end,
+                    days=days,
+                    completions=completions,
+                    completion_rate=round(completions / days * 100, 2),
+                )
+            )
+
+        return HabitCompletionWindows(habit_id=habit_id, windows=windows)
+
+    async def get_heatmap(
+        self, user_id: UUID, start_date: date, end_date: date
+    ) -> HabitHeatmap:
+        """
+        Get the completions of all of a user's habits between two dates.
+
+        Each habit's days are returned as a bitset, read from the year bitmaps
+        with a single query.
+        """
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The start date must not be after the end date",
+            )
+        if (end_date - start_date).days >= MAX_HEATMAP_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The heatmap range cannot exceed {MAX_HEATMAP_DAYS} days",
+            )
+
+        rows = await self.bitmap_repository.get_user_bitmaps(
+            user_id, start_date.year, end_date.year
+        )
+
+        series = {}
+        bits = {}
+        for row in rows:
+            if row.id not in series:
+                series[row.id] = row
+                bits[row.id] = 0
+            if row.year is not None:
+                bits[row.id] |= self._slice_year_bitmap(
+                    row.year, row.days.to_int(), start_date, end_date
+                )
+
+        length = (end_date - start_date).days + 1
+        return HabitHeatmap(
+            start_date=start_date,
+            end_date=end_date,
+            habits=[
+                HabitHeatmapSeries(
+                    habit_id=habit_id,
+                    habit_name=row.name,
+                    color=row.color,
+                    completions=bits[habit_id].bit_count(),
+                    bitmap=base64.b64encode(
+                        # Pad with zero bits up to a whole number of bytes
+                        (bits[habit_id] << (-length % 8)).to_bytes(
+                            (length + 7) // 8, "big"
+                        )
+                    ).decode("ascii"),
+                )
+                for habit_id, row in series.items()
+            ],
+        )
+
+    def _slice_year_bitmap(
+        self, year: int, year_bits: int, start_date: date, end_date: date
+    ) -> int:
+        """
+        Cut the days between two dates out of a year bitmap.
+
+        ``year_bits`` holds January 1st in its most significant of 366 bits.
+        The result holds ``start_date`` in its most significant bit and
+        ``end_date`` in its least significant one.
+        """
+        year_start = date(year, 1, 1)
+        first = max(start_date, year_start)
+        last = min(end_date, date(year, 12, 31))
+        first_day = (first - year_start).days
+        last_day = (last - year_start).days
+        mask = (1 << (last_day - first_day + 1)) - 1
+        segment = (year_bits >> (365 - last_day)) & mask
+        return segment << (end_date - last).days
+
+    async def _get_habits_analytics(
+        self, habits: Sequence[Habit]
+    ) -> List[HabitAnalytics]:
+        """
+        Get analytics for many habits from a single scan of their entries.
+
+        Streaks and completion counts for every habit are computed in one pass
+        over the entries, so the number of queries does not grow with the
+        number of habits.
+        """
+        today = date.today()
+        current_month_start = date(today.year, today.month, 1)
+        current_week_start = today - timedelta(days=today.weekday())
+
+        entries = await self.entry_repository.select_rows(
+            (HabitEntry.habit_id, HabitEntry.entry_date, HabitEntry.completed),
+            HabitEntry.habit_id.in_([habit.id for habit in habits]),
+            order_by=(HabitEntry.entry_date.desc(),),
+        )
+
+        completed_dates = {habit.id: [] for habit in habits}
+        # Completions, days tracked, and completions this month and this week
+        counts = {habit.id: [0, 0, 0, 0] for habit in habits}
+        for entry in entries:
+            habit_counts = counts[entry.habit_id]
+            habit_counts[1] += 1
+            if entry.completed:
+                completed_dates[entry.habit_id].append(entry.entry_date)
+                habit_counts[0] += 1
+                habit_counts[2] += entry.entry_date >= current_month_start
+                habit_counts[3] += entry.entry_date >= current_week_start
+
+        return [
+            self._build_habit_analytics(
+                habit,
+                self._calculate_streak_from_dates(
+                    habit.frequency, completed_dates[habit.id]
+                ),
+                self._build_completion_stats(*counts[habit.id]),
+            )
+            for habit in habits
+        ]
+
     async def get_user_insights(self, user_id: UUID) -> HabitInsights:
         """Get aggregated insights for all user's habits."""
+        return await self._cached(
+            user_id, None, "insights", lambda: self._get_user_insights(user_id)
+        )
+
+    async def _get_user_insights(self, user_id: UUID) -> HabitInsights:
+        """Compute insights across the user's active habits."""
         # Get all active habits
         habits_result = await self.db.execute(
             select(Habit).where(
@@ -638,13 +1171,8 @@ class HabitAnalyticsService:
             )
 
         # Calculate metrics for each habit
-        habit_metrics = []
-        for habit in habits:
-            try:
-                analytics = await self.get_habit_analytics(habit.id, user_id)
-                habit_metrics.append((habit.name, analytics))
-            except Exception:
-                continue
+        analytics = await self._get_habits_analytics(habits)
+        habit_metrics = [(habit.name, a) for habit, a in zip(habits, analytics)]
 
         # Sort by completion rate
         sorted_by_rate = sorted(
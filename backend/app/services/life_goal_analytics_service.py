@@ -6,10 +6,14 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.goal import Goal, GoalMilestone
+from app.repositories.goal_repository import (
+    GoalMilestoneRepository,
+    GoalRepository,
+)
 
 
 class LifeGoalAnalyticsService:
@@ -17,17 +21,18 @@ class LifeGoalAnalyticsService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.goal_repository = GoalRepository(db)
+        self.milestone_repository = GoalMilestoneRepository(db)
 
     async def get_life_goals_summary(self, user_id: UUID) -> Dict:
         """Get summary statistics for user's life goals."""
 
         # Get all life goals
-        result = await self.db.execute(
-            select(Goal).where(
-                and_(Goal.user_id == user_id, Goal.goal_type == "life_goal")
-            )
+        life_goals = await self.goal_repository.select_rows(
+            (Goal.status, Goal.category, Goal.created_at, Goal.completed_at),
+            Goal.user_id == user_id,
+            Goal.goal_type == "life_goal",
         )
-        life_goals = list(result.scalars().all())
 
         total_goals = len(life_goals)
         active_goals = len(
@@ -81,39 +86,20 @@ class LifeGoalAnalyticsService:
         # Build query
         if goal_id:
             # Get milestones for specific goal
-            goal_result = await self.db.execute(
-                select(Goal).where(and_(Goal.id == goal_id, Goal.user_id == user_id))
-            )
-            goal = goal_result.scalar_one_or_none()
-            if not goal:
+            if not await self.goal_repository.exists_owned(goal_id, user_id):
                 return {}
 
-            milestone_result = await self.db.execute(
-                select(GoalMilestone).where(GoalMilestone.goal_id == goal_id)
+            milestones = await self.milestone_repository.select_rows(
+                (GoalMilestone.status,), GoalMilestone.goal_id == goal_id
             )
-            milestones = list(milestone_result.scalars().all())
         else:
             # Get milestones for all user's life goals
-            goal_ids_result = await self.db.execute(
-                select(Goal.id).where(
-                    and_(Goal.user_id == user_id, Goal.goal_type == "life_goal")
-                )
+            goal_ids = select(Goal.id).where(
+                Goal.user_id == user_id, Goal.goal_type == "life_goal"
             )
-            goal_ids = [row[0] for row in goal_ids_result.all()]
-
-            if not goal_ids:
-                return {
-                    "total_milestones": 0,
-                    "completed_milestones": 0,
-                    "in_progress_milestones": 0,
-                    "pending_milestones": 0,
-                    "completion_rate": 0,
-                }
-
-            milestone_result = await self.db.execute(
-                select(GoalMilestone).where(GoalMilestone.goal_id.in_(goal_ids))
+            milestones = await self.milestone_repository.select_rows(
+                (GoalMilestone.status,), GoalMilestone.goal_id.in_(goal_ids)
             )
-            milestones = list(milestone_result.scalars().all())
 
         total = len(milestones)
         completed = len([m for m in milestones if m.status == "completed"])
@@ -134,12 +120,20 @@ class LifeGoalAnalyticsService:
     async def get_goals_by_life_area(self, user_id: UUID) -> List[Dict]:
         """Get life goals grouped by life area/category."""
 
-        result = await self.db.execute(
-            select(Goal)
-            .where(and_(Goal.user_id == user_id, Goal.goal_type == "life_goal"))
-            .order_by(Goal.category, Goal.created_at.desc())
+        life_goals = await self.goal_repository.select_rows(
+            (
+                Goal.id,
+                Goal.title,
+                Goal.status,
+                Goal.priority,
+                Goal.category,
+                Goal.created_at,
+                Goal.completed_at,
+            ),
+            Goal.user_id == user_id,
+            Goal.goal_type == "life_goal",
+            order_by=(Goal.category, Goal.created_at.desc()),
         )
-        life_goals = list(result.scalars().all())
 
         # Group by category
         categorized = {}
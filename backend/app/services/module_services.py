@@ -8,11 +8,15 @@ from uuid import UUID
 import re
 
 from fastapi import HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.cache import invalidate_on_commit
 from app.models.habit import Habit, HabitEntry
 from app.models.food import Food
-from app.models.workout import Workout, WorkoutExercise
+from app.models.workout import Workout
 from app.models.daily_review import DailyReview
 from app.models.blog_entry import BlogEntry
 from app.models.progress_snapshot import ProgressSnapshot
@@ -21,6 +25,7 @@ from app.repositories.module_repositories import (
     HabitEntryRepository,
     FoodRepository,
     WorkoutRepository,
+    WorkoutExerciseRepository,
     DailyReviewRepository,
     BlogEntryRepository,
     ProgressSnapshotRepository,
@@ -48,41 +53,72 @@ class HabitService:
     async def create_habit(self, user_id: UUID, habit_data: HabitCreate) -> Habit:
         """Create a new habit."""
         habit = Habit(user_id=user_id, **habit_data.model_dump())
-        return await self.repository.create(habit)
+        habit = await self.repository.create(habit)
+        # The new habit counts towards the user's insights
+        invalidate_on_commit(self.db, user_id, habit.id)
+        return habit
 
     async def get_habit(self, habit_id: UUID, user_id: UUID) -> Habit:
         """Get a habit by ID."""
-        habit = await self.repository.get_by_id(habit_id)
-        if not habit or habit.user_id != user_id:
+        habit = await self.repository.get_owned(habit_id, user_id)
+        if not habit:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
             )
         return habit
 
+    async def _ensure_habit_owned(self, habit_id: UUID, user_id: UUID) -> None:
+        """Raise 404 unless the habit belongs to the user, without loading it."""
+        if not await self.repository.exists_owned(habit_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+            )
+
     async def get_user_habits(
         self,
         user_id: UUID,
         is_active: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Habit], int]:
-        """Get all habits for a user."""
-        habits = await self.repository.get_user_habits(user_id, is_active, skip, limit)
-        total = await self.repository.count_user_habits(user_id, is_active)
+        cursor: Optional[str] = None,
+    ) -> tuple[List[Habit], Optional[int]]:
+        """
+        Get all habits for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        """
+        habits = await self.repository.get_user_habits(
+            user_id, is_active, skip, limit, cursor
+        )
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_habits(user_id, is_active)
         return habits, total
 
     async def update_habit(
         self, habit_id: UUID, user_id: UUID, habit_data: HabitUpdate
     ) -> Habit:
         """Update a habit."""
-        habit = await self.get_habit(habit_id, user_id)
         update_data = habit_data.model_dump(exclude_unset=True)
-        return await self.repository.update(habit, update_data)
+        habit = await self.repository.update_owned(habit_id, user_id, update_data)
+        if not habit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+            )
+        if "frequency" in update_data:
+            # Streak periods depend on the frequency
+            habit = await self._recompute_streak(habit_id, user_id)
+        invalidate_on_commit(self.db, user_id, habit_id)
+        return habit
 
     async def delete_habit(self, habit_id: UUID, user_id: UUID) -> bool:
         """Delete a habit."""
-        await self.get_habit(habit_id, user_id)
-        return await self.repository.delete(habit_id)
+        if not await self.repository.delete_owned(habit_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+            )
+        invalidate_on_commit(self.db, user_id, habit_id)
+        return True
 
     async def create_entry(
         self, habit_id: UUID, user_id: UUID, entry_data: HabitEntryCreate
@@ -107,26 +143,68 @@ class HabitService:
         )
         
         created_entry = await self.entry_repository.create(entry)
+        invalidate_on_commit(self.db, user_id, habit_id)
 
-        # Update habit stats using analytics service
+        # Update habit stats
         if entry_data.completed:
-            from app.services.habit_analytics_service import HabitAnalyticsService
-            analytics_service = HabitAnalyticsService(self.db)
-            streak_info = await analytics_service.calculate_streak(habit_id, user_id)
-            
-            habit.total_completions += 1
-            habit.current_streak = streak_info.current_streak
-            habit.longest_streak = streak_info.longest_streak
+            await self._record_completion(habit, user_id, entry_data.entry_date)
             await self.db.commit()
 
         return created_entry
 
+    async def _record_completion(
+        self, habit: Habit, user_id: UUID, entry_date: date
+    ) -> None:
+        """
+        Update the habit's completion count and streak for a new completion.
+
+        Completions in or after the last completed period advance the stored
+        streak directly. Older ones, which may join or split earlier runs,
+        recompute it from the entries.
+        """
+        from app.services.habit_analytics_service import period_bounds
+
+        updated = await self.repository.record_completion(
+            habit.id, user_id, entry_date, period_bounds(habit.frequency, entry_date)
+        )
+        if updated is None:
+            await self.repository.update_owned(
+                habit.id,
+                user_id,
+                {"total_completions": Habit.total_completions + 1},
+            )
+            await self._recompute_streak(habit.id, user_id)
+
+    async def _recompute_streak(self, habit_id: UUID, user_id: UUID) -> Habit:
+        """Recalculate the stored streak from all completed entries."""
+        from app.services.habit_analytics_service import HabitAnalyticsService
+
+        analytics_service = HabitAnalyticsService(self.db)
+        streak_info = await analytics_service.calculate_streak_in_db(
+            habit_id, user_id
+        )
+        return await self.repository.update_owned(
+            habit_id,
+            user_id,
+            {
+                "current_streak": streak_info.current_streak,
+                "longest_streak": streak_info.longest_streak,
+                "streak_start_date": streak_info.streak_start_date,
+                "last_completed_date": streak_info.last_completed_date,
+            },
+        )
+
     async def reset_habit_streak(self, habit_id: UUID, user_id: UUID) -> Habit:
         """Reset a habit's streak to zero."""
-        habit = await self.get_habit(habit_id, user_id)
-        habit.current_streak = 0
+        habit = await self.repository.update_owned(
+            habit_id, user_id, {"current_streak": 0, "streak_start_date": None}
+        )
+        if not habit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Habit not found"
+            )
+        invalidate_on_commit(self.db, user_id, habit_id)
         await self.db.commit()
-        await self.db.refresh(habit)
         return habit
 
     async def recover_streak(
@@ -175,22 +253,25 @@ class HabitService:
 
         # Update habit stats
         habit = await self.get_habit(habit_id, user_id)
-        habit.total_completions += 1
-        
-        # Recalculate streak
-        streak_info = await analytics_service.calculate_streak(habit_id, user_id)
-        habit.current_streak = streak_info.current_streak
-        habit.longest_streak = streak_info.longest_streak
-        
+        await self._record_completion(habit, user_id, recovery_date)
+        invalidate_on_commit(self.db, user_id, habit_id)
+
         await self.db.commit()
         return created_entry
 
     async def get_habit_entries(
-        self, habit_id: UUID, user_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        habit_id: UUID,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[HabitEntry]:
         """Get entries for a habit."""
-        await self.get_habit(habit_id, user_id)
-        return await self.entry_repository.get_habit_entries(habit_id, skip, limit)
+        await self._ensure_habit_owned(habit_id, user_id)
+        return await self.entry_repository.get_habit_entries(
+            habit_id, skip, limit, cursor
+        )
 
 
 class FoodService:
@@ -207,8 +288,8 @@ class FoodService:
 
     async def get_food(self, food_id: UUID, user_id: UUID) -> Food:
         """Get a food entry by ID."""
-        food = await self.repository.get_by_id(food_id)
-        if not food or food.user_id != user_id:
+        food = await self.repository.get_owned(food_id, user_id)
+        if not food:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Food entry not found"
             )
@@ -222,26 +303,44 @@ class FoodService:
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Food], int]:
-        """Get all food entries for a user."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+    ) -> tuple[List[Food], Optional[int]]:
+        """
+        Get all food entries for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        With ``summary`` only the columns shown in list views are loaded.
+        """
         foods = await self.repository.get_user_foods(
-            user_id, meal_type, start_date, end_date, skip, limit
+            user_id, meal_type, start_date, end_date, skip, limit, cursor, summary
         )
-        total = await self.repository.count_user_foods(user_id)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_foods(
+                user_id, meal_type, start_date, end_date
+            )
         return foods, total
 
     async def update_food(
         self, food_id: UUID, user_id: UUID, food_data: FoodUpdate
     ) -> Food:
         """Update a food entry."""
-        food = await self.get_food(food_id, user_id)
         update_data = food_data.model_dump(exclude_unset=True)
-        return await self.repository.update(food, update_data)
+        food = await self.repository.update_owned(food_id, user_id, update_data)
+        if not food:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Food entry not found"
+            )
+        return food
 
     async def delete_food(self, food_id: UUID, user_id: UUID) -> bool:
         """Delete a food entry."""
-        await self.get_food(food_id, user_id)
-        return await self.repository.delete(food_id)
+        if not await self.repository.delete_owned(food_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Food entry not found"
+            )
+        return True
 
 
 class WorkoutService:
@@ -250,6 +349,7 @@ class WorkoutService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repository = WorkoutRepository(db)
+        self.exercise_repository = WorkoutExerciseRepository(db)
 
     async def create_workout(
         self, user_id: UUID, workout_data: WorkoutCreate
@@ -260,21 +360,22 @@ class WorkoutService:
         )
         workout = await self.repository.create(workout)
 
-        # Create exercises
-        for i, exercise_data in enumerate(workout_data.exercises):
-            exercise = WorkoutExercise(
-                workout_id=workout.id, **exercise_data.model_dump()
-            )
-            self.db.add(exercise)
-
-        await self.db.flush()
-        await self.db.refresh(workout)
+        # Create all exercises in a single INSERT and attach them to the workout
+        exercises = await self.exercise_repository.bulk_create(
+            [
+                {"workout_id": workout.id, **exercise_data.model_dump()}
+                for exercise_data in workout_data.exercises
+            ]
+        )
+        set_committed_value(workout, "exercises", exercises)
         return workout
 
     async def get_workout(self, workout_id: UUID, user_id: UUID) -> Workout:
         """Get a workout by ID."""
-        workout = await self.repository.get_by_id(workout_id)
-        if not workout or workout.user_id != user_id:
+        workout = await self.repository.get_owned(
+            workout_id, user_id, [selectinload(Workout.exercises)]
+        )
+        if not workout:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Workout not found"
             )
@@ -288,26 +389,46 @@ class WorkoutService:
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Workout], int]:
-        """Get all workouts for a user."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+    ) -> tuple[List[Workout], Optional[int]]:
+        """
+        Get all workouts for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        With ``summary`` only the columns shown in list views are loaded.
+        """
         workouts = await self.repository.get_user_workouts(
-            user_id, workout_type, start_date, end_date, skip, limit
+            user_id, workout_type, start_date, end_date, skip, limit, cursor, summary
         )
-        total = await self.repository.count_user_workouts(user_id)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_workouts(
+                user_id, workout_type, start_date, end_date
+            )
         return workouts, total
 
     async def update_workout(
         self, workout_id: UUID, user_id: UUID, workout_data: WorkoutUpdate
     ) -> Workout:
         """Update a workout."""
-        workout = await self.get_workout(workout_id, user_id)
         update_data = workout_data.model_dump(exclude_unset=True)
-        return await self.repository.update(workout, update_data)
+        workout = await self.repository.update_owned(
+            workout_id, user_id, update_data, [selectinload(Workout.exercises)]
+        )
+        if not workout:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Workout not found"
+            )
+        return workout
 
     async def delete_workout(self, workout_id: UUID, user_id: UUID) -> bool:
         """Delete a workout."""
-        await self.get_workout(workout_id, user_id)
-        return await self.repository.delete(workout_id)
+        if not await self.repository.delete_owned(workout_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Workout not found"
+            )
+        return True
 
 
 class DailyReviewService:
@@ -336,8 +457,8 @@ class DailyReviewService:
 
     async def get_review(self, review_id: UUID, user_id: UUID) -> DailyReview:
         """Get a daily review by ID."""
-        review = await self.repository.get_by_id(review_id)
-        if not review or review.user_id != user_id:
+        review = await self.repository.get_owned(review_id, user_id)
+        if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Daily review not found"
             )
@@ -350,26 +471,44 @@ class DailyReviewService:
         end_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[DailyReview], int]:
-        """Get all daily reviews for a user."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+    ) -> tuple[List[DailyReview], Optional[int]]:
+        """
+        Get all daily reviews for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        With ``summary`` only the columns shown in list views are loaded.
+        """
         reviews = await self.repository.get_user_reviews(
-            user_id, start_date, end_date, skip, limit
+            user_id, start_date, end_date, skip, limit, cursor, summary
         )
-        total = await self.repository.count_user_reviews(user_id)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_reviews(
+                user_id, start_date, end_date
+            )
         return reviews, total
 
     async def update_review(
         self, review_id: UUID, user_id: UUID, review_data: DailyReviewUpdate
     ) -> DailyReview:
         """Update a daily review."""
-        review = await self.get_review(review_id, user_id)
         update_data = review_data.model_dump(exclude_unset=True)
-        return await self.repository.update(review, update_data)
+        review = await self.repository.update_owned(review_id, user_id, update_data)
+        if not review:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Daily review not found"
+            )
+        return review
 
     async def delete_review(self, review_id: UUID, user_id: UUID) -> bool:
         """Delete a daily review."""
-        await self.get_review(review_id, user_id)
-        return await self.repository.delete(review_id)
+        if not await self.repository.delete_owned(review_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Daily review not found"
+            )
+        return True
 
 
 class BlogEntryService:
@@ -402,8 +541,8 @@ class BlogEntryService:
 
     async def get_blog_entry(self, entry_id: UUID, user_id: UUID) -> BlogEntry:
         """Get a blog entry by ID."""
-        entry = await self.repository.get_by_id(entry_id)
-        if not entry or entry.user_id != user_id:
+        entry = await self.repository.get_owned(entry_id, user_id)
+        if not entry:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Blog entry not found"
             )
@@ -415,35 +554,55 @@ class BlogEntryService:
         status_filter: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[BlogEntry], int]:
-        """Get all blog entries for a user."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+    ) -> tuple[List[BlogEntry], Optional[int]]:
+        """
+        Get all blog entries for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        With ``summary`` only the columns shown in list views are loaded.
+        """
         entries = await self.repository.get_user_blog_entries(
-            user_id, status_filter, skip, limit
+            user_id, status_filter, skip, limit, cursor, summary
         )
-        total = await self.repository.count_user_blog_entries(user_id, status_filter)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_blog_entries(
+                user_id, status_filter
+            )
         return entries, total
 
     async def update_blog_entry(
         self, entry_id: UUID, user_id: UUID, entry_data: BlogEntryUpdate
     ) -> BlogEntry:
         """Update a blog entry."""
-        entry = await self.get_blog_entry(entry_id, user_id)
         update_data = entry_data.model_dump(exclude_unset=True)
 
         # Update slug if title changed
         if "title" in update_data:
             update_data["slug"] = self._generate_slug(update_data["title"])
 
-        # Set published_at if status changed to published
-        if update_data.get("status") == "published" and not entry.published_at:
-            update_data["published_at"] = datetime.utcnow()
+        # Set published_at if status changed to published, keeping the first date
+        if update_data.get("status") == "published":
+            update_data["published_at"] = func.coalesce(
+                BlogEntry.published_at, datetime.utcnow()
+            )
 
-        return await self.repository.update(entry, update_data)
+        entry = await self.repository.update_owned(entry_id, user_id, update_data)
+        if not entry:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Blog entry not found"
+            )
+        return entry
 
     async def delete_blog_entry(self, entry_id: UUID, user_id: UUID) -> bool:
         """Delete a blog entry."""
-        await self.get_blog_entry(entry_id, user_id)
-        return await self.repository.delete(entry_id)
+        if not await self.repository.delete_owned(entry_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Blog entry not found"
+            )
+        return True
 
     async def generate_blog_from_review(
         self, user_id: UUID, review: DailyReview
@@ -545,8 +704,8 @@ class ProgressSnapshotService:
 
     async def get_snapshot(self, snapshot_id: UUID, user_id: UUID) -> ProgressSnapshot:
         """Get a progress snapshot by ID."""
-        snapshot = await self.repository.get_by_id(snapshot_id)
-        if not snapshot or snapshot.user_id != user_id:
+        snapshot = await self.repository.get_owned(snapshot_id, user_id)
+        if not snapshot:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Progress snapshot not found",
@@ -559,23 +718,39 @@ class ProgressSnapshotService:
         snapshot_type: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[ProgressSnapshot], int]:
-        """Get all progress snapshots for a user."""
+        cursor: Optional[str] = None,
+    ) -> tuple[List[ProgressSnapshot], Optional[int]]:
+        """
+        Get all progress snapshots for a user.
+
+        When paging by cursor the total count is skipped and returned as None.
+        """
         snapshots = await self.repository.get_user_snapshots(
-            user_id, snapshot_type, skip, limit
+            user_id, snapshot_type, skip, limit, cursor
         )
-        total = await self.repository.count_user_snapshots(user_id)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_snapshots(user_id, snapshot_type)
         return snapshots, total
 
     async def update_snapshot(
         self, snapshot_id: UUID, user_id: UUID, snapshot_data: ProgressSnapshotUpdate
     ) -> ProgressSnapshot:
         """Update a progress snapshot."""
-        snapshot = await self.get_snapshot(snapshot_id, user_id)
         update_data = snapshot_data.model_dump(exclude_unset=True)
-        return await self.repository.update(snapshot, update_data)
+        snapshot = await self.repository.update_owned(snapshot_id, user_id, update_data)
+        if not snapshot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Progress snapshot not found",
+            )
+        return snapshot
 
     async def delete_snapshot(self, snapshot_id: UUID, user_id: UUID) -> bool:
         """Delete a progress snapshot."""
-        await self.get_snapshot(snapshot_id, user_id)
-        return await self.repository.delete(snapshot_id)
+        if not await self.repository.delete_owned(snapshot_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Progress snapshot not found",
+            )
+        return True
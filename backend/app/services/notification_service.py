@@ -2,27 +2,43 @@
 Notification service for business logic.
 """
 
+import json
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_unread_count_on_commit, unread_count_cache
+from app.core.notification_stream import (
+    Event,
+    announce_events,
+    notification_broker,
+    publish_on_commit,
+)
 from app.models.goal import Goal
 from app.models.notification import Notification, NotificationSettings
 from app.repositories.notification_repository import (
     NotificationRepository,
     NotificationSettingsRepository,
+    NotificationUnreadCountRepository,
 )
 from app.schemas.notification import (
     NotificationCreate,
+    NotificationResponse,
     NotificationSettingsCreate,
     NotificationSettingsUpdate,
     NotificationUpdate,
 )
 
 
+# Postgres channel on which changes to pending notifications are announced,
+# so that workers can keep their in-memory schedules current
+NOTIFICATION_SCHEDULE_CHANNEL = "notification_schedule"
+
+
 class NotificationService:
     """Service for notification-related operations."""
 
@@ -30,29 +46,31 @@ class NotificationService:
         self.db = db
         self.repository = NotificationRepository(db)
         self.settings_repository = NotificationSettingsRepository(db)
+        self.unread_count_repository = NotificationUnreadCountRepository(db)
 
     async def create_notification(
         self, user_id: UUID, notification_data: NotificationCreate
     ) -> Notification:
         """Create a new notification."""
         notification = Notification(user_id=user_id, **notification_data.model_dump())
-        return await self.repository.create(notification)
+        notification = await self.repository.create(notification)
+        await self._announce_schedule_change(
+            notification.id, notification.scheduled_time, notification.status
+        )
+        self._publish(notification, "created")
+        await self._refresh_unread_count(user_id)
+        return notification
 
     async def get_notification(
         self, notification_id: UUID, user_id: UUID
     ) -> Notification:
         """Get a notification by ID, ensuring it belongs to the user."""
-        notification = await self.repository.get_by_id(notification_id)
+        notification = await self.repository.get_owned(notification_id, user_id)
         if not notification:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Notification not found",
             )
-        if notification.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this notification",
-            )
         return notification
 
     async def get_user_notifications(
@@ -61,44 +79,88 @@ class NotificationService:
         is_read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[List[Notification], int]:
-        """Get all notifications for a user with pagination."""
+        cursor: Optional[str] = None,
+    ) -> tuple[List[Notification], Optional[int]]:
+        """
+        Get all notifications for a user with pagination.
+
+        When paging by cursor the total count is skipped and returned as None.
+        """
         notifications = await self.repository.get_user_notifications(
-            user_id, is_read, skip, limit
+            user_id, is_read, skip, limit, cursor
         )
-        total = await self.repository.count_user_notifications(user_id, is_read)
+        total = None
+        if cursor is None:
+            total = await self.repository.count_user_notifications(user_id, is_read)
         return notifications, total
 
+    async def get_unread_count(self, user_id: UUID) -> int:
+        """Get the user's unread notification count, from memory when cached."""
+        return await unread_count_cache.get_or_load(
+            user_id, lambda: self.unread_count_repository.get_count(user_id)
+        )
+
     async def update_notification(
         self, notification_id: UUID, user_id: UUID, notification_data: NotificationUpdate
     ) -> Notification:
         """Update a notification."""
-        notification = await self.get_notification(notification_id, user_id)
         update_data = notification_data.model_dump(exclude_unset=True)
-        return await self.repository.update(notification, update_data)
+        notification = await self.repository.update_owned(
+            notification_id, user_id, update_data
+        )
+        if not notification:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Notification not found",
+            )
+        if "status" in update_data:
+            await self._announce_schedule_change(
+                notification.id, notification.scheduled_time, notification.status
+            )
+        if "is_read" in update_data:
+            await self._refresh_unread_count(user_id)
+        return notification
 
     async def mark_as_read(
         self, notification_id: UUID, user_id: UUID
     ) -> Notification:
         """Mark a notification as read."""
-        notification = await self.get_notification(notification_id, user_id)
-        result = await self.repository.mark_as_read(notification_id)
+        result = await self.repository.update_owned(
+            notification_id, user_id, {"is_read": True}
+        )
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Notification not found",
             )
+        await self._refresh_unread_count(user_id)
         return result
 
     async def delete_notification(self, notification_id: UUID, user_id: UUID) -> bool:
         """Delete a notification."""
-        notification = await self.get_notification(notification_id, user_id)
-        return await self.repository.delete(notification.id)
+        if not await self.repository.delete_owned(notification_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Notification not found",
+            )
+        await self._announce_schedule_change(notification_id, None, "deleted")
+        await self._refresh_unread_count(user_id)
+        return True
 
     async def create_goal_reminder(
         self, goal: Goal, user_id: UUID
     ) -> Optional[Notification]:
-        """Create a reminder notification for a goal based on its reminder settings."""
+        """
+        Create a reminder notification for a goal based on its reminder settings.
+
+        Pending reminders created for earlier settings of the goal are
+        cancelled first.
+        """
+        for cancelled_id in await self.repository.cancel_pending_goal_reminders(
+            goal.id, user_id
+        ):
+            await self._announce_schedule_change(cancelled_id, None, "cancelled")
+
         if not goal.reminder_enabled or not goal.reminder_time:
             return None
 
@@ -127,24 +189,114 @@ class NotificationService:
 
         return await self.create_notification(user_id, notification_data)
 
+    async def _announce_schedule_change(
+        self, notification_id: UUID, scheduled_time: Optional[datetime], state: str
+    ) -> None:
+        """
+        Announce a change to a notification's schedule to listening workers.
+
+        Postgres delivers the message when the transaction commits, and drops
+        it on rollback.
+        """
+        payload = json.dumps(
+            {
+                "id": str(notification_id),
+                "scheduled_time": scheduled_time and scheduled_time.isoformat(),
+                "status": state,
+            }
+        )
+        await self.db.execute(
+            select(func.pg_notify(NOTIFICATION_SCHEDULE_CHANNEL, payload))
+        )
+
+    async def _refresh_unread_count(self, user_id: UUID) -> None:
+        """
+        Evict the user's cached unread count and push the new one on commit.
+
+        The count is kept by a trigger, so reading it here includes the
+        write; it is only read when the user has a stream open.
+        """
+        invalidate_unread_count_on_commit(self.db, user_id)
+        if notification_broker.has_streams(user_id):
+            count = await self.unread_count_repository.get_count(user_id)
+            publish_on_commit(self.db, user_id, "unread_count", {"count": count})
+
+    def _publish(self, notification: Notification, action: str) -> None:
+        """Push a notification to its user's open streams once committed."""
+        if notification_broker.has_streams(notification.user_id):
+            publish_on_commit(
+                self.db,
+                notification.user_id,
+                *self._notification_event(notification, action),
+            )
+
+    @staticmethod
+    def _notification_event(notification: Notification, action: str) -> Event:
+        """Build the stream event for a change to a notification."""
+        data = NotificationResponse.model_validate(notification).model_dump(mode="json")
+        return "notification", {"action": action, "notification": data}
+
     async def get_pending_notifications(
         self, before_time: datetime, limit: int = 100
     ) -> List[Notification]:
         """Get pending notifications scheduled before a certain time."""
         return await self.repository.get_pending_notifications(before_time, limit)
 
-    async def process_pending_notifications(self) -> int:
-        """Process pending notifications (to be called by a scheduler/worker)."""
-        now = datetime.utcnow()
-        notifications = await self.get_pending_notifications(now)
+    async def process_pending_notifications(self, batch_size: int = 100) -> int:
+        """
+        Process pending notifications (to be called by a scheduler/worker).
+
+        A batch of due notifications is claimed and marked as sent in a single
+        statement; rows already claimed by another worker are skipped, so
+        several workers can run at once without sending anything twice.
+        """
+        # Actual sending logic would be implemented here, on the claimed rows
+        notifications = await self.claim_pending_notifications(batch_size)
+        await self.complete_deliveries(notifications)
+        return len(notifications)
+
+    async def claim_pending_notifications(
+        self, batch_size: int = 100, notification_ids: Optional[List[UUID]] = None
+    ) -> List[Notification]:
+        """
+        Claim a batch of due notifications for delivery, marking them as sent.
+
+        Notifications claimed by a concurrent worker are skipped, and
+        ``notification_ids`` limits the claim to those notifications. Nothing
+        is announced until ``complete_deliveries``.
+        """
+        return await self.repository.claim_pending_notifications(
+            datetime.utcnow(), batch_size, notification_ids
+        )
 
-        processed_count = 0
-        for notification in notifications:
-            # Mark as sent (actual sending logic would be implemented here)
-            await self.repository.mark_as_sent(notification.id)
-            processed_count += 1
+    async def complete_deliveries(
+        self,
+        delivered: Sequence[Notification],
+        failed: Sequence[Notification] = (),
+    ) -> None:
+        """
+        Record the outcome of delivering claimed notifications.
 
-        return processed_count
+        Failed deliveries are marked as failed. Each notification is then
+        announced to its user's streams as sent or failed; deliveries run
+        outside the API, so this goes to the streams of every process rather
+        than being published in this one.
+        """
+        if failed:
+            await self.repository.mark_as_failed(
+                [notification.id for notification in failed]
+            )
+            # Keep the caller's copies in step with the rows
+            for notification in failed:
+                notification.status = "failed"
+        await announce_events(
+            self.db,
+            [
+                (notification.user_id, *self._notification_event(notification, action))
+                for action, notifications in (("sent", delivered), ("failed", failed))
+                for notification in notifications
+            ],
+        )
 
     # Notification Settings methods
 
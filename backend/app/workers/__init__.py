@@ -0,0 +1,3 @@
+"""
+Long-running background workers, run with ``python -m app.workers.<name>``.
+"""
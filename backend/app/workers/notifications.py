@@ -0,0 +1,400 @@
+"""
+Deliver due notifications.
+
+Each poll claims a batch of due notifications, delivers them with bounded
+concurrency and marks the deliveries that fail. The outcome of each batch is
+announced over Postgres NOTIFY, which the API relays to the users' notification
+streams. Claims skip rows locked by other workers, so any number of workers can
+run at once. A full batch is followed straight away by the next one; while the
+queue is empty the poll interval doubles up to a maximum. SIGINT or SIGTERM
+lets the current batch finish before the worker exits.
+
+Usage: python -m app.workers.notifications [--batch-size 100] [--concurrency 10]
+       [--poll-interval 1] [--max-poll-interval 30] [--stats-interval 60]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.notification import Notification
+from app.repositories.notification_repository import NotificationRepository
+from app.services.notification_service import (
+    NOTIFICATION_SCHEDULE_CHANNEL,
+    NotificationService,
+)
+from app.workers.timing_wheel import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[Notification], Awaitable[None]]
+
+
+async def log_delivery(notification: Notification) -> None:
+    """Deliver a notification by logging it, until a real channel is wired in."""
+    logger.info(
+        "Notification %s for user %s: %s",
+        notification.id,
+        notification.user_id,
+        notification.title,
+    )
+
+
+class WorkerStats:
+    """Counters for sizing the worker fleet."""
+
+    def __init__(self):
+        self.claimed = 0
+        self.sent = 0
+        self.failed = 0
+        # Lag is how long a notification waited past its scheduled time
+        self.lag_seconds_total = 0.0
+        self.max_lag_seconds = 0.0
+        self.last_lag_seconds = 0.0
+
+    def record_claim(
+        self, notifications: Sequence[Notification], now: datetime
+    ) -> None:
+        """Count a claimed batch and its lag at claim time."""
+        lags = [
+            max((now - notification.scheduled_time).total_seconds(), 0.0)
+            for notification in notifications
+        ]
+        self.claimed += len(notifications)
+        self.lag_seconds_total += sum(lags)
+        self.last_lag_seconds = max(lags)
+        self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+
+    def as_dict(self) -> dict:
+        """Return the counters, with the average lag per claimed notification."""
+        return {
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "failed": self.failed,
+            "avg_lag_seconds": round(
+                self.lag_seconds_total / self.claimed if self.claimed else 0.0, 3
+            ),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+        }
+
+
+class NotificationWorker:
+    """Polls for due notifications and delivers them."""
+
+    def __init__(
+        self,
+        batch_size: int = settings.NOTIFICATION_WORKER_BATCH_SIZE,
+        concurrency: int = settings.NOTIFICATION_WORKER_CONCURRENCY,
+        poll_interval: float = settings.NOTIFICATION_WORKER_POLL_INTERVAL_SECONDS,
+        max_poll_interval: float = (
+            settings.NOTIFICATION_WORKER_MAX_POLL_INTERVAL_SECONDS
+        ),
+        deliver: Deliver = log_delivery,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.deliver = deliver
+        self.session_factory = session_factory
+        self.stats = WorkerStats()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._stopping = asyncio.Event()
+        self._last_report = time.monotonic()
+
+    def stop(self) -> None:
+        """Ask the worker to exit once the current batch is done."""
+        self._stopping.set()
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns how many were claimed."""
+        return await self._claim_and_deliver()
+
+    async def _claim_and_deliver(
+        self, notification_ids: Optional[Sequence[UUID]] = None
+    ) -> int:
+        # Commit the claim straight away so its row locks are not held while
+        # delivering
+        async with self.session_factory() as session:
+            notifications = await NotificationService(
+                session
+            ).claim_pending_notifications(self.batch_size, notification_ids)
+            await session.commit()
+        if not notifications:
+            return 0
+        self.stats.record_claim(notifications, datetime.utcnow())
+
+        outcomes = await asyncio.gather(
+            *(self._deliver(notification) for notification in notifications)
+        )
+        delivered = [n for n, ok in zip(notifications, outcomes) if ok]
+        failed = [n for n, ok in zip(notifications, outcomes) if not ok]
+        async with self.session_factory() as session:
+            await NotificationService(session).complete_deliveries(delivered, failed)
+            await session.commit()
+
+        self.stats.sent += len(delivered)
+        self.stats.failed += len(failed)
+        return len(notifications)
+
+    async def _deliver(self, notification: Notification) -> bool:
+        async with self._slots:
+            try:
+                await self.deliver(notification)
+                return True
+            except Exception:
+                logger.exception("Delivering notification %s failed", notification.id)
+                return False
+
+    async def run(self, stats_interval: Optional[float] = None) -> None:
+        """Poll until stopped, logging the counters every ``stats_interval``."""
+        idle_interval = self.poll_interval
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                # Treat database errors like an empty queue, backing off
+                logger.exception("Polling for notifications failed")
+                claimed = 0
+            self._report_stats(stats_interval)
+
+            if claimed >= self.batch_size:
+                idle_interval = self.poll_interval
+                continue
+            if claimed:
+                idle_interval = self.poll_interval
+                delay = self.poll_interval
+            else:
+                delay = idle_interval
+                idle_interval = min(idle_interval * 2, self.max_poll_interval)
+            await self._sleep(delay)
+
+        logger.info("Notification worker stopped: %s", self.stats.as_dict())
+
+    async def _sleep(self, delay: float) -> None:
+        """Wait for ``delay`` seconds, or less if the worker is stopped."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _report_stats(self, stats_interval: Optional[float]) -> None:
+        if stats_interval and time.monotonic() - self._last_report >= stats_interval:
+            logger.info("Notification worker stats: %s", self.stats.as_dict())
+            self._last_report = time.monotonic()
+
+
+class ScheduledNotificationWorker(NotificationWorker):
+    """
+    Fires notifications from an in-memory timing wheel instead of polling.
+
+    The pending notifications due in the next ``preload_minutes`` are loaded
+    into a TimingWheel, reloaded every half of that window, and kept current
+    in between by listening for the changes NotificationService announces on
+    NOTIFICATION_SCHEDULE_CHANNEL. Each timer that fires is claimed by ID, so
+    notifications go out within about a tick of their scheduled time. Every
+    ``max_poll_interval`` the worker still sweeps up overdue notifications,
+    such as those changed while it was not listening.
+    """
+
+    def __init__(
+        self,
+        *args,
+        preload_minutes: float = settings.NOTIFICATION_WORKER_PRELOAD_MINUTES,
+        tick: float = 0.1,
+        listen_engine: AsyncEngine = engine,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.horizon = preload_minutes * 60
+        self.tick = tick
+        self.listen_engine = listen_engine
+        self.wheel = TimingWheel(time.time(), tick)
+        self._listen_connection: Optional[AsyncConnection] = None
+        self._deliveries: Set[asyncio.Task] = set()
+
+    async def run(self, stats_interval: Optional[float] = None) -> None:
+        """Fire timers until stopped, logging the counters periodically."""
+        next_sweep = next_preload = 0.0
+        try:
+            while not self._stopping.is_set():
+                now = time.time()
+                try:
+                    if now >= next_preload:
+                        # Listen before loading, so no change falls in between
+                        await self._listen()
+                        await self._preload()
+                        next_preload = now + self.horizon / 2
+                    if now >= next_sweep:
+                        while await self.run_once() >= self.batch_size:
+                            pass
+                        next_sweep = now + self.max_poll_interval
+                except Exception:
+                    logger.exception("Loading notifications failed")
+                    await self._close_listener()
+                    next_preload = next_sweep = now + self.poll_interval
+
+                fired = self.wheel.advance(time.time())
+                for start in range(0, len(fired), self.batch_size):
+                    task = asyncio.create_task(
+                        self._claim_and_deliver(fired[start : start + self.batch_size])
+                    )
+                    self._deliveries.add(task)
+                    task.add_done_callback(self._delivery_done)
+                self._report_stats(stats_interval)
+                await self._sleep(self.tick)
+        finally:
+            if self._deliveries:
+                await asyncio.gather(*self._deliveries, return_exceptions=True)
+            await self._close_listener()
+
+        logger.info("Notification worker stopped: %s", self.stats.as_dict())
+
+    async def _preload(self) -> None:
+        """Load the pending notifications due within the horizon into the wheel."""
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            rows = await NotificationRepository(session).get_pending_schedule(
+                now, now + timedelta(seconds=self.horizon)
+            )
+        for row in rows:
+            self.wheel.add(row.id, _timestamp(row.scheduled_time))
+
+    async def _listen(self) -> None:
+        """Open the LISTEN connection unless it is already open."""
+        if self._listen_connection is not None:
+            raw = await self._listen_connection.get_raw_connection()
+            if not raw.driver_connection.is_closed():
+                return
+            await self._close_listener()
+        connection = await self.listen_engine.connect()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.add_listener(
+            NOTIFICATION_SCHEDULE_CHANNEL, self._on_schedule_change
+        )
+        self._listen_connection = connection
+
+    async def _close_listener(self) -> None:
+        connection, self._listen_connection = self._listen_connection, None
+        if connection is None:
+            return
+        try:
+            raw = await connection.get_raw_connection()
+            if not raw.driver_connection.is_closed():
+                await raw.driver_connection.remove_listener(
+                    NOTIFICATION_SCHEDULE_CHANNEL, self._on_schedule_change
+                )
+            await connection.close()
+        except Exception:
+            logger.exception("Closing the notification listener failed")
+
+    def _on_schedule_change(self, connection, pid, channel, payload: str) -> None:
+        change = json.loads(payload)
+        notification_id = UUID(change["id"])
+        if change["status"] == "pending" and change["scheduled_time"]:
+            deadline = _timestamp(datetime.fromisoformat(change["scheduled_time"]))
+            if deadline <= time.time() + self.horizon:
+                self.wheel.add(notification_id, deadline)
+                return
+        # Cancelled, deleted or moved beyond the horizon
+        self.wheel.cancel(notification_id)
+
+    def _delivery_done(self, task: asyncio.Task) -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Claiming notifications failed", exc_info=task.exception())
+
+
+def _timestamp(scheduled_time: datetime) -> float:
+    """Convert a naive UTC scheduled time to a POSIX timestamp."""
+    return scheduled_time.replace(tzinfo=timezone.utc).timestamp()
+
+
+async def run(
+    batch_size: int,
+    concurrency: int,
+    poll_interval: float,
+    max_poll_interval: float,
+    stats_interval: float,
+    preload_minutes: float,
+) -> None:
+    if preload_minutes > 0:
+        worker = ScheduledNotificationWorker(
+            batch_size,
+            concurrency,
+            poll_interval,
+            max_poll_interval,
+            preload_minutes=preload_minutes,
+        )
+    else:
+        worker = NotificationWorker(
+            batch_size, concurrency, poll_interval, max_poll_interval
+        )
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    try:
+        await worker.run(stats_interval)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.NOTIFICATION_WORKER_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.NOTIFICATION_WORKER_CONCURRENCY
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.NOTIFICATION_WORKER_POLL_INTERVAL_SECONDS,
+    )
+    parser.add_argument(
+        "--max-poll-interval",
+        type=float,
+        default=settings.NOTIFICATION_WORKER_MAX_POLL_INTERVAL_SECONDS,
+    )
+    parser.add_argument("--stats-interval", type=float, default=60.0)
+    parser.add_argument(
+        "--preload-minutes",
+        type=float,
+        default=settings.NOTIFICATION_WORKER_PRELOAD_MINUTES,
+        help="Schedule this far ahead in memory; 0 polls instead",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(
+        run(
+            args.batch_size,
+            args.concurrency,
+            args.poll_interval,
+            args.max_poll_interval,
+            args.stats_interval,
+            args.preload_minutes,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
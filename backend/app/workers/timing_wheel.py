@@ -0,0 +1,110 @@
+"""
+Hierarchical timing wheel for scheduling many timers cheaply.
+"""
+
+import math
+from typing import Dict, Hashable, List, Tuple
+
+
+class TimingWheel:
+    """
+    Timers bucketed by tick on a stack of wheels, each coarser than the last.
+
+    Level 0 has one slot per tick; each slot of level ``n`` spans a full turn
+    of level ``n - 1``. Adding and cancelling a timer is O(1), and advancing
+    the clock only touches the slots passed, moving timers down a level when
+    their coarse slot comes up. Timers beyond the top wheel's span wait in an
+    overflow bucket that is re-examined once per top-level slot.
+
+    Times are plain floats, such as ``time.time()``. A timer fires on the
+    first ``advance`` whose time is at or past its deadline, rounded up to
+    a whole tick, so it is never early and at most one tick late.
+    """
+
+    def __init__(
+        self, start: float, tick: float = 0.1, slots: int = 64, levels: int = 3
+    ):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._current = math.floor(start / tick)
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: Dict[Hashable, int] = {}
+        # Timers that were already due when added
+        self._due: Dict[Hashable, int] = {}
+        # Where each timer is: the bucket holding it
+        self._buckets: Dict[Hashable, Dict[Hashable, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._buckets
+
+    @property
+    def span(self) -> float:
+        """Seconds ahead that timers can be held without overflowing."""
+        return self.tick * self.slots**self.levels
+
+    def add(self, key: Hashable, deadline: float) -> None:
+        """Schedule ``key`` to fire at ``deadline``, replacing any earlier timer."""
+        self.cancel(key)
+        self._place(key, math.ceil(deadline / self.tick))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove the timer for ``key``; returns whether there was one."""
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the clock to ``now`` and return the keys that fired, in order."""
+        fired = self._pop_bucket(self._due)
+        target = math.floor(now / self.tick)
+        while self._current < target:
+            self._current += 1
+            # Cascade from the coarsest level whose slot boundary was crossed
+            for level in range(self.levels - 1, 0, -1):
+                width = self.slots**level
+                if self._current % width == 0:
+                    if level == self.levels - 1:
+                        self._replace(self._overflow)
+                    slot = (self._current // width) % self.slots
+                    self._replace(self._wheels[level][slot])
+            # Cascaded timers due on this very tick land in the due bucket
+            fired.extend(self._pop_bucket(self._due))
+            slot = self._current % self.slots
+            fired.extend(self._pop_bucket(self._wheels[0][slot]))
+        return fired
+
+    def _place(self, key: Hashable, due_tick: int) -> None:
+        delta = due_tick - self._current
+        if delta <= 0:
+            bucket = self._due
+        else:
+            bucket = self._overflow
+            for level in range(self.levels):
+                if delta < self.slots ** (level + 1):
+                    slot = (due_tick // self.slots**level) % self.slots
+                    bucket = self._wheels[level][slot]
+                    break
+        bucket[key] = due_tick
+        self._buckets[key] = bucket
+
+    def _replace(self, bucket: Dict[Hashable, int]) -> None:
+        """Re-place the timers of a coarse bucket at the current tick."""
+        timers: List[Tuple[Hashable, int]] = list(bucket.items())
+        bucket.clear()
+        for key, due_tick in timers:
+            self._place(key, due_tick)
+
+    def _pop_bucket(self, bucket: Dict[Hashable, int]) -> List[Hashable]:
+        keys = sorted(bucket, key=bucket.__getitem__)
+        bucket.clear()
+        for key in keys:
+            del self._buckets[key]
+        return keys
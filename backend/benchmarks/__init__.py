@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for database-heavy code paths.
+"""
@@ -0,0 +1,83 @@
+"""
+Compare per-row inserts with BaseRepository.bulk_create and bulk_upsert.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bulk_insert --rows 5000
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from app.models.food import Food
+from app.models.habit import Habit
+from app.repositories.module_repositories import FoodRepository, HabitEntryRepository
+from benchmarks.common import (
+    benchmark_session,
+    create_benchmark_user,
+    report,
+    timer,
+)
+
+
+def food_rows(user_id, count: int) -> list[dict]:
+    """Build food rows for a single user."""
+    return [
+        {
+            "user_id": user_id,
+            "meal_date": date.today() - timedelta(days=i % 365),
+            "meal_type": "snack",
+            "food_name": f"Benchmark food {i}",
+        }
+        for i in range(count)
+    ]
+
+
+async def run(rows: int) -> None:
+    async with benchmark_session() as session:
+        user = await create_benchmark_user(session)
+        repo = FoodRepository(session)
+
+        with timer() as elapsed:
+            for row in food_rows(user.id, rows):
+                await repo.create(Food(**row))
+        report("create() per row", rows, elapsed["seconds"])
+
+        with timer() as elapsed:
+            await repo.bulk_create(food_rows(user.id, rows))
+        report("bulk_create()", rows, elapsed["seconds"])
+
+        habit = Habit(user_id=user.id, name="Benchmark", frequency="daily")
+        session.add(habit)
+        await session.flush()
+        entry_repo = HabitEntryRepository(session)
+        entries = [
+            {
+                "habit_id": habit.id,
+                "entry_date": date.today() - timedelta(days=i),
+                "completed": i % 2 == 0,
+            }
+            for i in range(rows)
+        ]
+
+        with timer() as elapsed:
+            await entry_repo.bulk_upsert(entries)
+        report("bulk_upsert() inserts", rows, elapsed["seconds"])
+
+        for entry in entries:
+            entry["completed"] = not entry["completed"]
+        with timer() as elapsed:
+            await entry_repo.bulk_upsert(entries)
+        report("bulk_upsert() conflicts", rows, elapsed["seconds"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
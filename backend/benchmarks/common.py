@@ -0,0 +1,67 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Generator
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.base import Base
+from app.models.user import User
+
+
+@asynccontextmanager
+async def benchmark_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a session against DATABASE_URL whose work is always rolled back.
+
+    Tables are created if they do not exist yet, so the scripts can run
+    against an empty database.
+    """
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+async def create_benchmark_user(session: AsyncSession) -> User:
+    """Create a throwaway user to own benchmark rows."""
+    suffix = uuid4().hex[:12]
+    user = User(
+        email=f"bench-{suffix}@example.com",
+        username=f"bench-{suffix}",
+        password_hash="benchmark",
+    )
+    session.add(user)
+    await session.flush()
+    return user
+
+
+@contextmanager
+def timer() -> Generator[dict, None, None]:
+    """Measure wall-clock time; the elapsed seconds are stored under 'seconds'."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def report(label: str, rows: int, seconds: float) -> None:
+    """Print a single benchmark line with throughput."""
+    rate = rows / seconds if seconds > 0 else float("inf")
+    print(f"{label:<32} {rows:>8} rows {seconds:>9.3f}s {rate:>12,.0f} rows/s")
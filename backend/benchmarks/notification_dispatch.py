@@ -0,0 +1,154 @@
+"""
+Measure notification dispatch throughput with several concurrent workers.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.notification_dispatch --rows 1000000 --workers 4
+
+The workers commit their claims, so unlike the other benchmarks this one
+cannot run inside a rolled-back transaction: the rows are committed and
+deleted again at the end. Run it against a scratch database; it refuses to
+start when other notifications are already due, since it would send them.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.base import Base
+from app.models.notification import Notification
+from app.models.user import User
+from app.repositories.notification_repository import NotificationRepository
+from benchmarks.common import create_benchmark_user, report, timer
+
+
+async def per_row(engine, rows: int, batch_size: int) -> int:
+    """Drain rows the old way: fetch a batch, then mark each row as sent."""
+    processed = 0
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = NotificationRepository(session)
+        while processed < rows:
+            pending = await repository.get_pending_notifications(
+                datetime.utcnow(), min(batch_size, rows - processed)
+            )
+            if not pending:
+                break
+            for notification in pending:
+                await repository.mark_as_sent(notification.id)
+            await session.commit()
+            processed += len(pending)
+    return processed
+
+
+async def claim_worker(engine, batch_size: int, claimed: list) -> None:
+    """Claim batches until the queue is empty, recording each claimed id."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = NotificationRepository(session)
+        while True:
+            batch = await repository.claim_pending_notifications(
+                datetime.utcnow(), batch_size
+            )
+            await session.commit()
+            if not batch:
+                return
+            claimed.extend(notification.id for notification in batch)
+            session.expunge_all()
+
+
+async def run(rows: int, workers: int, batch_size: int, per_row_rows: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL, pool_size=workers + 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        due = await session.scalar(
+            select(func.count())
+            .select_from(Notification)
+            .where(Notification.status == "pending")
+            .where(Notification.scheduled_time <= datetime.utcnow())
+        )
+        if due:
+            raise SystemExit(
+                f"{due} notifications are already due; use a scratch database"
+            )
+        user = await create_benchmark_user(session)
+        user_id = user.id
+        await session.commit()
+
+    try:
+        # Generate the backlog server-side, spread over the past day
+        with timer() as elapsed:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        "INSERT INTO notifications (id, created_at, user_id, title,"
+                        " notification_type, scheduled_time, status, is_read)"
+                        " SELECT gen_random_uuid(), now(), :user_id, 'Benchmark',"
+                        " 'reminder', CAST(:start AS timestamp) + make_interval(secs => n % 86400),"
+                        " 'pending', false FROM generate_series(1, :rows) AS n"
+                    ),
+                    {
+                        "user_id": user_id,
+                        "start": datetime.utcnow() - timedelta(days=1, minutes=1),
+                        "rows": rows,
+                    },
+                )
+                await conn.execute(text("ANALYZE notifications"))
+        report("insert backlog", rows, elapsed["seconds"])
+
+        with timer() as elapsed:
+            processed = await per_row(engine, per_row_rows, batch_size)
+        report("per-row mark_as_sent", processed, elapsed["seconds"])
+
+        for worker_count in sorted({1, workers}):
+            # Requeue everything so each run drains the same backlog
+            async with engine.begin() as conn:
+                await conn.execute(
+                    Notification.__table__.update()
+                    .where(Notification.user_id == user_id)
+                    .values(status="pending", sent_at=None)
+                )
+            claimed: list = []
+            with timer() as elapsed:
+                await asyncio.gather(
+                    *(
+                        claim_worker(engine, batch_size, claimed)
+                        for _ in range(worker_count)
+                    )
+                )
+            report(f"claim x{worker_count} workers", len(claimed), elapsed["seconds"])
+            if len(set(claimed)) != len(claimed) or len(claimed) != rows:
+                raise SystemExit(
+                    f"expected {rows} distinct claims, got {len(set(claimed))}"
+                    f" distinct of {len(claimed)}"
+                )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(Notification).where(Notification.user_id == user_id)
+            )
+            await conn.execute(delete(User).where(User.id == user_id))
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--per-row-rows",
+        type=int,
+        default=5000,
+        help="Rows to drain with the old per-row path, which is much slower",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.workers, args.batch_size, args.per_row_rows))
+
+
+if __name__ == "__main__":
+    main()
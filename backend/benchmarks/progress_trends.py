@@ -0,0 +1,100 @@
+"""
+Compare the Python and NumPy engines for habit progress trends.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.progress_trends --habits 50 --days 365
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app.models.habit import Habit, HabitEntry
+from app.services.habit_analytics_service import HabitAnalyticsService
+from benchmarks.common import benchmark_session, create_benchmark_user, report, timer
+
+
+async def run(habit_count: int, days: int) -> None:
+    async with benchmark_session() as session:
+        user = await create_benchmark_user(session)
+        habits = [
+            Habit(user_id=user.id, name=f"Benchmark {i}", frequency="daily")
+            for i in range(habit_count)
+        ]
+        session.add_all(habits)
+        await session.flush()
+
+        rng = random.Random(0)
+        today = date.today()
+        await session.execute(
+            insert(HabitEntry),
+            [
+                {
+                    "habit_id": habit.id,
+                    "entry_date": today - timedelta(days=offset),
+                    "completed": rng.random() < 0.7,
+                }
+                for habit in habits
+                for offset in range(days + 1)
+            ],
+        )
+
+        service = HabitAnalyticsService(session)
+        rows = habit_count * (days + 1)
+        for engine in ("python", "numpy"):
+            with timer() as elapsed:
+                for habit in habits:
+                    await service.get_progress_trends(habit.id, user.id, days, engine)
+            report(f"{engine} (with queries)", rows, elapsed["seconds"])
+
+        # The computation alone, on entries fetched up front
+        start_date = today - timedelta(days=days)
+        entries = {
+            habit.id: await service.entry_repository.select_rows(
+                (
+                    HabitEntry.entry_date,
+                    HabitEntry.completed,
+                    HabitEntry.mood,
+                    HabitEntry.notes,
+                ),
+                HabitEntry.habit_id == habit.id,
+                HabitEntry.entry_date >= start_date,
+                order_by=(HabitEntry.entry_date.asc(),),
+            )
+            for habit in habits
+        }
+        # The Python engine reads its trend from the cached prefix sums
+        indexes = {
+            habit.id: await service.get_window_index(habit.id, user.id)
+            for habit in habits
+        }
+        builders = {
+            "python": lambda habit: (
+                service._build_daily_trends(entries[habit.id], start_date),
+                service._determine_trend(indexes[habit.id], start_date, days),
+            ),
+            "numpy": lambda habit: service._build_daily_trends_numpy(
+                entries[habit.id], days, start_date
+            ),
+        }
+        for engine, build in builders.items():
+            with timer() as elapsed:
+                for habit in habits:
+                    build(habit)
+            report(f"{engine} (compute only)", rows, elapsed["seconds"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    asyncio.run(run(args.habits, args.days))
+
+
+if __name__ == "__main__":
+    main()
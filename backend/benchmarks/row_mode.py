@@ -0,0 +1,88 @@
+"""
+Compare loading HabitEntry rows as ORM objects with plain row tuples.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.row_mode --rows 100000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select
+
+from app.models.habit import Habit, HabitEntry
+from app.repositories.module_repositories import HabitEntryRepository
+from benchmarks.common import benchmark_session, create_benchmark_user, report
+
+ROW_COLUMNS = (HabitEntry.entry_date, HabitEntry.completed)
+
+
+async def load_orm(session, habit_id) -> list:
+    result = await session.scalars(
+        select(HabitEntry).where(HabitEntry.habit_id == habit_id)
+    )
+    return list(result.all())
+
+
+async def load_rows(session, habit_id) -> list:
+    repo = HabitEntryRepository(session)
+    return await repo.select_rows(ROW_COLUMNS, HabitEntry.habit_id == habit_id)
+
+
+async def measure(session, label: str, load, habit_id, rows: int) -> None:
+    """Report CPU time, then peak Python memory in a second traced pass."""
+    start = time.process_time()
+    loaded = await load(session, habit_id)
+    seconds = time.process_time() - start
+    assert len(loaded) == rows
+    del loaded
+    session.expunge_all()
+
+    tracemalloc.start()
+    loaded = await load(session, habit_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    session.expunge_all()
+
+    report(f"{label} (cpu)", rows, seconds)
+    print(f"{label + ' (peak memory)':<32} {peak / 1024 / 1024:>8.1f} MiB")
+
+
+async def run(rows: int) -> None:
+    async with benchmark_session() as session:
+        user = await create_benchmark_user(session)
+        habit = Habit(user_id=user.id, name="Benchmark", frequency="daily")
+        session.add(habit)
+        await session.flush()
+
+        await session.execute(
+            insert(HabitEntry),
+            [
+                {
+                    "habit_id": habit.id,
+                    "entry_date": date.today() - timedelta(days=i),
+                    "completed": i % 3 != 0,
+                }
+                for i in range(rows)
+            ],
+        )
+        session.expunge_all()
+
+        await measure(session, "ORM objects", load_orm, habit.id, rows)
+        await measure(session, "select_rows()", load_rows, habit.id, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+Integration tests for the shared BaseRepository operations.
+"""
+
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.food import Food
+from app.models.habit import Habit, HabitEntry, HabitPeriodStat, HabitYearBitmap
+from app.models.user import User
+from app.repositories.module_repositories import (
+    FoodRepository,
+    HabitEntryRepository,
+    HabitPeriodStatRepository,
+    HabitRepository,
+    HabitYearBitmapRepository,
+)
+
+
+async def _create_user(db_session: AsyncSession, name: str) -> User:
+    user = User(
+        email=f"{name}@example.com",
+        username=name,
+        password_hash="hashedpassword",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_count_where_matches_filters(db_session: AsyncSession):
+    """Test that count_where counts only rows matching the criteria."""
+    user = await _create_user(db_session, "countuser")
+    other = await _create_user(db_session, "countother")
+
+    today = date.today()
+    for i in range(6):
+        db_session.add(
+            Food(
+                user_id=user.id,
+                meal_date=today - timedelta(days=i),
+                meal_type="lunch" if i % 2 else "dinner",
+                food_name=f"Meal {i}",
+            )
+        )
+    db_session.add(
+        Food(user_id=other.id, meal_date=today, meal_type="lunch", food_name="Other")
+    )
+    await db_session.flush()
+
+    repo = FoodRepository(db_session)
+
+    assert await repo.count() == 7
+    assert await repo.count_where(Food.user_id == user.id) == 6
+    assert await repo.count_user_foods(user.id) == 6
+    assert await repo.count_user_foods(user.id, meal_type="lunch") == 3
+    assert (
+        await repo.count_user_foods(user.id, start_date=today - timedelta(days=1)) == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_matches_listing(db_session: AsyncSession):
+    """Test that the total agrees with the filtered listing."""
+    user = await _create_user(db_session, "countlist")
+
+    for i in range(5):
+        db_session.add(
+            Food(
+                user_id=user.id,
+                meal_date=date.today(),
+                meal_type="snack" if i < 2 else "breakfast",
+                food_name=f"Item {i}",
+            )
+        )
+    await db_session.flush()
+
+    repo = FoodRepository(db_session)
+    foods = await repo.get_user_foods(user.id, meal_type="snack")
+    total = await repo.count_user_foods(user.id, meal_type="snack")
+
+    assert total == len(foods) == 2
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_order(db_session: AsyncSession):
+    """Test that following cursors visits every row in the offset order."""
+    user = await _create_user(db_session, "cursoruser")
+
+    today = date.today()
+    for i in range(11):
+        db_session.add(
+            Food(
+                user_id=user.id,
+                meal_date=today - timedelta(days=i // 3),
+                # Leave some meal times empty to exercise NULL sort keys
+                meal_time=time(8 + i % 3, 0) if i % 4 else None,
+                meal_type="lunch",
+                food_name=f"Meal {i}",
+            )
+        )
+    await db_session.flush()
+
+    repo = FoodRepository(db_session)
+    expected = [food.id for food in await repo.get_user_foods(user.id, limit=100)]
+
+    seen = []
+    cursor = None
+    while True:
+        page = await repo.get_user_foods(user.id, limit=4, cursor=cursor)
+        seen.extend(food.id for food in page)
+        cursor = repo.next_cursor(page, 4)
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(db_session: AsyncSession):
+    """Test that a malformed cursor is reported as a bad request."""
+    user = await _create_user(db_session, "badcursor")
+    repo = FoodRepository(db_session)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await repo.get_user_foods(user.id, cursor="not-a-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_returns_rows_in_order(db_session: AsyncSession):
+    """Test that bulk_create inserts every row and applies column defaults."""
+    user = await _create_user(db_session, "bulkuser")
+    repo = FoodRepository(db_session)
+
+    rows = [
+        {
+            "user_id": user.id,
+            "meal_date": date.today(),
+            "meal_type": "snack",
+            "food_name": f"Bulk {i}",
+        }
+        for i in range(25)
+    ]
+    foods = await repo.bulk_create(rows)
+
+    assert [food.food_name for food in foods] == [row["food_name"] for row in rows]
+    assert all(food.id is not None and food.created_at for food in foods)
+    assert await repo.count_user_foods(user.id) == 25
+    assert await repo.bulk_create([]) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_on_unique_constraint(db_session: AsyncSession):
+    """Test that bulk_upsert updates conflicting habit entries and inserts new ones."""
+    user = await _create_user(db_session, "upsertuser")
+    habit = Habit(user_id=user.id, name="Read", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    repo = HabitEntryRepository(db_session)
+    today = date.today()
+    first = await repo.bulk_create(
+        [
+            {"habit_id": habit.id, "entry_date": today - timedelta(days=i)}
+            for i in range(3)
+        ]
+    )
+
+    upserted = await repo.bulk_upsert(
+        [
+            {"habit_id": habit.id, "entry_date": today, "completed": True},
+            {
+                "habit_id": habit.id,
+                "entry_date": today - timedelta(days=1),
+                "completed": True,
+            },
+            {
+                "habit_id": habit.id,
+                "entry_date": today - timedelta(days=5),
+                "completed": True,
+            },
+        ]
+    )
+
+    assert len(upserted) == 3
+    assert all(entry.completed for entry in upserted)
+    # Conflicting rows keep their identity
+    assert upserted[0].id == first[0].id
+    assert upserted[1].id == first[1].id
+    entries = await repo.get_habit_entries(habit.id)
+    assert len(entries) == 4
+    assert sum(1 for entry in entries if entry.completed) == 3
+
+
+@pytest.mark.asyncio
+async def test_update_owned_scopes_to_user(db_session: AsyncSession):
+    """Test that update_owned only updates rows owned by the user."""
+    user = await _create_user(db_session, "updateowner")
+    other = await _create_user(db_session, "updateother")
+    habit = Habit(user_id=user.id, name="Walk", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    repo = HabitRepository(db_session)
+
+    assert await repo.update_owned(habit.id, other.id, {"name": "Stolen"}) is None
+    updated = await repo.update_owned(habit.id, user.id, {"name": "Run"})
+
+    assert updated is habit
+    assert updated.name == "Run"
+    assert updated.updated_at is not None
+    # An empty update still returns the owned row
+    assert await repo.update_owned(habit.id, user.id, {}) is habit
+
+
+@pytest.mark.asyncio
+async def test_delete_owned_removes_children(db_session: AsyncSession):
+    """Test that delete_owned checks ownership and cascades to child rows."""
+    user = await _create_user(db_session, "deleteowner")
+    other = await _create_user(db_session, "deleteother")
+    habit = Habit(user_id=user.id, name="Stretch", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    entry_repo = HabitEntryRepository(db_session)
+    await entry_repo.bulk_create(
+        [
+            {"habit_id": habit.id, "entry_date": date.today() - timedelta(days=i)}
+            for i in range(3)
+        ]
+    )
+
+    repo = HabitRepository(db_session)
+
+    assert await repo.delete_owned(habit.id, other.id) is False
+    assert await repo.delete_owned(habit.id, user.id) is True
+    assert await repo.delete_owned(habit.id, user.id) is False
+    assert await entry_repo.count_where(HabitEntry.habit_id == habit.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_user_scoped_lookups_exclude_other_users(db_session: AsyncSession):
+    """Test that user-scoped lookups never return another user's rows."""
+    user = await _create_user(db_session, "scopeowner")
+    other = await _create_user(db_session, "scopeother")
+    habits = []
+    for owner, name in [(user, "Mine"), (user, "Also mine"), (other, "Theirs")]:
+        habit = Habit(user_id=owner.id, name=name, frequency="daily")
+        db_session.add(habit)
+        habits.append(habit)
+    await db_session.flush()
+
+    repo = HabitRepository(db_session)
+    mine, _, theirs = habits
+
+    assert await repo.get_owned(mine.id, user.id) is mine
+    assert await repo.get_owned(theirs.id, user.id) is None
+    assert await repo.exists_owned(mine.id, user.id) is True
+    assert await repo.exists_owned(theirs.id, user.id) is False
+    assert {h.id for h in await repo.list_for_user(user.id)} == {
+        h.id for h in habits[:2]
+    }
+    assert await repo.count_for_user(user.id, Habit.name == "Mine") == 1
+
+
+@pytest.mark.asyncio
+async def test_repeat_lookups_reuse_loaded_rows(db_session: AsyncSession, query_log):
+    """Test that repeat lookups in a session are served without another query."""
+    user = await _create_user(db_session, "cacheowner")
+    other = await _create_user(db_session, "cacheother")
+    habit = Habit(user_id=user.id, name="Meditate", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    repo = HabitRepository(db_session)
+    query_log.clear()
+
+    assert await repo.get_by_id(habit.id) is habit
+    assert await repo.get_owned(habit.id, user.id) is habit
+    assert await repo.get_owned(habit.id, other.id) is None
+    assert await repo.exists_owned(habit.id, user.id) is True
+    assert query_log == []
+
+    # Updates refresh the shared copy and deletes evict it
+    await repo.update_owned(habit.id, user.id, {"name": "Breathe"})
+    assert (await repo.get_owned(habit.id, user.id)).name == "Breathe"
+    await repo.delete_owned(habit.id, user.id)
+    query_log.clear()
+
+    assert await repo.get_owned(habit.id, user.id) is None
+    assert await repo.get_by_id(habit.id) is None
+    assert len(query_log) == 2
+
+
+@pytest.mark.asyncio
+async def test_summary_listing_skips_heavy_columns(db_session: AsyncSession, query_log):
+    """Test that the summary view does not select unbounded text columns."""
+    user = await _create_user(db_session, "summaryuser")
+    db_session.add(
+        Food(
+            user_id=user.id,
+            meal_date=date.today(),
+            meal_type="lunch",
+            food_name="Soup",
+            notes="A very long note" * 100,
+        )
+    )
+    await db_session.flush()
+    db_session.expunge_all()
+
+    repo = FoodRepository(db_session)
+    query_log.clear()
+    foods = await repo.get_user_foods(user.id, summary=True)
+
+    assert [food.food_name for food in foods] == ["Soup"]
+    assert len(db_session.identity_map) == 0
+    assert len(query_log) == 1
+    assert "foods.notes" not in query_log[0]
+    assert repo.next_cursor(foods, 1) is not None
+
+
+@pytest.mark.asyncio
+async def test_select_rows_skips_identity_map(db_session: AsyncSession):
+    """Test that select_rows returns plain rows without loading ORM objects."""
+    user = await _create_user(db_session, "rowsuser")
+    habit = Habit(user_id=user.id, name="Journal", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    repo = HabitEntryRepository(db_session)
+    today = date.today()
+    await repo.bulk_create(
+        [
+            {
+                "habit_id": habit.id,
+                "entry_date": today - timedelta(days=i),
+                "completed": i % 2 == 0,
+            }
+            for i in range(4)
+        ]
+    )
+    db_session.expunge_all()
+
+    rows = await repo.select_rows(
+        (HabitEntry.entry_date, HabitEntry.completed),
+        HabitEntry.habit_id == habit.id,
+        HabitEntry.completed == True,
+        order_by=(HabitEntry.entry_date.desc(),),
+    )
+
+    assert [tuple(row) for row in rows] == [
+        (today, True),
+        (today - timedelta(days=2), True),
+    ]
+    assert rows[0].entry_date == today
+    assert len(db_session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_year_bitmaps_follow_entry_writes(db_session: AsyncSession):
+    """Test that inserts, updates and deletes of entries keep the bitmaps in sync."""
+    user = await _create_user(db_session, "bitmapuser")
+    habit = Habit(user_id=user.id, name="Swim", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    entry_repo = HabitEntryRepository(db_session)
+    days = [date(2023, 12, 31), date(2024, 1, 1), date(2024, 2, 29), date(2024, 12, 31)]
+    entries = await entry_repo.bulk_create(
+        [{"habit_id": habit.id, "entry_date": day, "completed": True} for day in days]
+        + [{"habit_id": habit.id, "entry_date": date(2024, 3, 1), "completed": False}]
+    )
+    repo = HabitYearBitmapRepository(db_session)
+
+    assert await repo.get_completed_dates(habit.id) == sorted(days, reverse=True)
+
+    await entry_repo.update(entries[2], {"completed": False})
+    await entry_repo.update(entries[4], {"completed": True})
+    await entry_repo.update(entries[0], {"entry_date": date(2022, 6, 15)})
+    await entry_repo.delete(entries[3].id)
+
+    assert await repo.get_completed_dates(habit.id) == [
+        date(2024, 3, 1),
+        date(2024, 1, 1),
+        date(2022, 6, 15),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_year_bitmap_rebuild_matches_entries(db_session: AsyncSession):
+    """Test that rebuilding the bitmaps restores them from the entries."""
+    user = await _create_user(db_session, "rebuilduser")
+    habit = Habit(user_id=user.id, name="Sketch", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    today = date.today()
+    await HabitEntryRepository(db_session).bulk_create(
+        [
+            {
+                "habit_id": habit.id,
+                "entry_date": today - timedelta(days=i * 5),
+                "completed": i % 3 != 0,
+            }
+            for i in range(200)
+        ]
+    )
+    repo = HabitYearBitmapRepository(db_session)
+    expected = await repo.get_completed_dates(habit.id)
+
+    # Simulate rows that predate the trigger
+    await db_session.execute(
+        HabitYearBitmap.__table__.delete().where(HabitYearBitmap.habit_id == habit.id)
+    )
+    assert await repo.get_completed_dates(habit.id) == []
+
+    written = await repo.rebuild([habit.id])
+
+    assert written == len({day.year for day in expected})
+    assert await repo.get_completed_dates(habit.id) == expected
+    assert len(expected) == sum(1 for i in range(200) if i % 3 != 0)
+
+
+@pytest.mark.asyncio
+async def test_period_stats_follow_entry_writes(db_session: AsyncSession):
+    """Test that weekly and monthly rollups track entry writes and rebuilds."""
+    user = await _create_user(db_session, "rollupuser")
+    habit = Habit(user_id=user.id, name="Cycle", frequency="daily")
+    db_session.add(habit)
+    await db_session.flush()
+
+    entry_repo = HabitEntryRepository(db_session)
+    # Sunday 2024-03-31 closes a week that started in March
+    entries = await entry_repo.bulk_create(
+        [
+            {"habit_id": habit.id, "entry_date": day, "completed": completed}
+            for day, completed in [
+                (date(2024, 3, 25), True),
+                (date(2024, 3, 31), True),
+                (date(2024, 4, 1), True),
+                (date(2024, 4, 2), False),
+            ]
+        ]
+    )
+    await entry_repo.update(entries[3], {"completed": True})
+    await entry_repo.delete(entries[0].id)
+    await entry_repo.update(entries[1], {"entry_date": date(2024, 4, 7)})
+
+    repo = HabitPeriodStatRepository(db_session)
+    expected = (
+        {date(2024, 4, 1): 3},
+        {date(2024, 4, 1): 3},
+    )
+    assert (
+        await repo.get_completions(habit.id, date(2024, 1, 1), date(2024, 1, 1))
+        == expected
+    )
+
+    await db_session.execute(
+        HabitPeriodStat.__table__.delete().where(HabitPeriodStat.habit_id == habit.id)
+    )
+    assert await repo.rebuild([habit.id]) == 2
+    assert (
+        await repo.get_completions(habit.id, date(2024, 1, 1), date(2024, 1, 1))
+        == expected
+    )
@@ -2,11 +2,17 @@
 Integration tests for database connectivity and connection pooling.
 """
 
+import httpx
 import pytest
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import database
 from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -111,3 +117,105 @@ async def test_uuid_extension():
         uuid_value = result.scalar()
         assert uuid_value is not None
         assert len(str(uuid_value)) == 36  # UUID format
+
+
+@pytest.mark.asyncio
+async def test_read_db_rotates_replicas_and_falls_back(monkeypatch):
+    """Test that reads rotate over replicas and fall back to the primary."""
+    unreachable = database._create_engine(
+        engine.url.set(host="127.0.0.1", port=5999).render_as_string(
+            hide_password=False
+        )
+    )
+    monkeypatch.setattr(database, "replica_engines", [unreachable, engine])
+
+    first = database.read_engines()
+    second = database.read_engines()
+    assert first[-1] is second[-1] is engine
+    assert first[:2] == list(reversed(second[:2]))
+
+    # Reads skip the unreachable replica for the reachable one, and use the
+    # primary when only the unreachable one is configured
+    replica = database._create_engine(engine.url.render_as_string(hide_password=False))
+    try:
+        for replicas, expected in [
+            ([unreachable, replica], replica),
+            ([unreachable], engine),
+        ]:
+            monkeypatch.setattr(database, "replica_engines", replicas)
+            for _ in replicas:
+                sessions = database.get_read_db()
+                session = await sessions.__anext__()
+                try:
+                    result = await session.execute(text("SELECT 1"))
+                    assert result.scalar() == 1
+                    assert session.sync_session.bind is expected.sync_engine
+                finally:
+                    await sessions.aclose()
+    finally:
+        await unreachable.dispose()
+        await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_db_session_is_lazy_and_read_only():
+    """Test that the read session connects on first use and rejects writes."""
+    sessions = database.get_read_db()
+    checked_out = engine.pool.checkedout()
+    session = await sessions.__anext__()
+    try:
+        assert not session.in_transaction()
+        assert engine.pool.checkedout() == checked_out
+
+        result = await session.execute(text("SHOW transaction_read_only"))
+        assert result.scalar() == "on"
+
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await session.execute(text("CREATE TABLE read_only_probe (id int)"))
+    finally:
+        await sessions.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_requests_do_not_touch_the_primary(monkeypatch):
+    """Test that a GET authenticates and reads on the replica alone."""
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email="replicareader@example.com",
+            username="replicareader",
+            password_hash="hashedpassword",
+        )
+        session.add(user)
+        await session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    replica = database._create_engine(engine.url.render_as_string(hide_password=False))
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    primary_statements, replica_statements = [], []
+
+    def record_primary(conn, cursor, statement, *args):
+        primary_statements.append(statement)
+
+    def record_replica(conn, cursor, statement, *args):
+        replica_statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record_primary)
+    event.listen(replica.sync_engine, "before_cursor_execute", record_replica)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test/api/v1"
+        ) as client:
+            for path in ("/users/me", "/goals", "/habits"):
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, path
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_primary)
+        await replica.dispose()
+        async with AsyncSessionLocal() as session:
+            await session.delete(await session.get(User, user.id))
+            await session.commit()
+
+    # One session per request: the user and the data come from the replica
+    assert primary_statements == []
+    assert sum("FROM users" in statement for statement in replica_statements) == 3
@@ -3,12 +3,21 @@ Tests for habit analytics service - streak calculation and analytics.
 """
 
 import pytest
+import base64
+import random
 from datetime import date, datetime, timedelta
 from uuid import uuid4
 
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.cache import AnalyticsCache
 from app.models.habit import Habit, HabitEntry
 from app.models.user import User
-from app.services.habit_analytics_service import HabitAnalyticsService
+from app.services.habit_analytics_service import (
+    CompletionWindowIndex,
+    HabitAnalyticsService,
+)
 from app.core.security import get_password_hash
 
 
@@ -18,8 +27,8 @@ async def test_user(db_session):
     user = User(
         id=uuid4(),
         email="test@example.com",
-        hashed_password=get_password_hash("testpass123"),
-        full_name="Test User",
+        username="testuser",
+        password_hash=get_password_hash("testpass123"),
     )
     db_session.add(user)
     await db_session.commit()
@@ -68,6 +77,13 @@ async def weekly_habit(db_session, test_user):
     return habit
 
 
+async def _calculate_streak(service, habit_id, user_id):
+    """Calculate the streak with both engines and check that they agree."""
+    streak_info = await service.calculate_streak(habit_id, user_id)
+    assert await service.calculate_streak_in_db(habit_id, user_id) == streak_info
+    return streak_info
+
+
 @pytest.mark.asyncio
 class TestDailyStreakCalculation:
     """Tests for daily habit streak calculation."""
@@ -75,7 +91,7 @@ class TestDailyStreakCalculation:
     async def test_zero_streak_no_entries(self, db_session, daily_habit, test_user):
         """Test that streak is zero when there are no entries."""
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         assert streak_info.current_streak == 0
         assert streak_info.longest_streak == 0
@@ -96,7 +112,7 @@ class TestDailyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         assert streak_info.current_streak == 1
         assert streak_info.longest_streak == 1
@@ -120,7 +136,7 @@ class TestDailyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         assert streak_info.current_streak == 5
         assert streak_info.longest_streak == 5
@@ -144,7 +160,7 @@ class TestDailyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         # Current streak should be 3 (days 0, 1, 2)
         assert streak_info.current_streak == 3
@@ -166,7 +182,7 @@ class TestDailyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         assert streak_info.current_streak == 1
         assert streak_info.is_active is True  # Yesterday still counts as active
@@ -185,7 +201,7 @@ class TestDailyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, daily_habit.id, test_user.id)
 
         assert streak_info.current_streak == 1
         assert streak_info.is_active is False
@@ -209,7 +225,7 @@ class TestWeeklyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(weekly_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, weekly_habit.id, test_user.id)
 
         assert streak_info.current_streak == 1
         assert streak_info.is_active is True
@@ -233,7 +249,7 @@ class TestWeeklyStreakCalculation:
         await db_session.commit()
 
         service = HabitAnalyticsService(db_session)
-        streak_info = await service.calculate_streak(weekly_habit.id, test_user.id)
+        streak_info = await _calculate_streak(service, weekly_habit.id, test_user.id)
 
         assert streak_info.current_streak == 3
         assert streak_info.longest_streak == 3
@@ -281,6 +297,46 @@ class TestCompletionStats:
         assert stats.current_week_completions == 5
         assert stats.current_month_completions == 5
 
+    async def test_completion_stats_batch(
+        self, db_session, daily_habit, weekly_habit, test_user, query_log
+    ):
+        """Test that batch stats match per-habit stats and use one query."""
+        today = date.today()
+        for i in range(6):
+            db_session.add(
+                HabitEntry(
+                    id=uuid4(),
+                    habit_id=daily_habit.id,
+                    entry_date=today - timedelta(days=i * 5),
+                    completed=i % 3 != 0,
+                )
+            )
+        other_user = User(
+            id=uuid4(),
+            email="other@example.com",
+            username="otheruser",
+            password_hash="hashedpassword",
+        )
+        other_habit = Habit(
+            id=uuid4(), user_id=other_user.id, name="Not mine", frequency="daily"
+        )
+        db_session.add_all([other_user, other_habit])
+        await db_session.commit()
+
+        service = HabitAnalyticsService(db_session)
+        habit_ids = [daily_habit.id, weekly_habit.id, other_habit.id]
+        query_log.clear()
+        stats = await service.get_completion_stats_batch(habit_ids, test_user.id)
+
+        assert len(query_log) == 1
+        assert set(stats) == {daily_habit.id, weekly_habit.id}
+        assert stats[daily_habit.id].total_days_tracked == 6
+        assert stats[weekly_habit.id].total_days_tracked == 0
+        for habit_id, habit_stats in stats.items():
+            assert habit_stats == await service.get_completion_stats(
+                habit_id, test_user.id
+            )
+
 
 @pytest.mark.asyncio
 class TestHabitAnalytics:
@@ -345,6 +401,323 @@ class TestHabitAnalytics:
         assert confidence_good > confidence_empty
 
 
+@pytest.mark.asyncio
+class TestUserInsights:
+    """Tests for insights across all of a user's habits."""
+
+    @pytest.mark.parametrize("habit_count", [3, 12])
+    async def test_insights_use_constant_queries(
+        self, db_session, test_user, query_log, habit_count
+    ):
+        """Test that insights match per-habit analytics with a fixed query count."""
+        today = date.today()
+        rng = random.Random(habit_count)
+        for i in range(habit_count):
+            habit = Habit(
+                id=uuid4(),
+                user_id=test_user.id,
+                name=f"Habit {i}",
+                frequency=["daily", "weekly", "custom"][i % 3],
+            )
+            db_session.add(habit)
+            for offset in range(0, 60, rng.randint(1, 4)):
+                db_session.add(
+                    HabitEntry(
+                        id=uuid4(),
+                        habit_id=habit.id,
+                        entry_date=today - timedelta(days=offset),
+                        completed=rng.random() > 0.3,
+                    )
+                )
+        await db_session.commit()
+
+        service = HabitAnalyticsService(db_session)
+        query_log.clear()
+        insights = await service.get_user_insights(test_user.id)
+
+        assert len(query_log) == 2
+
+        habits = (
+            await db_session.execute(select(Habit).order_by(Habit.name))
+        ).scalars()
+        per_habit = [
+            await service.get_habit_analytics(habit.id, test_user.id)
+            for habit in habits
+        ]
+        assert insights.total_active_streaks == sum(
+            a.streak_info.is_active for a in per_habit
+        )
+        assert insights.overall_completion_rate == round(
+            sum(a.completion_stats.completion_rate for a in per_habit) / len(per_habit),
+            2,
+        )
+        assert insights.average_streak_length == round(
+            sum(a.streak_info.current_streak for a in per_habit) / len(per_habit), 1
+        )
+
+
+@pytest.mark.asyncio
+class TestProgressTrends:
+    """Tests for progress trends."""
+
+    @pytest.mark.parametrize("days", [7, 30, 90, 365])
+    async def test_numpy_engine_matches_python(
+        self, db_session, daily_habit, weekly_habit, test_user, days
+    ):
+        """Test that the NumPy trends engine gives the same trends."""
+        pytest.importorskip("numpy")
+        today = date.today()
+        rng = random.Random(days)
+        # Include entries after today, which only count towards summaries
+        for offset in range(-5, days + 20):
+            if rng.random() < 0.6:
+                db_session.add(
+                    HabitEntry(
+                        id=uuid4(),
+                        habit_id=weekly_habit.id,
+                        entry_date=today - timedelta(days=offset),
+                        completed=rng.random() < 0.7,
+                        mood=rng.choice([None, "good", "okay"]),
+                    )
+                )
+        await db_session.commit()
+
+        service = HabitAnalyticsService(db_session)
+        for habit in (daily_habit, weekly_habit):
+            python_trends = await service.get_progress_trends(
+                habit.id, test_user.id, days
+            )
+            numpy_trends = await service.get_progress_trends(
+                habit.id, test_user.id, days, engine="numpy"
+            )
+            assert numpy_trends == python_trends
+
+    async def test_summaries_come_from_period_rollups(
+        self, db_session, daily_habit, test_user, query_log
+    ):
+        """Test that multi-year summaries count whole weeks and months."""
+        today = date.today()
+        days = 1000
+        start_date = today - timedelta(days=days)
+        rng = random.Random(1)
+        completed_dates = []
+        # Start before the range so the first week and month are partial
+        for offset in range(days + 40):
+            day = today - timedelta(days=offset)
+            completed = rng.random() < 0.5
+            db_session.add(
+                HabitEntry(
+                    id=uuid4(),
+                    habit_id=daily_habit.id,
+                    entry_date=day,
+                    completed=completed,
+                )
+            )
+            if completed:
+                completed_dates.append(day)
+        await db_session.commit()
+
+        query_log.clear()
+        trends = await HabitAnalyticsService(db_session).get_progress_trends(
+            daily_habit.id, test_user.id, days
+        )
+
+        first_week = start_date - timedelta(days=start_date.weekday())
+        weeks = {}
+        months = {}
+        for day in completed_dates:
+            week_start = day - timedelta(days=day.weekday())
+            if week_start >= first_week:
+                weeks[week_start] = weeks.get(week_start, 0) + 1
+            month = (day.year, day.month)
+            if day >= start_date.replace(day=1):
+                months[month] = months.get(month, 0) + 1
+        assert {w.week_start: w.completions for w in trends.weekly_summaries} == weeks
+        assert {
+            (m.year, m.month): m.completions for m in trends.monthly_summaries
+        } == months
+        assert len(trends.daily_data) == days + 1
+        assert any("FROM habit_period_stats" in q for q in query_log)
+
+        # Rolling windows reach back before the range
+        completed_set = set(completed_dates)
+        for rolling in trends.rolling_rates:
+            window = rolling.window_days
+            expected = [
+                round(
+                    sum(
+                        point.date - timedelta(days=back) in completed_set
+                        for back in range(window)
+                    )
+                    / window
+                    * 100,
+                    2,
+                )
+                for point in trends.daily_data
+            ]
+            assert rolling.rates == expected
+        assert [r.window_days for r in trends.rolling_rates] == [7, 30]
+
+
+@pytest.mark.asyncio
+class TestHeatmap:
+    """Tests for the multi-habit completion heatmap."""
+
+    async def test_heatmap_bits_match_entries(
+        self, db_session, daily_habit, weekly_habit, test_user, query_log
+    ):
+        """Test that each habit's bitset marks exactly its completed days."""
+        start_date, end_date = date(2023, 11, 15), date(2025, 2, 10)
+        rng = random.Random(17)
+        completed = set()
+        # Reach past both ends of the range, across two year boundaries
+        day = start_date - timedelta(days=40)
+        while day <= end_date + timedelta(days=40):
+            if rng.random() < 0.5:
+                is_completed = rng.random() < 0.8
+                db_session.add(
+                    HabitEntry(
+                        id=uuid4(),
+                        habit_id=daily_habit.id,
+                        entry_date=day,
+                        completed=is_completed,
+                    )
+                )
+                if is_completed and start_date <= day <= end_date:
+                    completed.add(day)
+            day += timedelta(days=1)
+        # Only completed outside the range
+        db_session.add(
+            HabitEntry(
+                id=uuid4(),
+                habit_id=weekly_habit.id,
+                entry_date=end_date + timedelta(days=1),
+                completed=True,
+            )
+        )
+        await db_session.commit()
+
+        service = HabitAnalyticsService(db_session)
+        query_log.clear()
+        heatmap = await service.get_heatmap(test_user.id, start_date, end_date)
+
+        assert len(query_log) == 1
+        length = (end_date - start_date).days + 1
+        series = {habit.habit_id: habit for habit in heatmap.habits}
+        assert set(series) == {daily_habit.id, weekly_habit.id}
+        for habit_id, expected in [
+            (daily_habit.id, completed),
+            (weekly_habit.id, set()),
+        ]:
+            raw = base64.b64decode(series[habit_id].bitmap)
+            assert len(raw) == (length + 7) // 8
+            days = {
+                start_date + timedelta(days=i)
+                for i in range(len(raw) * 8)
+                if raw[i // 8] >> (7 - i % 8) & 1
+            }
+            assert days == expected
+            assert series[habit_id].completions == len(expected)
+
+    async def test_heatmap_rejects_invalid_range(self, db_session, test_user):
+        """Test that reversed or overly long ranges are rejected."""
+        service = HabitAnalyticsService(db_session)
+        today = date.today()
+
+        for start_date, end_date in [
+            (today, today - timedelta(days=1)),
+            (today - timedelta(days=5000), today),
+        ]:
+            with pytest.raises(HTTPException) as exc_info:
+                await service.get_heatmap(test_user.id, start_date, end_date)
+            assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestCompletionWindows:
+    """Tests for completion counts over windows of days."""
+
+    async def test_windows_match_entry_counts(
+        self, db_session, daily_habit, test_user, query_log
+    ):
+        """Test that windows count the completed entries and reuse the index."""
+        today = date.today()
+        rng = random.Random(23)
+        completed = set()
+        for offset in range(-3, 500):
+            if rng.random() < 0.6:
+                day = today - timedelta(days=offset)
+                is_completed = rng.random() < 0.7
+                db_session.add(
+                    HabitEntry(
+                        id=uuid4(),
+                        habit_id=daily_habit.id,
+                        entry_date=day,
+                        completed=is_completed,
+                    )
+                )
+                if is_completed:
+                    completed.add(day)
+        await db_session.commit()
+
+        service = HabitAnalyticsService(
+            db_session, cache=AnalyticsCache(ttl_seconds=60, max_entries=10)
+        )
+        custom = (today - timedelta(days=600), today - timedelta(days=45))
+        result = await service.get_completion_windows(
+            daily_habit.id, test_user.id, [1, 7, 30, 365], *custom
+        )
+
+        expected_ranges = [
+            (today - timedelta(days=days - 1), today) for days in (1, 7, 30, 365)
+        ] + [custom]
+        assert [(w.start_date, w.end_date) for w in result.windows] == expected_ranges
+        for window in result.windows:
+            expected = sum(
+                window.start_date <= day <= window.end_date for day in completed
+            )
+            assert window.completions == expected
+            assert window.days == (window.end_date - window.start_date).days + 1
+            assert window.completion_rate == round(expected / window.days * 100, 2)
+
+        # Later windows and trends are answered from the cached index
+        query_log.clear()
+        await service.get_completion_windows(daily_habit.id, test_user.id, [90])
+        assert query_log == []
+
+    async def test_window_index_bounds(self):
+        """Test window counts at and beyond the ends of the index."""
+        today = date(2024, 3, 10)
+        index = CompletionWindowIndex(
+            [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 12)], today
+        )
+        assert index.end_date == date(2024, 3, 12)
+        assert index.count(date(2024, 1, 1), date(2024, 2, 28)) == 1
+        assert index.count(date(2024, 2, 29), date(2024, 2, 29)) == 1
+        assert index.count(date(2024, 3, 1), date(2025, 1, 1)) == 1
+        assert index.count(date(2024, 3, 2), date(2024, 3, 1)) == 0
+        assert CompletionWindowIndex([], today).count(today, today) == 0
+
+    async def test_windows_reject_invalid_requests(
+        self, db_session, daily_habit, test_user
+    ):
+        """Test that bad window lengths and reversed ranges are rejected."""
+        service = HabitAnalyticsService(db_session)
+        today = date.today()
+
+        for window_days, custom in [
+            ([0], ()),
+            ([5000], ()),
+            (list(range(1, 30)), ()),
+            ([7], (today, today - timedelta(days=1))),
+        ]:
+            with pytest.raises(HTTPException) as exc_info:
+                await service.get_completion_windows(
+                    daily_habit.id, test_user.id, window_days, *custom
+                )
+            assert exc_info.value.status_code == 400
+
+
 @pytest.mark.asyncio
 class TestStreakRecovery:
     """Tests for streak recovery functionality."""
@@ -373,6 +746,46 @@ class TestStreakRecovery:
         assert recovery_info.can_recover is True
         assert recovery_info.days_since_last_completion == 1
 
+    async def test_active_streak_with_a_gap_is_recoverable(
+        self, db_session, daily_habit, test_user
+    ):
+        """Test that an active streak reports its gap until completed today."""
+        today = date.today()
+        for offset in (1, 2):
+            db_session.add(
+                HabitEntry(
+                    id=uuid4(),
+                    habit_id=daily_habit.id,
+                    entry_date=today - timedelta(days=offset),
+                    completed=True,
+                )
+            )
+        await db_session.commit()
+
+        service = HabitAnalyticsService(db_session)
+        streak_info = await service.calculate_streak(daily_habit.id, test_user.id)
+        assert streak_info.is_active
+        recovery_info = await service.check_streak_recovery(
+            daily_habit.id, test_user.id, grace_days=1
+        )
+        assert recovery_info.can_recover is True
+        assert recovery_info.days_since_last_completion == 1
+        assert recovery_info.recovery_deadline == today + timedelta(days=1)
+
+        # Nothing to recover once today is completed
+        db_session.add(
+            HabitEntry(
+                id=uuid4(), habit_id=daily_habit.id, entry_date=today, completed=True
+            )
+        )
+        await db_session.commit()
+        recovery_info = await service.check_streak_recovery(
+            daily_habit.id, test_user.id, grace_days=1
+        )
+        assert recovery_info.can_recover is False
+        assert recovery_info.days_since_last_completion == 0
+        assert recovery_info.recovery_deadline is None
+
     async def test_cannot_recover_outside_grace_period(
         self, db_session, daily_habit, test_user
     ):
@@ -396,3 +809,32 @@ class TestStreakRecovery:
 
         assert recovery_info.can_recover is False
         assert recovery_info.days_since_last_completion == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frequency", ["daily", "weekly", "custom"])
+async def test_database_streak_engine_matches_python(db_session, test_user, frequency):
+    """Test that the SQL streak engine agrees on irregular histories."""
+    rng = random.Random(frequency)
+    today = date.today()
+    service = HabitAnalyticsService(db_session)
+
+    for run in range(5):
+        habit = Habit(
+            id=uuid4(), user_id=test_user.id, name=f"Habit {run}", frequency=frequency
+        )
+        db_session.add(habit)
+        # Clustered dates, reaching back before 2000 for the older runs
+        offsets = {rng.randint(0, 40 * (run + 1) ** 4) for _ in range(60)}
+        for offset in offsets:
+            db_session.add(
+                HabitEntry(
+                    id=uuid4(),
+                    habit_id=habit.id,
+                    entry_date=today - timedelta(days=offset),
+                    completed=rng.random() > 0.2,
+                )
+            )
+        await db_session.flush()
+
+        await _calculate_streak(service, habit.id, test_user.id)
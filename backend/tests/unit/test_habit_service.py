@@ -0,0 +1,213 @@
+"""
+Unit tests for the habit service streak maintenance and analytics caching.
+"""
+
+import asyncio
+import random
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import AnalyticsCache, analytics_cache
+from app.models.habit import Habit
+from app.models.user import User
+from app.schemas.habit import HabitEntryCreate, HabitUpdate
+from app.services.habit_analytics_service import HabitAnalyticsService
+from app.services.module_services import HabitService
+
+
+async def _create_habit(db_session: AsyncSession, frequency: str) -> Habit:
+    user = User(
+        email=f"{frequency}@example.com",
+        username=f"{frequency}user",
+        password_hash="hashedpassword",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    habit = Habit(user_id=user.id, name="Read", frequency=frequency)
+    db_session.add(habit)
+    await db_session.flush()
+    return habit
+
+
+async def _assert_matches_full_recompute(
+    db_session: AsyncSession, habit: Habit, completions: int
+) -> None:
+    streak_info = await HabitAnalyticsService(db_session).calculate_streak(
+        habit.id, habit.user_id
+    )
+    assert habit.current_streak == streak_info.current_streak
+    assert habit.longest_streak == streak_info.longest_streak
+    assert habit.streak_start_date == streak_info.streak_start_date
+    assert habit.last_completed_date == streak_info.last_completed_date
+    assert habit.total_completions == completions
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frequency", ["daily", "weekly", "custom"])
+async def test_incremental_streak_matches_recompute(
+    db_session: AsyncSession, frequency: str
+):
+    """Test that stored streaks agree with a full recompute after every entry."""
+    habit = await _create_habit(db_session, frequency)
+    service = HabitService(db_session)
+
+    today = date.today()
+    step = {"daily": 1, "weekly": 3, "custom": 11}[frequency]
+    days = [today - timedelta(days=i * step) for i in range(40)]
+    # Drop some periods so that there are several runs
+    days = [day for i, day in enumerate(days) if i % 7 not in (2, 5)]
+    rng = random.Random(7)
+    # Mostly chronological with a few late back-fills
+    ordered = sorted(days)
+    backfills = rng.sample(ordered, 6)
+    ordered = [day for day in ordered if day not in backfills] + backfills
+
+    completions = 0
+    for day in ordered:
+        completed = rng.random() > 0.1
+        await service.create_entry(
+            habit.id,
+            habit.user_id,
+            HabitEntryCreate(entry_date=day, completed=completed),
+        )
+        completions += completed
+        await _assert_matches_full_recompute(db_session, habit, completions)
+
+    # A new frequency changes the periods, so the streak is recomputed
+    new_frequency = "weekly" if frequency == "daily" else "daily"
+    await service.update_habit(
+        habit.id, habit.user_id, HabitUpdate(frequency=new_frequency)
+    )
+    await _assert_matches_full_recompute(db_session, habit, completions)
+
+
+@pytest.mark.asyncio
+async def test_in_order_completion_does_not_reload_history(
+    db_session: AsyncSession, query_log
+):
+    """Test that a check-in after the last completion skips the recompute."""
+    habit = await _create_habit(db_session, "daily")
+    service = HabitService(db_session)
+    today = date.today()
+
+    for i in range(5, 0, -1):
+        await service.create_entry(
+            habit.id,
+            habit.user_id,
+            HabitEntryCreate(entry_date=today - timedelta(days=i), completed=True),
+        )
+    query_log.clear()
+    await service.create_entry(
+        habit.id, habit.user_id, HabitEntryCreate(entry_date=today, completed=True)
+    )
+
+    assert habit.current_streak == 6
+    assert habit.streak_start_date == today - timedelta(days=5)
+    assert not any("ORDER BY habit_entries.entry_date" in q for q in query_log)
+    assert sum(q.startswith("UPDATE habits") for q in query_log) == 1
+
+
+@pytest.mark.asyncio
+async def test_habit_writes_invalidate_cached_analytics(
+    db_session: AsyncSession, query_log
+):
+    """Test that cached analytics are reused until a committed habit write."""
+    habit = await _create_habit(db_session, "daily")
+    await db_session.commit()
+    # Rollbacks expire the habit, so keep its keys
+    habit_id, user_id = habit.id, habit.user_id
+    analytics_cache.clear()
+    analytics = HabitAnalyticsService(db_session, cache=analytics_cache)
+    service = HabitService(db_session)
+
+    first = await analytics.get_habit_analytics(habit_id, user_id)
+    await analytics.get_user_insights(user_id)
+    query_log.clear()
+    assert await analytics.get_habit_analytics(habit_id, user_id) is first
+    await analytics.get_user_insights(user_id)
+    assert query_log == []
+    assert analytics_cache.stats()["hits"] == 2
+
+    # Uncommitted writes leave the cache alone
+    await service.update_habit(habit_id, user_id, HabitUpdate(name="Write"))
+    await db_session.rollback()
+    assert await analytics.get_habit_analytics(habit_id, user_id) is first
+
+    await service.create_entry(
+        habit_id,
+        user_id,
+        HabitEntryCreate(entry_date=date.today(), completed=True),
+    )
+    updated = await analytics.get_habit_analytics(habit_id, user_id)
+    insights = await analytics.get_user_insights(user_id)
+
+    assert updated.completion_stats.total_completions == 1
+    assert insights.total_active_streaks == 1
+    assert analytics_cache.stats()["invalidations"] == 1
+    assert analytics_cache.stats()["misses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_skips_results_raced_by_writes():
+    """Test that a result computed across an invalidation is not stored."""
+    cache = AnalyticsCache(ttl_seconds=60, max_entries=2)
+    user_id, habit_id = uuid4(), uuid4()
+
+    async def compute_during_write():
+        cache.invalidate(user_id, habit_id)
+        return "stale"
+
+    assert await cache.get_or_compute(user_id, habit_id, "a", compute_during_write)
+    assert cache.stats()["size"] == 0
+
+    async def compute():
+        return "fresh"
+
+    for habit in (habit_id, uuid4(), uuid4()):
+        await cache.get_or_compute(user_id, habit, "a", compute)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_skips_reads_within_replica_lag():
+    """Test that results read soon after a write are not cached."""
+    cache = AnalyticsCache(ttl_seconds=60, max_entries=10, replica_lag_seconds=0.2)
+    user_id, habit_id = uuid4(), uuid4()
+
+    async def compute():
+        return "result"
+
+    cache.invalidate(user_id, habit_id)
+    # Another habit of the same user was not written
+    for habit in (habit_id, None, uuid4()):
+        await cache.get_or_compute(user_id, habit, "a", compute)
+    assert cache.stats()["size"] == 1
+
+    await asyncio.sleep(0.25)
+    for habit in (habit_id, None):
+        await cache.get_or_compute(user_id, habit, "a", compute)
+    assert cache.stats()["size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_logs_stats(caplog):
+    """Test that the cache counters are logged at most once per interval."""
+    cache = AnalyticsCache(ttl_seconds=60, max_entries=10, stats_interval=0.1)
+
+    async def compute():
+        return "result"
+
+    with caplog.at_level("INFO", logger="app.core.cache"):
+        await cache.get_or_compute(uuid4(), None, "a", compute)
+        await asyncio.sleep(0.15)
+        for _ in range(3):
+            await cache.get_or_compute(uuid4(), None, "a", compute)
+    assert [r.getMessage() for r in caplog.records] == [
+        "Analytics cache stats: "
+        "{'hits': 0, 'misses': 1, 'hit_rate': 0.0, 'invalidations': 0, "
+        "'evictions': 0, 'size': 1}"
+    ]
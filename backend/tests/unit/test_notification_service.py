@@ -6,16 +6,25 @@ from datetime import datetime, timedelta, date
 from decimal import Decimal
 
 import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.goal import Goal
+from app.models.notification import Notification, NotificationUnreadCount
 from app.models.user import User
+from app.repositories.notification_repository import (
+    NotificationRepository,
+    NotificationUnreadCountRepository,
+)
 from app.schemas.notification import (
     NotificationCreate,
     NotificationSettingsCreate,
     NotificationSettingsUpdate,
+    NotificationUpdate,
 )
 from app.services.notification_service import NotificationService
+from tests.conftest import TestSessionLocal
 
 
 @pytest.mark.asyncio
@@ -139,6 +148,16 @@ async def test_create_goal_reminder(db_session: AsyncSession):
     assert notification.notification_type == "reminder"
     assert "Test Goal" in notification.title
 
+    # New reminder settings replace the pending reminder
+    goal.reminder_time = "18:30"
+    replacement = await service.create_goal_reminder(goal, user.id)
+    assert replacement.scheduled_time.hour == 18
+    assert notification.status == "cancelled"
+
+    goal.reminder_enabled = False
+    assert await service.create_goal_reminder(goal, user.id) is None
+    assert replacement.status == "cancelled"
+
 
 @pytest.mark.asyncio
 async def test_create_goal_reminder_disabled(db_session: AsyncSession):
@@ -209,6 +228,212 @@ async def test_get_pending_notifications(db_session: AsyncSession):
     assert pending[0].title == "Past Notification"
 
 
+@pytest.mark.asyncio
+async def test_process_pending_notifications_claims_due_batch(
+    db_session: AsyncSession, query_log
+):
+    """Test that due notifications are claimed and announced in one statement each."""
+    user = User(
+        email="dispatch@example.com",
+        username="dispatchuser",
+        password_hash="hashedpassword",
+    )
+    db_session.add(user)
+    await db_session.flush()
+
+    service = NotificationService(db_session)
+    now = datetime.utcnow()
+    due = [
+        await service.create_notification(
+            user.id,
+            NotificationCreate(
+                title=f"Due {i}",
+                notification_type="reminder",
+                scheduled_time=now - timedelta(minutes=i + 1),
+            ),
+        )
+        for i in range(5)
+    ]
+    future = await service.create_notification(
+        user.id,
+        NotificationCreate(
+            title="Future",
+            notification_type="reminder",
+            scheduled_time=now + timedelta(hours=1),
+        ),
+    )
+
+    query_log.clear()
+    assert await service.process_pending_notifications(batch_size=3) == 3
+    assert len(query_log) == 2
+    assert "pg_notify" in query_log[1]
+    assert await service.process_pending_notifications(batch_size=3) == 2
+    query_log.clear()
+    assert await service.process_pending_notifications(batch_size=3) == 0
+    assert len(query_log) == 1
+
+    # Copies already in the session see the claim
+    assert all(n.status == "sent" and n.sent_at is not None for n in due)
+    assert future.status == "pending"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_claim_disjoint_batches(
+    db_session_no_rollback: AsyncSession,
+):
+    """Test that workers skip rows locked by another worker's claim."""
+    user = User(
+        email="workers@example.com",
+        username="workersuser",
+        password_hash="hashedpassword",
+    )
+    db_session_no_rollback.add(user)
+    await db_session_no_rollback.flush()
+    repository = NotificationRepository(db_session_no_rollback)
+    await repository.bulk_create(
+        [
+            {
+                "user_id": user.id,
+                "title": f"Due {i}",
+                "notification_type": "reminder",
+                "scheduled_time": datetime.utcnow() - timedelta(minutes=i),
+            }
+            for i in range(10)
+        ]
+    )
+    await db_session_no_rollback.commit()
+
+    async with TestSessionLocal() as first, TestSessionLocal() as second:
+        now = datetime.utcnow()
+        # The first claim holds its row locks until it commits
+        first_batch = await NotificationRepository(first).claim_pending_notifications(
+            now, 4
+        )
+        second_batch = await NotificationRepository(
+            second
+        ).claim_pending_notifications(now, 100)
+        await first.commit()
+        await second.commit()
+
+    first_ids = {n.id for n in first_batch}
+    second_ids = {n.id for n in second_batch}
+    assert len(first_ids) == 4
+    assert len(second_ids) == 6
+    assert not first_ids & second_ids
+
+
+@pytest.mark.asyncio
+async def test_unread_count_follows_writes(
+    db_session_no_rollback: AsyncSession, query_log
+):
+    """Test that the unread counter tracks every write and is cached between them."""
+    user = User(
+        email="unread@example.com",
+        username="unreaduser",
+        password_hash="hashedpassword",
+    )
+    db_session_no_rollback.add(user)
+    await db_session_no_rollback.flush()
+    user_id = user.id
+    service = NotificationService(db_session_no_rollback)
+
+    async def create(title: str):
+        notification = await service.create_notification(
+            user_id,
+            NotificationCreate(
+                title=title,
+                notification_type="system",
+                scheduled_time=datetime.utcnow(),
+            ),
+        )
+        return notification.id
+
+    assert await service.get_unread_count(user_id) == 0
+    first, second, third = [await create(f"Unread {i}") for i in range(3)]
+    await db_session_no_rollback.commit()
+
+    # Committing evicts the count, since a concurrent commit may already have
+    # made the one seen inside the transaction stale; the next read loads it
+    query_log.clear()
+    assert await service.get_unread_count(user_id) == 3
+    assert len(query_log) == 1
+    assert await service.get_unread_count(user_id) == 3
+    assert len(query_log) == 1
+
+    await service.mark_as_read(first, user_id)
+    for is_read in (True, False):
+        await service.update_notification(
+            second, user_id, NotificationUpdate(is_read=is_read)
+        )
+    await service.delete_notification(third, user_id)
+    await db_session_no_rollback.commit()
+    assert await service.get_unread_count(user_id) == 1
+
+    # Rolled back writes leave the cached count alone
+    await create("Rolled back")
+    await db_session_no_rollback.rollback()
+    assert await service.get_unread_count(user_id) == 1
+    assert await service.repository.count_user_notifications(user_id, False) == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drifted_unread_counts(
+    db_session_no_rollback: AsyncSession,
+):
+    """Test that reconciling resets counters that no longer match the rows."""
+    users = [
+        User(
+            email=f"drift{i}@example.com",
+            username=f"driftuser{i}",
+            password_hash="hashedpassword",
+        )
+        for i in range(3)
+    ]
+    db_session_no_rollback.add_all(users)
+    await db_session_no_rollback.flush()
+    user_ids = [user.id for user in users]
+    await NotificationRepository(db_session_no_rollback).bulk_create(
+        [
+            {
+                "user_id": user_ids[0],
+                "title": f"Unread {i}",
+                "notification_type": "system",
+                "scheduled_time": datetime.utcnow(),
+                "is_read": i == 0,
+            }
+            for i in range(3)
+        ]
+    )
+    # Drift the first user's counter; the others have no notifications
+    await db_session_no_rollback.execute(
+        update(NotificationUnreadCount)
+        .where(NotificationUnreadCount.user_id == user_ids[0])
+        .values(unread_count=7)
+    )
+    await db_session_no_rollback.commit()
+
+    repository = NotificationUnreadCountRepository(db_session_no_rollback)
+    assert await repository.reconcile(user_ids) == [user_ids[0]]
+    await db_session_no_rollback.commit()
+    assert [await repository.get_count(user_id) for user_id in user_ids] == [2, 0, 0]
+    assert await repository.reconcile(user_ids) == []
+
+    # A counter that drifted low stops at zero instead of going negative
+    await db_session_no_rollback.execute(
+        update(NotificationUnreadCount)
+        .where(NotificationUnreadCount.user_id == user_ids[0])
+        .values(unread_count=0)
+    )
+    await db_session_no_rollback.execute(
+        update(Notification)
+        .where(Notification.user_id == user_ids[0])
+        .values(is_read=True)
+    )
+    await db_session_no_rollback.commit()
+    assert await repository.get_count(user_ids[0]) == 0
+    assert await repository.reconcile(user_ids) == []
+
+
 @pytest.mark.asyncio
 async def test_notification_settings_crud(db_session: AsyncSession):
     """Test CRUD operations on notification settings."""
@@ -288,3 +513,37 @@ async def test_filter_notifications_by_read_status(db_session: AsyncSession):
     # Get all notifications
     all_notifs, all_total = await service.get_user_notifications(user.id)
     assert all_total == 5
+
+
+@pytest.mark.asyncio
+async def test_other_users_notification_not_found(db_session: AsyncSession):
+    """Test that another user's notification is reported as not found."""
+    owner = User(
+        email="owner@example.com",
+        username="owneruser",
+        password_hash="hashedpassword",
+    )
+    intruder = User(
+        email="intruder@example.com",
+        username="intruderuser",
+        password_hash="hashedpassword",
+    )
+    db_session.add_all([owner, intruder])
+    await db_session.flush()
+
+    service = NotificationService(db_session)
+    notification = await service.create_notification(
+        owner.id,
+        NotificationCreate(
+            title="Private",
+            notification_type="reminder",
+            scheduled_time=datetime.utcnow(),
+        ),
+    )
+
+    for call in (service.get_notification, service.mark_as_read):
+        with pytest.raises(HTTPException) as exc_info:
+            await call(notification.id, intruder.id)
+        assert exc_info.value.status_code == 404
+
+    assert notification.is_read is False
@@ -0,0 +1,159 @@
+"""
+Unit tests for the notification stream.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.notification_stream import (
+    NotificationBroker,
+    notification_broker,
+    notification_relay,
+)
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.notification import NotificationCreate
+from app.services.notification_service import NotificationService
+from app.workers.notifications import NotificationWorker
+from tests.conftest import TestSessionLocal, test_engine
+
+
+def _parse(message: str) -> tuple:
+    name, data = message.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+async def _create_user(db_session: AsyncSession, name: str) -> User:
+    user = User(
+        email=f"{name}@example.com",
+        username=name,
+        password_hash="hashedpassword",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_committed_notifications(
+    db_session_no_rollback: AsyncSession, query_log
+):
+    """Test that created and sent notifications reach only the owner's streams."""
+    await notification_relay.start(test_engine)
+    user = await _create_user(db_session_no_rollback, "streamuser")
+    other = await _create_user(db_session_no_rollback, "otherstreamuser")
+    user_id, other_id = user.id, other.id
+    await db_session_no_rollback.commit()
+    service = NotificationService(db_session_no_rollback)
+
+    async def initial():
+        return [("unread_count", {"count": 0})]
+
+    stream = notification_broker.stream(user_id, initial)
+    other_stream = notification_broker.stream(other_id, initial)
+    assert _parse(await stream.__anext__()) == ("unread_count", {"count": 0})
+    await other_stream.__anext__()
+    assert notification_broker.has_streams(user_id)
+
+    def create(title: str, message: str = None):
+        return service.create_notification(
+            user_id,
+            NotificationCreate(
+                title=title,
+                message=message,
+                notification_type="reminder",
+                scheduled_time=datetime.utcnow() - timedelta(seconds=1),
+            ),
+        )
+
+    # Nothing is pushed for a rolled back change
+    await create("Rolled back")
+    await db_session_no_rollback.rollback()
+    created = await create("Due")
+    await create("Failing")
+    await db_session_no_rollback.commit()
+
+    name, data = _parse(await asyncio.wait_for(stream.__anext__(), 1))
+    assert (name, data["action"]) == ("notification", "created")
+    assert data["notification"]["id"] == str(created.id)
+    assert data["notification"]["status"] == "pending"
+    event = _parse(await asyncio.wait_for(stream.__anext__(), 1))
+    assert event == ("unread_count", {"count": 1})
+    name, data = _parse(await asyncio.wait_for(stream.__anext__(), 1))
+    assert data["notification"]["title"] == "Failing"
+    event = _parse(await asyncio.wait_for(stream.__anext__(), 1))
+    assert event == ("unread_count", {"count": 2})
+
+    # Workers run in other processes, so deliveries come back through
+    # Postgres, once delivery has been attempted
+    released = asyncio.Event()
+
+    async def deliver(notification: Notification) -> None:
+        await released.wait()
+        if notification.title == "Failing":
+            raise RuntimeError("delivery failed")
+
+    worker = NotificationWorker(deliver=deliver, session_factory=TestSessionLocal)
+    delivering = asyncio.ensure_future(worker.run_once())
+    next_event = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0.2)
+    assert not next_event.done()
+    released.set()
+    assert await delivering == 2
+    outcomes = {}
+    for event in (await next_event, await asyncio.wait_for(stream.__anext__(), 1)):
+        name, data = _parse(event)
+        assert data["notification"]["status"] == data["action"]
+        outcomes[data["notification"]["title"]] = data["action"]
+    assert outcomes == {"Due": "sent", "Failing": "failed"}
+
+    # One too large for a NOTIFY payload asks the client to refetch
+    await create("Long", message="x" * 8000)
+    await db_session_no_rollback.commit()
+    name, data = _parse(await asyncio.wait_for(stream.__anext__(), 1))
+    assert (name, data["notification"]["title"]) == ("notification", "Long")
+    await asyncio.wait_for(stream.__anext__(), 1)
+    assert await service.process_pending_notifications() == 1
+    await db_session_no_rollback.commit()
+    assert _parse(await asyncio.wait_for(stream.__anext__(), 1)) == ("resync", {})
+
+    # Waiting streams do not query the database
+    query_log.clear()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(other_stream.__anext__(), 0.2)
+    assert query_log == []
+
+    await stream.aclose()
+    await other_stream.aclose()
+    assert not notification_broker.has_streams(user_id)
+    await notification_relay.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_resyncs_and_idle_stream_heartbeats():
+    """Test that a full queue collapses into a resync and idle streams heartbeat."""
+    broker = NotificationBroker(queue_size=3, heartbeat_seconds=0.05)
+
+    async def initial():
+        return []
+
+    stream = broker.stream("user", initial)
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    broker.publish("user", "notification", {"n": 0})
+    assert _parse(await first) == ("notification", {"n": 0})
+
+    for n in range(1, 6):
+        broker.publish("user", "notification", {"n": n})
+    broker.publish("other", "notification", {"n": 99})
+    assert _parse(await stream.__anext__()) == ("resync", {})
+    assert _parse(await stream.__anext__()) == ("notification", {"n": 5})
+
+    assert await stream.__anext__() == ": keep-alive\n\n"
+    assert broker.stream_count == 1
+    await stream.aclose()
+    assert broker.stream_count == 0
@@ -0,0 +1,172 @@
+"""
+Unit tests for the notification worker.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import Notification
+from app.models.user import User
+from app.repositories.notification_repository import NotificationRepository
+from app.schemas.notification import NotificationCreate, NotificationUpdate
+from app.services.notification_service import NotificationService
+from app.workers.notifications import NotificationWorker, ScheduledNotificationWorker
+from tests.conftest import TestSessionLocal, test_engine
+
+
+async def _create_due_notifications(db_session: AsyncSession, count: int) -> None:
+    user = User(
+        email="worker@example.com",
+        username="workeruser",
+        password_hash="hashedpassword",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    now = datetime.utcnow()
+    await NotificationRepository(db_session).bulk_create(
+        [
+            {
+                "user_id": user.id,
+                "title": f"Due {i}",
+                "notification_type": "reminder",
+                "scheduled_time": now - timedelta(seconds=10 + i),
+            }
+            for i in range(count)
+        ]
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_with_bounded_concurrency(
+    db_session_no_rollback: AsyncSession,
+):
+    """Test that a batch is delivered concurrently and failures are recorded."""
+    await _create_due_notifications(db_session_no_rollback, 7)
+    in_flight = 0
+    peak = 0
+
+    async def deliver(notification: Notification) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if notification.title == "Due 3":
+            raise RuntimeError("delivery failed")
+
+    worker = NotificationWorker(
+        batch_size=5,
+        concurrency=2,
+        deliver=deliver,
+        session_factory=TestSessionLocal,
+    )
+    assert await worker.run_once() == 5
+    assert await worker.run_once() == 2
+    assert await worker.run_once() == 0
+
+    assert peak == 2
+    stats = worker.stats.as_dict()
+    assert (stats["claimed"], stats["sent"], stats["failed"]) == (7, 6, 1)
+    assert stats["max_lag_seconds"] >= 16
+    assert 10 <= stats["avg_lag_seconds"] <= stats["max_lag_seconds"]
+
+    statuses = dict(
+        (
+            await db_session_no_rollback.execute(
+                select(Notification.title, Notification.status)
+            )
+        ).all()
+    )
+    assert statuses.pop("Due 3") == "failed"
+    assert set(statuses.values()) == {"sent"}
+
+
+@pytest.mark.asyncio
+async def test_worker_backs_off_when_idle_and_stops(
+    db_session_no_rollback: AsyncSession, query_log
+):
+    """Test that an idle worker polls less and less often and exits on stop."""
+    worker = NotificationWorker(
+        poll_interval=0.01,
+        max_poll_interval=0.08,
+        session_factory=TestSessionLocal,
+    )
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0.5)
+    worker.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    polls = sum(q.startswith("UPDATE notifications") for q in query_log)
+    # Without back-off this would be close to 50 polls
+    assert 3 <= polls <= 12
+
+
+@pytest.mark.asyncio
+async def test_scheduled_worker_fires_on_time_and_follows_changes(
+    db_session_no_rollback: AsyncSession,
+):
+    """Test that preloaded and announced notifications fire at their time."""
+    user = User(
+        email="wheel@example.com",
+        username="wheeluser",
+        password_hash="hashedpassword",
+    )
+    db_session_no_rollback.add(user)
+    await db_session_no_rollback.flush()
+    service = NotificationService(db_session_no_rollback)
+
+    async def create(title: str, delay: float) -> Notification:
+        return await service.create_notification(
+            user.id,
+            NotificationCreate(
+                title=title,
+                notification_type="reminder",
+                scheduled_time=datetime.utcnow() + timedelta(seconds=delay),
+            ),
+        )
+
+    await create("Preloaded", 1.0)
+    await create("Later", 3600)
+    await db_session_no_rollback.commit()
+
+    delivered = {}
+
+    async def deliver(notification: Notification) -> None:
+        lag = datetime.utcnow() - notification.scheduled_time
+        delivered[notification.title] = lag.total_seconds()
+
+    worker = ScheduledNotificationWorker(
+        poll_interval=0.05,
+        max_poll_interval=60,
+        deliver=deliver,
+        session_factory=TestSessionLocal,
+        preload_minutes=1,
+        tick=0.05,
+        listen_engine=test_engine,
+    )
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0.3)
+
+    await create("Announced", 0.6)
+    cancelled = await create("Cancelled", 0.6)
+    await db_session_no_rollback.commit()
+    await service.update_notification(
+        cancelled.id, user.id, NotificationUpdate(status="cancelled")
+    )
+    await db_session_no_rollback.commit()
+    await asyncio.sleep(0.1)
+    assert cancelled.id not in worker.wheel
+    assert len(worker.wheel) == 2
+
+    await asyncio.sleep(1.1)
+    worker.stop()
+    await asyncio.wait_for(task, timeout=2)
+
+    assert set(delivered) == {"Preloaded", "Announced"}
+    assert all(0 <= lag < 0.5 for lag in delivered.values())
+    assert worker.stats.claimed == 2
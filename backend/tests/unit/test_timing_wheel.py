@@ -0,0 +1,71 @@
+"""
+Unit tests for the hierarchical timing wheel.
+"""
+
+import math
+import random
+
+from app.workers.timing_wheel import TimingWheel
+
+
+def test_timers_fire_in_order_across_levels():
+    """Test that timers on every level fire on the tick they are due."""
+    wheel = TimingWheel(start=1000.0, tick=0.1, slots=8, levels=2)
+    # Level 0, level 1 and the overflow bucket (beyond 6.4 seconds)
+    for key, deadline in [("a", 1000.35), ("b", 1003.0), ("c", 1020.05)]:
+        wheel.add(key, deadline)
+    wheel.add("due", 999.0)
+
+    assert wheel.advance(1000.0) == ["due"]
+    assert wheel.advance(1000.3) == []
+    assert wheel.advance(1000.4) == ["a"]
+    assert wheel.advance(1002.95) == []
+    assert wheel.advance(1010.0) == ["b"]
+    assert wheel.advance(1020.0) == []
+    assert wheel.advance(1020.1) == ["c"]
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    """Test that cancelled timers never fire and re-adding moves a timer."""
+    wheel = TimingWheel(start=0.0, tick=0.1, slots=8, levels=2)
+    wheel.add("a", 1.0)
+    wheel.add("b", 2.0)
+    wheel.add("b", 30.0)
+    assert wheel.cancel("a")
+    assert not wheel.cancel("a")
+
+    assert wheel.advance(10.0) == []
+    assert "b" in wheel
+    assert wheel.advance(30.0) == ["b"]
+
+
+def test_random_schedule_is_never_early_or_late():
+    """Test random adds, cancels and clock jumps against a brute-force check."""
+    rng = random.Random(3)
+    tick = 0.1
+    wheel = TimingWheel(start=5000.0, tick=tick, slots=8, levels=3)
+    now = 5000.0
+    deadlines = {}
+    for _ in range(5000):
+        if rng.random() < 0.3:
+            key = rng.randrange(500)
+            deadline = now + rng.choice(
+                [rng.uniform(-1, 1), rng.uniform(0, 60), rng.uniform(0, 200)]
+            )
+            wheel.add(key, deadline)
+            deadlines[key] = deadline
+        if rng.random() < 0.05 and deadlines:
+            key = rng.choice(list(deadlines))
+            wheel.cancel(key)
+            del deadlines[key]
+
+        now += rng.choice([0.03, 0.1, 0.25, 1.7, 13.0])
+        for key in wheel.advance(now):
+            deadline = deadlines.pop(key)
+            assert math.ceil(deadline / tick) <= math.floor(now / tick)
+        assert all(
+            math.ceil(deadline / tick) > math.floor(now / tick)
+            for deadline in deadlines.values()
+        )
+    assert len(wheel) == len(deadlines)
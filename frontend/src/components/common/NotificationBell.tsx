@@ -1,6 +1,7 @@
 /**
  * NotificationBell component
- * Displays notification bell icon with unread count badge
+ * Displays notification bell icon with unread count badge, kept current by
+ * the notification stream instead of polling
  */
 
 import React, { useState } from 'react';
@@ -16,17 +17,16 @@ export const NotificationBell: React.FC = () => {
     markAsRead,
     deleteNotification,
     fetchNotifications,
-    fetchUnreadCount,
   } = useNotifications({
-    autoFetch: true,
+    autoFetch: false,
     limit: 10,
+    stream: true,
   });
 
   const toggleDropdown = () => {
     setIsOpen(!isOpen);
     if (!isOpen) {
       fetchNotifications();
-      fetchUnreadCount();
     }
   };
 
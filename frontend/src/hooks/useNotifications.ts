@@ -11,10 +11,12 @@ export interface UseNotificationsOptions {
   isRead?: boolean;
   page?: number;
   limit?: number;
+  // Keep the list and unread count current from the notification stream
+  stream?: boolean;
 }
 
 export const useNotifications = (options: UseNotificationsOptions = {}) => {
-  const { autoFetch = true, isRead, page = 1, limit = 20 } = options;
+  const { autoFetch = true, isRead, page = 1, limit = 20, stream = false } = options;
 
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [total, setTotal] = useState(0);
@@ -46,12 +48,7 @@ export const useNotifications = (options: UseNotificationsOptions = {}) => {
 
   const fetchUnreadCount = useCallback(async () => {
     try {
-      const data = await notificationService.getNotifications({
-        is_read: false,
-        page: 1,
-        limit: 1,
-      });
-      setUnreadCount(data.total);
+      setUnreadCount(await notificationService.getUnreadCount());
     } catch (err) {
       console.error('Failed to fetch unread count:', err);
     }
@@ -103,6 +100,29 @@ export const useNotifications = (options: UseNotificationsOptions = {}) => {
     }
   }, []);
 
+  useEffect(() => {
+    if (!stream) {
+      return;
+    }
+
+    const source = notificationService.openStream({
+      onUnreadCount: setUnreadCount,
+      onNotification: ({ notification }) => {
+        setNotifications((prev) =>
+          prev.some((n) => n.id === notification.id)
+            ? prev.map((n) => (n.id === notification.id ? notification : n))
+            : [notification, ...prev].slice(0, limit)
+        );
+      },
+      onResync: () => {
+        fetchNotifications();
+        fetchUnreadCount();
+      },
+    });
+
+    return () => source.close();
+  }, [stream, limit, fetchNotifications, fetchUnreadCount]);
+
   useEffect(() => {
     if (autoFetch) {
       fetchNotifications();
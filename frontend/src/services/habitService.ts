@@ -8,6 +8,8 @@ import type {
   HabitEntry,
   HabitAnalytics,
   ProgressTrends,
+  HabitHeatmap,
+  HabitCompletionWindows,
   StreakRecoveryInfo,
   HabitInsights,
   CreateHabitRequest,
@@ -160,6 +162,39 @@ export const habitAnalyticsService = {
     return response.data.data;
   },
 
+  /**
+   * Get completion bitsets for all habits between two dates (YYYY-MM-DD)
+   */
+  getHeatmap: async (from?: string, to?: string): Promise<HabitHeatmap> => {
+    const params = new URLSearchParams();
+    if (from) params.set('from', from);
+    if (to) params.set('to', to);
+    const response = await apiClient.get<APIResponse<HabitHeatmap>>(
+      `/habits/heatmap?${params.toString()}`
+    );
+    return response.data.data;
+  },
+
+  /**
+   * Get completions over the last N days for each of `days`, plus an
+   * optional custom range (YYYY-MM-DD)
+   */
+  getCompletionWindows: async (
+    habitId: string,
+    days: number[] = [7, 30, 90],
+    from?: string,
+    to?: string
+  ): Promise<HabitCompletionWindows> => {
+    const params = new URLSearchParams();
+    days.forEach((d) => params.append('days', String(d)));
+    if (from) params.set('from', from);
+    if (to) params.set('to', to);
+    const response = await apiClient.get<APIResponse<HabitCompletionWindows>>(
+      `/habits/${habitId}/windows?${params.toString()}`
+    );
+    return response.data.data;
+  },
+
   /**
    * Check streak recovery eligibility
    */
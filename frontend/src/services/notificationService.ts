@@ -11,6 +11,7 @@ import type {
   NotificationSettings,
   NotificationSettingsCreate,
   NotificationSettingsUpdate,
+  NotificationStreamHandlers,
   PaginatedNotifications,
 } from '../types/notification';
 
@@ -41,6 +42,16 @@ export const notificationService = {
     return response.data.data;
   },
 
+  /**
+   * Get the number of unread notifications
+   */
+  async getUnreadCount(): Promise<number> {
+    const response = await apiClient.get<APIResponse<{ unread_count: number }>>(
+      '/notifications/unread-count'
+    );
+    return response.data.data.unread_count;
+  },
+
   /**
    * Get a specific notification by ID
    */
@@ -85,6 +96,25 @@ export const notificationService = {
     return response.data.data.deleted;
   },
 
+  /**
+   * Open the server-sent event stream of the current user's notifications.
+   * EventSource cannot send headers, so the token goes in the query string.
+   */
+  openStream(handlers: NotificationStreamHandlers): EventSource {
+    const token = localStorage.getItem('auth_token') ?? '';
+    const source = new EventSource(
+      `${apiClient.defaults.baseURL}/notifications/stream?token=${encodeURIComponent(token)}`
+    );
+    source.addEventListener('unread_count', (event) => {
+      handlers.onUnreadCount(JSON.parse((event as MessageEvent).data).count);
+    });
+    source.addEventListener('notification', (event) => {
+      handlers.onNotification(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener('resync', () => handlers.onResync());
+    return source;
+  },
+
   /**
    * Get notification settings for current user
    */
@@ -23,4 +23,6 @@ export interface PaginatedResponse<T> {
   page: number;
   limit: number;
   total_pages: number;
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
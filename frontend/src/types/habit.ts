@@ -116,6 +116,14 @@ export interface MonthlyProgress {
  */
 export type TrendDirection = 'improving' | 'stable' | 'declining' | 'no_data';
 
+/**
+ * Trailing completion rates over a window, one per day of daily_data
+ */
+export interface RollingCompletionRate {
+  window_days: number;
+  rates: number[];
+}
+
 /**
  * Progress trends over time
  */
@@ -124,6 +132,47 @@ export interface ProgressTrends {
   weekly_summaries: WeeklyProgress[];
   monthly_summaries: MonthlyProgress[];
   overall_trend: TrendDirection;
+  rolling_rates?: RollingCompletionRate[] | null;
+}
+
+/**
+ * Completion series of one habit; bit i of the base64 bitmap (most
+ * significant bit first) is start_date + i days
+ */
+export interface HabitHeatmapSeries {
+  habit_id: string;
+  habit_name: string;
+  color?: string;
+  completions: number;
+  bitmap: string;
+}
+
+/**
+ * Completion heatmap for all habits
+ */
+export interface HabitHeatmap {
+  start_date: string;
+  end_date: string;
+  habits: HabitHeatmapSeries[];
+}
+
+/**
+ * Completions of a habit within one window of days
+ */
+export interface CompletionWindow {
+  start_date: string;
+  end_date: string;
+  days: number;
+  completions: number;
+  completion_rate: number;
+}
+
+/**
+ * Completion counts of a habit over several windows
+ */
+export interface HabitCompletionWindows {
+  habit_id: string;
+  windows: CompletionWindow[];
 }
 
 /**
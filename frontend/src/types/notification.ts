@@ -73,3 +73,14 @@ export interface PaginatedNotifications {
   limit: number;
   total_pages: number;
 }
+
+export interface NotificationStreamEvent {
+  action: 'created' | 'sent' | 'failed';
+  notification: Notification;
+}
+
+export interface NotificationStreamHandlers {
+  onUnreadCount: (count: number) => void;
+  onNotification: (event: NotificationStreamEvent) => void;
+  onResync: () => void;
+}